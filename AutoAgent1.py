@@ -1,11 +1,15 @@
 import os
-import json
 import subprocess
 from openai import OpenAI
 from dotenv import load_dotenv
+from agent_engine import AgentEngine, PARALLEL_ACTIONS_PROMPT
 
 load_dotenv()
 
+# Set AGENT_STREAM=0 to wait for the whole JSON step before printing.
+STREAM = os.getenv("AGENT_STREAM", "1") != "0"
+STREAM_LABELS = {"plan": "🧠: ", "output": "💬: "}
+
 class AutoAgent:
     def __init__(self):
         self.client = OpenAI(
@@ -70,7 +74,8 @@ Available Tools:
         self.available_tools = {
             "command_exec": {
                 "description": "Execute a terminal command",
-                "function": self.command_exec
+                "function": self.command_exec,
+                "parallel": False
             },
             "read_file": {
                 "description": "Read the content of a file",
@@ -78,7 +83,8 @@ Available Tools:
             },
             "write_file": {
                 "description": "Create or update a file with content",
-                "function": self.write_file
+                "function": self.write_file,
+                "parallel": False
             },
             "scan_directory": {
                 "description": "List files in a directory",
@@ -91,8 +97,11 @@ Available Tools:
         }
 
         self.messages = [
-            {"role": "system", "content": self.system_prompt}
+            {"role": "system", "content": self.system_prompt + PARALLEL_ACTIONS_PROMPT}
         ]
+        self.engine = AgentEngine(self.client, messages=self.messages, labels=STREAM_LABELS, stream=STREAM,
+                                  action_format="🔨 Executing: {function}")
+        self.engine.register_tools(self.available_tools)
 
     def command_exec(self, command):
         print("🔑 ", command)
@@ -147,48 +156,7 @@ Available Tools:
     def run(self):
         while True:
             query = input("> ")
-            self.messages.append({"role": "user", "content": query})
-
-            while True:
-                response = self.client.chat.completions.create(
-                    model="gemini-2.0-flash",
-                    response_format={"type": "json_object"},
-                    messages=self.messages,
-                )
-
-                parsed_output = json.loads(response.choices[0].message.content)
-                self.messages.append({
-                    "role": "assistant",
-                    "content": json.dumps(parsed_output)
-                })
-
-                step = parsed_output.get("step")
-
-                if step == 'plan':
-                    print(f"🧠: {parsed_output.get('content')}")
-
-                if step == 'action':
-                    print(f"🔨 Executing: {parsed_output.get('function')}")
-                    function = parsed_output.get("function")
-                    user_input = parsed_output.get("input")
-
-                    if function in self.available_tools:
-                        tool = self.available_tools.get(function)
-                        result = tool.get("function")(user_input)
-                        self.messages.append({
-                            "role": "assistant",
-                            "content": json.dumps({
-                                "step": "observe",
-                                "content": result,
-                            })
-                        })
-                        continue
-
-                    
-
-                if step == "output":
-                    print(f"💬: {parsed_output.get('content')}")
-                    break
+            self.engine.run(query)
 
 
 if __name__ == "__main__":
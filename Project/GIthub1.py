@@ -1,7 +1,15 @@
 from openai import OpenAI
 import os
+import sys
 import json
-import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agent_engine import AgentEngine, PARALLEL_ACTIONS_PROMPT
+from github_api import GitHubAPI
+
+# Set AGENT_STREAM=0 to wait for the whole JSON step before printing.
+STREAM = os.getenv("AGENT_STREAM", "1") != "0"
+STREAM_LABELS = {"plan": "🧠 Plan: ", "observe": "👁️ Observation: ", "output": "💬 Final Output: "}
 
 class Github:
     def __init__(self):
@@ -13,11 +21,15 @@ class Github:
         self.github_token = os.getenv("GITHUB_TOKEN")
         self.repo_owner = os.getenv("GITHUB_OWNER")
         self.repo_name = os.getenv("GITHUB_REPO")
+        self.github = GitHubAPI(token=self.github_token)
 
         self.tools = {
             "call_github_api": {
                 "description": "Call any GitHub API endpoint directly.",
-                "function": self.call_github_api
+                "function": self.call_github_api,
+                # Reads can overlap; anything that changes the repo runs on its own.
+                "parallel": lambda params: isinstance(params, dict) and params.get("method", "GET").upper() == "GET",
+                "format": lambda result: f"The API response is:\n```json\n{json.dumps(result, ensure_ascii=False)}\n```"
             },
         }
 
@@ -135,68 +147,32 @@ class Github:
         self.message = [
             {
                 "role": "system",
-                "content": self.system_prompt
+                "content": self.system_prompt + PARALLEL_ACTIONS_PROMPT
             }
         ]
+        self.engine = AgentEngine(self.client, messages=self.message, labels=STREAM_LABELS, stream=STREAM,
+                                  action_format="🔧 Action: {function} → {input}")
+        self.engine.register_tools(self.tools)
 
     def call_github_api(self, params):
         method = params.get("method", "GET").upper()
         endpoint = params.get("endpoint")
-        url = f"https://api.github.com{endpoint}"
-        print(f"Calling GitHub API: {method} {url}")
+        print(f"Calling GitHub API: {method} {endpoint}")
 
         try:
-            response = requests.request(method=method, url=url)
-            print(response.json())
-            return response.json()
+            result = self.github.call(method, endpoint, params=params.get("params"), body=params.get("body"))
         except Exception as e:
             return {"error": str(e)}
+        if isinstance(result, dict) and "items" in result:
+            print(f"📄 {result['count']} items from {result['pages']} page(s)"
+                  f"{', more available' if result['truncated'] else ''}")
+        return result
 
     def get_response(self):
         while True:
             input_message = input("Input: ")
-            self.message.append({"role": "user", "content": input_message})
-
-            while True:
-                response = self.client.chat.completions.create(
-                    model="gemini-2.0-flash",
-                    response_format={"type": "json_object"},
-                    messages=self.message,
-                )
-
-                output = json.loads(response.choices[0].message.content)
-                self.message.append({"role": "assistant", "content": json.dumps(output)})
-
-                step = output.get("step")
-                content = output.get("content")
-
-                if step == "plan":
-                    print(f"🧠 Plan: {content}")
-
-                elif step == "action":
-                    func = output.get("function")
-                    input_data = output.get("input")
-                    print(f"🔧 Action: {func} → {input_data}")
-
-                    if func in self.tools:
-                        result = self.tools[func]["function"](input_data)
-                        pretty_result = json.dumps(result, indent=2)[:]
-                        self.message.append({
-                            "role": "assistant",
-                            "content": json.dumps({
-                                "step": "observe",
-                                "content": f"The API response is:\n```json\n{pretty_result}\n```"
-                            })
-                        })
-                        continue
-
-                elif step == "observe":
-                    print(f"👁️ Observation: {content}")
-
-                elif step == "output":
-                    print(f"💬 Final Output: {content}")
-                    break
+            self.engine.run(input_message)
 
 if __name__ == "__main__":
     github = Github()
-    github.get_response()
\ No newline at end of file
+    github.get_response()
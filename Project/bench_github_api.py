@@ -0,0 +1,190 @@
+"""Prompt size and rate limit: raw GitHub responses vs. GitHubAPI, against a fake GitHub.
+
+The fake server holds one repository with --commits commits and a pull
+request with --files changed files, in GitHub's response shapes (users
+with their hypermedia URLs, node ids, verification blocks, patches). List
+endpoints paginate with per_page/page and a Link header (30 per page by
+default, like GitHub) and every response has an ETag. A request whose
+If-None-Match matches gets 304 and, like on GitHub, does not use up the
+rate limit; every other request does.
+
+For each endpoint the table compares the old call_github_api (one GET,
+json.dumps(indent=2) into the prompt) with GitHubAPI.call on first use and
+when repeated. The last lines show iter_items fetching pages only as they
+are consumed.
+
+    python Project/bench_github_api.py --commits 250 --files 40 --latency 0.05
+"""
+import json
+import time
+import random
+import hashlib
+import argparse
+import tempfile
+import threading
+from itertools import islice
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from github_api import GitHubAPI, ETagCache
+from http_client import ToolHTTPClient
+
+OWNER, REPO = "octo", "demo"
+
+
+def user(login, base):
+    urls = {name: f"{base}/users/{login}/{name.replace('_url', '')}" for name in (
+        "followers_url", "following_url", "gists_url", "starred_url", "subscriptions_url",
+        "organizations_url", "repos_url", "events_url", "received_events_url")}
+    return dict({"login": login, "id": abs(hash(login)) % 10 ** 7, "node_id": "MDQ6VXNlcjE=",
+                 "avatar_url": f"https://avatars.githubusercontent.com/u/{login}", "gravatar_id": "",
+                 "url": f"{base}/users/{login}", "html_url": f"https://github.com/{login}", "type": "User",
+                 "site_admin": False}, **urls)
+
+
+def make_repo(commits, files, base, seed=0):
+    rng = random.Random(seed)
+    repo_url = f"{base}/repos/{OWNER}/{REPO}"
+    people = [user(name, base) for name in ("alice", "bob", "carol", "dave")]
+    commit_list = []
+    for i in range(commits):
+        sha = hashlib.sha1(f"commit{i}".encode()).hexdigest()
+        person = rng.choice(people)
+        signature = {"name": person["login"].title(), "email": f"{person['login']}@example.com",
+                     "date": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T10:00:00Z"}
+        commit_list.append({
+            "sha": sha, "node_id": f"C_{sha[:20]}", "url": f"{repo_url}/commits/{sha}",
+            "html_url": f"https://github.com/{OWNER}/{REPO}/commit/{sha}",
+            "comments_url": f"{repo_url}/commits/{sha}/comments",
+            "commit": {"author": signature, "committer": signature,
+                       "message": f"Fix {rng.choice(['auth', 'routing', 'cache', 'ui'])} issue #{i}\n\n"
+                                  + "Details of the change. " * rng.randint(1, 6),
+                       "tree": {"sha": sha[::-1], "url": f"{repo_url}/git/trees/{sha[::-1]}"},
+                       "url": f"{repo_url}/git/commits/{sha}", "comment_count": 0,
+                       "verification": {"verified": False, "reason": "unsigned", "signature": None,
+                                        "payload": None, "verified_at": None}},
+            "author": person, "committer": person,
+            "parents": [{"sha": sha[1:] + "0", "url": f"{repo_url}/commits/{sha[1:]}0",
+                         "html_url": f"https://github.com/{OWNER}/{REPO}/commit/{sha[1:]}0"}],
+        })
+    file_list = []
+    for i in range(files):
+        name = f"src/module_{i}.py"
+        patch = "\n".join(f"+    value_{j} = compute({j})  # added line" for j in range(rng.randint(20, 120)))
+        file_list.append({
+            "sha": hashlib.sha1(name.encode()).hexdigest(), "filename": name, "status": "modified",
+            "additions": patch.count("\n") + 1, "deletions": 0, "changes": patch.count("\n") + 1,
+            "blob_url": f"https://github.com/{OWNER}/{REPO}/blob/main/{name}",
+            "raw_url": f"https://github.com/{OWNER}/{REPO}/raw/main/{name}",
+            "contents_url": f"{repo_url}/contents/{name}?ref=main", "patch": f"@@ -1,0 +1,{i} @@\n{patch}",
+        })
+    return {f"/repos/{OWNER}/{REPO}/commits": commit_list, f"/repos/{OWNER}/{REPO}/pulls/1/files": file_list}
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    lists = {}
+    latency = 0.05
+    rate_limit = 5000
+    requests = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        items = self.lists.get(parts.path)
+        time.sleep(self.latency)
+        if items is None:
+            return self._send(404, {"message": "Not Found"})
+        per_page, page = min(int(query.get("per_page", 30)), 100), int(query.get("page", 1))
+        body = json.dumps(items[(page - 1) * per_page:page * per_page]).encode()
+        etag = f'W/"{hashlib.sha256(body).hexdigest()[:32]}"'
+        last = (len(items) + per_page - 1) // per_page
+        host = f"http://{self.headers['Host']}{parts.path}"
+        links = [f'<{host}?per_page={per_page}&page={page + 1}>; rel="next"'] if page < last else []
+        links.append(f'<{host}?per_page={per_page}&page={last}>; rel="last"')
+        with self.lock:
+            FakeGitHubHandler.requests += 1
+            if self.headers.get("If-None-Match") != etag:
+                FakeGitHubHandler.rate_limit -= 1
+            remaining = FakeGitHubHandler.rate_limit
+        headers = {"ETag": etag, "Link": ", ".join(links), "X-RateLimit-Remaining": str(remaining)}
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, None, headers)
+        self._send(200, body, headers)
+
+    def _send(self, status, body, headers=None):
+        if isinstance(body, dict):
+            body = json.dumps(body).encode()
+        body = body or b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def measure(run):
+    requests_before, limit_before = FakeGitHubHandler.requests, FakeGitHubHandler.rate_limit
+    started = time.perf_counter()
+    text, items = run()
+    return {"seconds": time.perf_counter() - started, "requests": FakeGitHubHandler.requests - requests_before,
+            "rate_limit": limit_before - FakeGitHubHandler.rate_limit, "chars": len(text), "items": items}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commits", type=int, default=250)
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05, help="fake GitHub seconds per request")
+    args = parser.parse_args()
+
+    FakeGitHubHandler.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGitHubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    FakeGitHubHandler.lists = make_repo(args.commits, args.files, base)
+    http = ToolHTTPClient()
+
+    def old_call(endpoint):
+        result = http.request("GET", f"{base}{endpoint}").json()
+        return f"The API response is:\n```json\n{json.dumps(result, indent=2)}\n```", len(result)
+
+    with tempfile.TemporaryDirectory() as directory:
+        github = GitHubAPI(base_url=base, cache=ETagCache(directory), http=http)
+
+        def new_call(endpoint):
+            result = github.call("GET", endpoint)
+            return f"The API response is:\n```json\n{json.dumps(result, ensure_ascii=False)}\n```", result["count"]
+
+        print(f"{args.commits} commits, {args.files} PR files, {args.latency * 1000:.0f}ms per request, "
+              f"budget {github.max_items} items / {github.max_pages} pages")
+        print(f"{'endpoint':>30} {'mode':>16} {'items':>6} {'chars':>8} {'~tokens':>8} {'chars/item':>10} "
+              f"{'requests':>8} {'rate limit':>10} {'seconds':>8}")
+        for endpoint in (f"/repos/{OWNER}/{REPO}/commits", f"/repos/{OWNER}/{REPO}/pulls/1/files"):
+            for mode, run in (("raw indent=2", lambda: old_call(endpoint)),
+                              ("GitHubAPI", lambda: new_call(endpoint)),
+                              ("GitHubAPI again", lambda: new_call(endpoint))):
+                result = measure(run)
+                print(f"{endpoint[-30:]:>30} {mode:>16} {result['items']:>6} {result['chars']:>8} "
+                      f"{result['chars'] // 4:>8} {result['chars'] // max(result['items'], 1):>10} "
+                      f"{result['requests']:>8} {result['rate_limit']:>10} {result['seconds']:>8.2f}")
+
+        print()
+        for take in (10, 150, args.commits):
+            before = FakeGitHubHandler.requests
+            pages = GitHubAPI(base_url=base, cache=ETagCache(None), http=http, max_pages=10)
+            items = list(islice(pages.iter_items(f"/repos/{OWNER}/{REPO}/commits"), take))
+            print(f"iter_items: took {len(items):>4} commits with {FakeGitHubHandler.requests - before} request(s)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""GitHub REST calls for the PR assistant: projected, paginated and ETag-cached.
+
+    github = GitHubAPI(token=os.getenv("GITHUB_TOKEN"))
+    github.call("GET", "/repos/yashpandav/Circle/commits")
+    # {"endpoint": ..., "items": [{"sha": ..., "message": ..., ...}], "count": 60, "pages": 1, "truncated": True, ...}
+
+Responses are cut down to the fields that matter for each endpoint
+(PROJECTIONS); other endpoints drop GitHub's hypermedia *_url fields and
+node ids, reduce nested users to their login and truncate long text, so a
+commit or PR-files listing no longer floods the prompt.
+
+List endpoints are read lazily through the Link header: iter_items()
+fetches the next page only when the previous one is used up, and call()
+stops at GITHUB_MAX_ITEMS items or GITHUB_MAX_PAGES pages, with
+"truncated" set and the URL of the next unread page in "next".
+
+Every GET is sent with the ETag / Last-Modified of the previous response
+for the same URL. GitHub answers 304 Not Modified, which does not count
+against the rate limit, and the cached body is used. Cache entries are
+stored on disk as one JSON file per URL (and token).
+"""
+import os
+import re
+import sys
+import json
+import time
+import base64
+import hashlib
+import threading
+from urllib.parse import urlencode, urlsplit, parse_qsl, urlunsplit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from http_client import get_client
+
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+GITHUB_MAX_ITEMS = int(os.getenv("GITHUB_MAX_ITEMS", "60"))
+GITHUB_MAX_PAGES = int(os.getenv("GITHUB_MAX_PAGES", "3"))
+GITHUB_CACHE_DIRECTORY = os.getenv("GITHUB_CACHE_DIR", "github_cache")
+MAX_TEXT = 1500
+PER_PAGE = 100
+
+# Endpoint pattern -> {output field: dotted path}. "a[].b" collects b from every element of list a.
+_REPO = r"/repos/[^/]+/[^/]+"
+PROJECTIONS = [
+    (_REPO + r"/commits", {
+        "sha": "sha", "message": "commit.message", "author": "commit.author.name",
+        "date": "commit.author.date", "url": "html_url"}),
+    (_REPO + r"/commits/[^/]+", {
+        "sha": "sha", "message": "commit.message", "author": "commit.author.name",
+        "date": "commit.author.date", "stats": "stats", "files": "files[]", "url": "html_url"}),
+    (_REPO + r"/pulls", {
+        "number": "number", "title": "title", "state": "state", "user": "user.login", "draft": "draft",
+        "head": "head.ref", "base": "base.ref", "updated_at": "updated_at", "url": "html_url"}),
+    (_REPO + r"/pulls/\d+", {
+        "number": "number", "title": "title", "state": "state", "user": "user.login", "body": "body",
+        "head": "head.ref", "base": "base.ref", "mergeable": "mergeable", "commits": "commits",
+        "additions": "additions", "deletions": "deletions", "changed_files": "changed_files", "url": "html_url"}),
+    (_REPO + r"/pulls/\d+/files", {
+        "filename": "filename", "status": "status", "additions": "additions", "deletions": "deletions",
+        "patch": "patch"}),
+    (_REPO + r"/pulls/\d+/(comments|reviews)", {
+        "user": "user.login", "path": "path", "line": "line", "state": "state", "body": "body"}),
+    (_REPO + r"/issues", {
+        "number": "number", "title": "title", "state": "state", "user": "user.login", "labels": "labels[].name",
+        "comments": "comments", "is_pull_request": "pull_request", "updated_at": "updated_at"}),
+    (_REPO + r"/issues/\d+/comments", {"user": "user.login", "created_at": "created_at", "body": "body"}),
+    (_REPO + r"/branches", {"name": "name", "sha": "commit.sha", "protected": "protected"}),
+    (_REPO + r"/contents(/.*)?", {
+        "name": "name", "path": "path", "type": "type", "size": "size", "content": "content"}),
+    (_REPO, {
+        "full_name": "full_name", "description": "description", "default_branch": "default_branch",
+        "language": "language", "stars": "stargazers_count", "forks": "forks_count",
+        "open_issues": "open_issues_count", "pushed_at": "pushed_at", "url": "html_url"}),
+    (r"/(users|orgs)/[^/]+/repos", {
+        "full_name": "full_name", "description": "description", "language": "language",
+        "stars": "stargazers_count", "updated_at": "updated_at"}),
+]
+_COMPILED = [(re.compile(pattern + r"/?$"), fields) for pattern, fields in PROJECTIONS]
+
+
+def truncate(text, limit=MAX_TEXT):
+    if isinstance(text, str) and len(text) > limit:
+        return f"{text[:limit]}… (+{len(text) - limit} chars)"
+    return text
+
+
+def pluck(obj, path):
+    """Value at a dotted `path`; "list[].field" maps over a list."""
+    head, _, rest = path.partition(".")
+    if head.endswith("[]"):
+        items = obj.get(head[:-2]) if isinstance(obj, dict) else None
+        if not isinstance(items, list):
+            return None
+        return [pluck(item, rest) if rest else compact(item) for item in items]
+    value = obj.get(head) if isinstance(obj, dict) else None
+    return pluck(value, rest) if rest and value is not None else value
+
+
+def compact(value):
+    """Generic projection: no hypermedia URLs or node ids, users as logins, long text truncated."""
+    if isinstance(value, list):
+        return [compact(item) for item in value]
+    if not isinstance(value, dict):
+        return truncate(value)
+    if "login" in value and "type" in value and "id" in value:
+        return value["login"]
+    return {key: compact(item) for key, item in value.items()
+            if key == "html_url" or not (key.endswith("_url") or key in ("url", "node_id", "_links"))}
+
+
+def project(endpoint, data):
+    """`data` (one object or a list) reduced to the fields listed for `endpoint`."""
+    path = urlsplit(endpoint).path
+    fields = next((fields for pattern, fields in _COMPILED if pattern.match(path)), None)
+    if fields is None:
+        return compact(data)
+
+    def one(item):
+        if not isinstance(item, dict):
+            return compact(item)
+        out = {name: pluck(item, source) for name, source in fields.items()}
+        if isinstance(out.get("content"), str) and item.get("encoding") == "base64":
+            out["content"] = base64.b64decode(out["content"]).decode("utf-8", errors="replace")
+        if "is_pull_request" in out:
+            out["is_pull_request"] = out["is_pull_request"] is not None
+        return {name: truncate(value) for name, value in out.items() if value is not None}
+
+    return [one(item) for item in data] if isinstance(data, list) else one(data)
+
+
+class ETagCache:
+    """The last 200 OK response per URL, in memory and on disk: validators, body and the next-page link."""
+
+    def __init__(self, cache_dir=GITHUB_CACHE_DIRECTORY):
+        self.cache_dir = cache_dir
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.json")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Ignoring unreadable GitHub cache entry for {key}: {e}")
+            return None
+        with self._lock:
+            self._memory[key] = entry
+        return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class GitHubError(Exception):
+    def __init__(self, status, body):
+        super().__init__(f"GitHub returned {status}: {(body or {}).get('message') if isinstance(body, dict) else body}")
+        self.status = status
+        self.body = body
+
+
+class GitHubAPI:
+    """The call_github_api tool: projected responses, lazy pagination and conditional requests."""
+
+    def __init__(self, token=None, base_url=GITHUB_API_URL, cache=None, http=None,
+                 max_items=GITHUB_MAX_ITEMS, max_pages=GITHUB_MAX_PAGES):
+        self.token = token
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache if cache is not None else ETagCache()
+        self.http = http or get_client()
+        self.max_items = max_items
+        self.max_pages = max_pages
+        self.stats = {"requests": 0, "not_modified": 0, "rate_limit_remaining": None}
+        # The cache is per token: private repos look different to different users.
+        self._identity = hashlib.sha256((token or "").encode("utf-8")).hexdigest()[:12]
+
+    def _headers(self):
+        headers = {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def url(self, endpoint, params=None):
+        url = endpoint if endpoint.startswith(("http://", "https://")) else f"{self.base_url}/{endpoint.lstrip('/')}"
+        if params:
+            scheme, netloc, path, query, fragment = urlsplit(url)
+            query = urlencode(parse_qsl(query) + list(params.items()))
+            url = urlunsplit((scheme, netloc, path, query, fragment))
+        return url
+
+    def get(self, url):
+        """(status, body, next page URL) for a GET, revalidating a cached copy with ETag."""
+        key = f"{self._identity} {url}"
+        cached = self.cache.get(key)
+        headers = self._headers()
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = self.http.request("GET", url, headers=headers)
+        self.stats["requests"] += 1
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None:
+            self.stats["rate_limit_remaining"] = int(remaining)
+        if response.status_code == 304 and cached is not None:
+            self.stats["not_modified"] += 1
+            return 200, cached["body"], cached.get("next")
+
+        body = response.json() if response.content else None
+        next_url = response.links.get("next", {}).get("url")
+        if response.status_code == 200 and (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+            self.cache.put(key, {"url": url, "etag": response.headers.get("ETag"),
+                                 "last_modified": response.headers.get("Last-Modified"),
+                                 "fetched": time.time(), "body": body, "next": next_url})
+        return response.status_code, body, next_url
+
+    def iter_items(self, endpoint, params=None, max_pages=None):
+        """Yield the raw items of a list endpoint page by page, fetching each page on demand.
+
+        The generator's return value (StopIteration.value) is the next page URL
+        left unread, or None.
+        """
+        params = dict(params or {})
+        params.setdefault("per_page", PER_PAGE)
+        url, pages = self.url(endpoint, params), 0
+        while url and pages < (max_pages or self.max_pages):
+            status, body, next_url = self.get(url)
+            pages += 1
+            if status != 200 or not isinstance(body, list):
+                raise GitHubError(status, body)
+            yield from body
+            url = next_url
+        return url
+
+    def _list(self, endpoint, items, next_url):
+        """Follow next links until the item or page budget is spent."""
+        items, pages = list(items), 1
+        while next_url and len(items) < self.max_items and pages < self.max_pages:
+            status, page, following = self.get(next_url)
+            if status != 200 or not isinstance(page, list):
+                break
+            items.extend(page)
+            pages += 1
+            next_url = following
+        return {"endpoint": endpoint, "items": project(endpoint, items[:self.max_items]),
+                "count": min(len(items), self.max_items), "pages": pages,
+                "truncated": len(items) > self.max_items or next_url is not None, "next": next_url}
+
+    def call(self, method="GET", endpoint="", params=None, body=None):
+        """Tool entry point: a projected, size-bounded response or {"error", "status", "message"}."""
+        method = method.upper()
+        if method != "GET":
+            response = self.http.request(method, self.url(endpoint, params), headers=self._headers(), json=body)
+            self.stats["requests"] += 1
+            data = response.json() if response.content else None
+            if response.status_code >= 400:
+                return _error(response.status_code, data)
+            return project(endpoint, data) if data is not None else {"status": response.status_code}
+
+        params = dict(params or {})
+        params.setdefault("per_page", min(PER_PAGE, self.max_items))
+        status, data, next_url = self.get(self.url(endpoint, params))
+        if status >= 400:
+            return _error(status, data)
+        if isinstance(data, list):
+            return self._list(endpoint, data, next_url)
+        return project(endpoint, data)
+
+
+def _error(status, data):
+    message = data.get("message") if isinstance(data, dict) else data
+    return {"error": f"GitHub returned {status}", "status": status, "message": message}
@@ -0,0 +1,220 @@
+"""Run a JSONL file of queries through ChaiBot's retrieval and LLM.
+
+    python Rag/batch_runner.py queries.jsonl results.jsonl --concurrency 8
+
+Each input line is a JSON object holding the question under --query-field
+(default: the first of "query", "question" or "body") and optionally an
+"id" or "request_id". Input is read lazily, so batches of any size stream
+through a fixed amount of memory.
+
+Results are appended to the output file as they complete, one JSON line
+each. The output doubles as the checkpoint: rerunning with the same output
+file skips every id that already has an answer and retries the ones that
+failed. A line cut short by an interrupted run is dropped on resume. An
+input line that is not a JSON object is recorded as an error and the batch
+carries on.
+
+Concurrency adapts to rate limits: a 429 from the service (the status of
+its HTTPException, which carries the upstream Retry-After) halves the
+number of queries in flight and the query is retried after that
+Retry-After or an exponential, jittered backoff; every `increase_after`
+successes in a row allow one more query in flight, up to --concurrency.
+"""
+import os
+import json
+import time
+import random
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from embedding_service import error_status, retry_after_seconds
+
+QUERY_FIELDS = ("query", "question", "body")
+ID_FIELDS = ("id", "request_id")
+
+
+def read_records(path, query_field=None):
+    """Yield (id, query, record) for each non-empty input line.
+
+    A line that is not a JSON object yields ("line-<n>", None, None).
+    """
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                record = None
+            if not isinstance(record, dict):
+                yield f"line-{number}", None, None
+                continue
+            fields = (query_field,) if query_field else QUERY_FIELDS
+            query = next((record[field] for field in fields if record.get(field)), None)
+            record_id = next((str(record[field]) for field in ID_FIELDS if record.get(field)), f"line-{number}")
+            yield record_id, query, record
+
+
+def load_checkpoint(path):
+    """Ids already answered in `path`; truncates a trailing partial line."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    good_end = 0
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                break
+            if not line.endswith(b"\n"):
+                break
+            good_end += len(line)
+            if result.get("error") is None:
+                done.add(result["id"])
+            else:
+                done.discard(result["id"])
+    if good_end != os.path.getsize(path):
+        with open(path, "r+b") as f:
+            f.truncate(good_end)
+    return done
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that halves on rate limits and grows back one step at a time."""
+
+    def __init__(self, max_limit, min_limit=1, increase_after=10):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.increase_after = increase_after
+        self.limit = max_limit
+        self.active = 0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def __aexit__(self, *exc):
+        async with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+    def on_success(self):
+        self._successes += 1
+        if self._successes >= self.increase_after and self.limit < self.max_limit:
+            self.limit += 1
+            self._successes = 0
+
+    def on_rate_limit(self):
+        self.limit = max(self.min_limit, self.limit // 2)
+        self._successes = 0
+
+
+class BatchRunner:
+    """Feeds queries to a ChaiService and appends results to a JSONL file."""
+
+    def __init__(self, service, output_path, concurrency=8, max_retries=6, backoff=1.0, max_backoff=60.0,
+                 increase_after=10):
+        self.service = service
+        self.output_path = output_path
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.limiter = AdaptiveLimiter(concurrency, increase_after=increase_after)
+        self.stats = {"done": 0, "failed": 0, "skipped": 0, "rate_limited": 0}
+
+    async def _answer(self, record_id, query):
+        session_id = f"batch-{record_id}"
+        started = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.limiter:
+                    result = await self.service.answer(query, session_id)
+                self.limiter.on_success()
+                return {"id": record_id, "query": query, "answer": result["answer"], "steps": result["steps"],
+                        "cached": result["cached"], "seconds": round(time.perf_counter() - started, 3)}
+            except Exception as e:
+                if attempt == self.max_retries or error_status(e) != 429:
+                    return {"id": record_id, "query": query, "error": str(getattr(e, "detail", e)),
+                            "seconds": round(time.perf_counter() - started, 3)}
+                self.stats["rate_limited"] += 1
+                self.limiter.on_rate_limit()
+                delay = retry_after_seconds(e)
+                if delay is None:
+                    delay = min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+                await asyncio.sleep(delay)
+            finally:
+                self.service.sessions.remove(session_id)
+
+    async def run(self, records):
+        done = load_checkpoint(self.output_path)
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        started = time.perf_counter()
+
+        with open(self.output_path, "a", encoding="utf-8") as output:
+            async def worker():
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        return
+                    result = await self._answer(*item)
+                    output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    output.flush()
+                    self.stats["failed" if "error" in result else "done"] += 1
+                    finished = self.stats["done"] + self.stats["failed"]
+                    if finished % 25 == 0:
+                        rate = finished / (time.perf_counter() - started)
+                        print(f"✅ {self.stats['done']} done, {self.stats['failed']} failed, "
+                              f"{rate:.1f} queries/s, concurrency {self.limiter.limit}")
+
+            workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+            for record_id, query, record in records:
+                if record_id in done:
+                    self.stats["skipped"] += 1
+                elif not query:
+                    self.stats["failed"] += 1
+                    error = "Invalid JSON object" if record is None else "No query field"
+                    output.write(json.dumps({"id": record_id, "error": error}) + "\n")
+                else:
+                    await queue.put((record_id, query))
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+
+        self.stats["seconds"] = round(time.perf_counter() - started, 2)
+        return self.stats
+
+
+async def run_batch(service_factory, input_path, output_path, concurrency=8, query_field=None, max_workers=64):
+    # Embedding and retrieval run in threads; size the pool for the concurrency used.
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=max_workers))
+    service = await asyncio.to_thread(service_factory)
+    runner = BatchRunner(service, output_path, concurrency=concurrency)
+    return await runner.run(read_records(input_path, query_field))
+
+
+def main():
+    from chai_doc import ChaiBot
+    from chai_server import ChaiService
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--query-field", default=None)
+    args = parser.parse_args()
+
+    stats = asyncio.run(run_batch(
+        lambda: ChaiService(ChaiBot()), args.input, args.output,
+        concurrency=args.concurrency, query_field=args.query_field,
+    ))
+    print(f"📊 Batch finished: {json.dumps(stats)}")
+
+
+if __name__ == "__main__":
+    main()
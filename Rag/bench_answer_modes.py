@@ -0,0 +1,132 @@
+"""Compare ChaiBot's step-per-call and single-call answer modes.
+
+A stub OpenAI-compatible server plays the model: in "steps" mode it returns
+the next workflow step (plan, analyze, retrieve, synthesize, output) on each
+call, in "single" mode every step at once. Each call costs a fixed
+round-trip latency plus prefill time per prompt token and decode time per
+output token, so the numbers show the effect of fewer calls and of not
+resending the history for every step.
+
+    python Rag/bench_answer_modes.py --questions 5 --rtt 0.3 --prefill-ms 0.02 --decode-ms 4
+"""
+import io
+import json
+import time
+import argparse
+import threading
+import contextlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from openai import OpenAI
+from langchain_core.documents import Document
+
+import chai_doc
+from chai_doc import ChaiBot, SYSTEM_PROMPT, SINGLE_CALL_PROMPT, HISTORY_TOKEN_BUDGET
+from history import ConversationHistory
+from tokens import estimate_tokens, estimate_message_tokens
+
+STEPS = ["plan", "analyze", "retrieve", "synthesize", "output"]
+STEP_TEXT = {
+    "plan": "The user wants to know how routing works in Express. I'll look for the routing docs.",
+    "analyze": "The retrieved context covers app.get, route parameters and express.Router.",
+    "retrieve": "Relevant page: https://chaidocs.vercel.app/youtube/chai-aur-node/routing/",
+    "synthesize": "I'll reproduce the routing section with its code examples and cite the page.",
+    "output": "Routing refers to how an application's endpoints respond to client requests. " * 20,
+}
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    rtt = 0.3
+    prefill_ms = 0.02
+    decode_ms = 4.0
+    calls = 0
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        messages = request["messages"]
+        if '"plan": "<plan step>"' in messages[0]["content"]:
+            reply = json.dumps(STEP_TEXT)
+        else:
+            # Count the steps already taken since the last user message.
+            last_user = max(i for i, message in enumerate(messages) if message["role"] == "user")
+            done = sum(1 for message in messages[last_user:] if message["content"].startswith('{"step"'))
+            step = STEPS[min(done, len(STEPS) - 1)]
+            reply = json.dumps({"step": step, "content": STEP_TEXT[step]})
+
+        prompt_tokens = estimate_message_tokens(messages)
+        type(self).calls += 1
+        time.sleep(self.rtt + prompt_tokens * self.prefill_ms / 1000 + estimate_tokens(reply) * self.decode_ms / 1000)
+        body = json.dumps({
+            "id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": reply}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": estimate_tokens(reply),
+                      "total_tokens": prompt_tokens + estimate_tokens(reply)},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_session(client, mode, questions, context_docs):
+    # Only the answering half of ChaiBot is exercised; no vector store is needed.
+    bot = ChaiBot.__new__(ChaiBot)
+    bot.client = client
+    bot.system_prompt = SINGLE_CALL_PROMPT if mode == "single" else SYSTEM_PROMPT
+    bot.history = ConversationHistory(bot.system_prompt, max_tokens=HISTORY_TOKEN_BUDGET)
+    answer = bot.answer_single_call if mode == "single" else bot.answer_stepwise
+
+    latencies, tokens, calls = [], [], []
+    for i in range(questions):
+        started = time.perf_counter()
+        StubLLMHandler.calls = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            bot.history.start_turn(f"How does routing work? ({i})", context_docs[i])
+            output = answer()
+        assert output == STEP_TEXT["output"], output
+        latencies.append(time.perf_counter() - started)
+        tokens.append(bot.history.turn_summary()["tokens"])
+        calls.append(StubLLMHandler.calls)
+    return latencies, tokens, calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--rtt", type=float, default=0.3, help="seconds of fixed latency per call")
+    parser.add_argument("--prefill-ms", type=float, default=0.02, help="ms per prompt token")
+    parser.add_argument("--decode-ms", type=float, default=4.0, help="ms per output token")
+    args = parser.parse_args()
+
+    StubLLMHandler.rtt = args.rtt
+    StubLLMHandler.prefill_ms = args.prefill_ms
+    StubLLMHandler.decode_ms = args.decode_ms
+    # The stub answers in one piece; streaming does not change the totals measured here.
+    chai_doc.STREAM = False
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = OpenAI(api_key="stub", base_url=f"http://127.0.0.1:{server.server_port}/v1/")
+
+    context_docs = [
+        [Document(id=f"q{i}-c{j}", page_content=f"Express routing, part {j}. " * 40) for j in range(6)]
+        for i in range(args.questions)
+    ]
+
+    print(f"{args.questions} questions, {args.rtt * 1000:.0f}ms per call, "
+          f"{args.prefill_ms}ms/prompt token, {args.decode_ms}ms/output token")
+    print(f"{'mode':>7} {'calls/q':>8} {'latency/q s':>12} {'prompt tokens/q':>16}")
+    for mode in ("steps", "single"):
+        latencies, tokens, calls = run_session(client, mode, args.questions, context_docs)
+        print(f"{mode:>7} {sum(calls) / len(calls):>8.1f} {sum(latencies) / len(latencies):>12.2f} "
+              f"{sum(tokens) / len(tokens):>16.0f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
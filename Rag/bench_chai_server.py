@@ -0,0 +1,236 @@
+"""Load test for chai_server with fake embedding and LLM backends.
+
+One process runs a fake OpenAI-compatible backend (/embeddings with a fixed
+latency, /chat/completions streaming a canned answer chunk by chunk).
+A second process runs chai_server on a NumpyVectorIndex of synthetic chunks
+that was embedded through that backend. The load generator then
+sends --requests streaming queries spread over --sessions sessions with
+--concurrency in flight and reports requests/sec plus latency percentiles
+for the first streamed token and for the complete answer.
+
+    python Rag/bench_chai_server.py --requests 400 --concurrency 32 --sessions 50 --mode single
+"""
+import io
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+import tempfile
+import contextlib
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import numpy as np
+
+STEPS = ["plan", "analyze", "retrieve", "synthesize", "output"]
+STEP_TEXT = {
+    "plan": "The user asks about Express routing; I'll look for the routing docs.",
+    "analyze": "The context covers app.get, route parameters and express.Router.",
+    "retrieve": "Relevant page: https://chaidocs.vercel.app/youtube/chai-aur-node/routing/",
+    "synthesize": "I'll reproduce the routing section with its examples.",
+    "output": "Routing refers to how an application's endpoints respond to client requests. " * 8,
+}
+
+
+class FakeBackendHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    embed_latency = 0.02
+    llm_rtt = 0.2
+    chunk_delay = 0.002
+    chunk_size = 16
+    dim = 64
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path.endswith("/embeddings"):
+            time.sleep(self.embed_latency)
+            data = []
+            for i, text in enumerate(request["input"]):
+                seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:4], "little")
+                vector = np.random.default_rng(seed).normal(size=self.dim)
+                data.append({"index": i, "embedding": vector.tolist()})
+            self._send_json({"data": data, "model": request["model"]})
+            return
+
+        messages = request["messages"]
+        if '"plan": "<plan step>"' in messages[0]["content"]:
+            reply = json.dumps(STEP_TEXT)
+        else:
+            last_user = max(i for i, message in enumerate(messages) if message["role"] == "user")
+            done = sum(1 for message in messages[last_user:] if message["content"].startswith('{"step"'))
+            step = STEPS[min(done, len(STEPS) - 1)]
+            reply = json.dumps({"step": step, "content": STEP_TEXT[step]})
+
+        time.sleep(self.llm_rtt)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i in range(0, len(reply), self.chunk_size):
+            time.sleep(self.chunk_delay)
+            chunk = {"id": "fake", "object": "chat.completion.chunk", "created": 0, "model": "fake",
+                     "choices": [{"index": 0, "finish_reason": None,
+                                  "delta": {"content": reply[i:i + self.chunk_size]}}]}
+            self._send_event(json.dumps(chunk))
+        self._send_event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_event(self, data):
+        event = f"data: {data}\n\n".encode()
+        self.wfile.write(f"{len(event):x}\r\n".encode() + event + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_backend(port, args):
+    FakeBackendHandler.embed_latency = args.embed_latency
+    FakeBackendHandler.llm_rtt = args.llm_rtt
+    FakeBackendHandler.chunk_delay = args.chunk_delay
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeBackendHandler)
+    server.daemon_threads = True
+    server.request_queue_size = 1024
+    server.serve_forever()
+
+
+def run_chai_server(port, backend_url, directory, args):
+    import uvicorn
+    from openai import OpenAI, AsyncOpenAI
+    from langchain_core.documents import Document
+
+    from bm25_index import BM25Index
+    from chai_doc import ChaiBot
+    from chai_server import ChaiService, create_app
+    from embedding_service import EmbeddingService, OpenAICompatibleEmbedder
+    from vector_index import NumpyVectorIndex
+
+    # ChaiBot logs every retrieval and request; keep the benchmark output readable.
+    sys.stdout = io.StringIO()
+
+    def build_service():
+        embeddings = EmbeddingService(embedder=OpenAICompatibleEmbedder(backend_url, "fake"), verbose=False)
+        store = NumpyVectorIndex(embedding_function=embeddings, persist_directory=directory)
+        topics = ["routing", "middleware", "git branches", "mongoose schemas", "docker volumes", "env variables"]
+        docs = [
+            Document(id=f"chunk-{i}", page_content=f"{topics[i % len(topics)]} section {i}. " * 30,
+                     metadata={"source": f"https://chaidocs.vercel.app/page-{i // 4}/"})
+            for i in range(args.chunks)
+        ]
+        store.add_documents(docs, ids=[doc.id for doc in docs])
+        bm25 = BM25Index(f"{directory}/bm25_index.npz")
+        bm25.add([doc.id for doc in docs], [doc.page_content for doc in docs])
+        bot = ChaiBot(client=OpenAI(api_key="fake", base_url=backend_url), store=store, bm25=bm25)
+        llm = AsyncOpenAI(api_key="fake", base_url=backend_url)
+        return ChaiService(bot, llm=llm, answer_mode=args.mode)
+
+    uvicorn.run(create_app(build_service), host="127.0.0.1", port=port, log_level="warning")
+
+
+def free_port():
+    import socket
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def one_request(client, query, session_id):
+    started = time.perf_counter()
+    first_token = None
+    async with client.stream("POST", "/chat/stream", json={"query": query, "session_id": session_id}) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line.startswith("data: "):
+                continue
+            event = json.loads(line[6:])
+            if event["event"] == "delta" and first_token is None:
+                first_token = time.perf_counter() - started
+            elif event["event"] == "error":
+                raise RuntimeError(event["message"])
+            elif event["event"] == "done":
+                break
+    return first_token, time.perf_counter() - started
+
+
+async def load(base_url, args):
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        semaphore = asyncio.Semaphore(args.concurrency)
+        results = []
+
+        async def worker(i):
+            async with semaphore:
+                query = f"How does routing work in Express? variant {i}"
+                results.append(await one_request(client, query, f"session-{i % args.sessions}"))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - started
+        stats = (await client.get("/stats")).json()
+    return results, elapsed, stats
+
+
+def percentiles(values):
+    return "  ".join(f"p{p}={np.percentile(values, p) * 1000:7.1f}ms" for p in (50, 95, 99))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--mode", choices=["steps", "single"], default="single")
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--embed-latency", type=float, default=0.02)
+    parser.add_argument("--llm-rtt", type=float, default=0.2)
+    parser.add_argument("--chunk-delay", type=float, default=0.002)
+    args = parser.parse_args()
+
+    backend_port, server_port = free_port(), free_port()
+    backend_url = f"http://127.0.0.1:{backend_port}/v1"
+    processes = []
+    with tempfile.TemporaryDirectory() as directory:
+        processes.append(multiprocessing.Process(target=run_backend, args=(backend_port, args), daemon=True))
+        processes.append(multiprocessing.Process(
+            target=run_chai_server, args=(server_port, backend_url, directory, args), daemon=True
+        ))
+        for process in processes:
+            process.start()
+        try:
+            base_url = f"http://127.0.0.1:{server_port}"
+            for _ in range(600):
+                with contextlib.suppress(httpx.HTTPError):
+                    if httpx.get(f"{base_url}/stats").status_code == 200:
+                        break
+                time.sleep(0.1)
+            else:
+                raise RuntimeError("chai_server did not start")
+
+            results, elapsed, stats = asyncio.run(load(base_url, args))
+        finally:
+            for process in processes:
+                process.terminate()
+
+    first_tokens = [first for first, _ in results if first is not None]
+    totals = [total for _, total in results]
+    print(f"{args.requests} requests, {args.concurrency} concurrent, {args.sessions} sessions, mode={args.mode}")
+    print(f"throughput: {args.requests / elapsed:.1f} req/s ({elapsed:.1f}s)")
+    print(f"first token: {percentiles(first_tokens)}")
+    print(f"complete   : {percentiles(totals)}")
+    print(f"server: {stats['sessions']} sessions, answer cache {stats['caches']['answers']['hits']} hits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Measure prompt tokens saved by ContextPacker on ChaiBot-shaped chunks.
+
+Builds synthetic documentation pages, splits them exactly like
+ChaiBot.split_text (1000 chars, 200 overlap, "[Title](url)" footer), then
+simulates retrievals that return runs of neighbouring chunks from a few
+pages and compares tokens and source coverage before and after packing.
+
+    python Rag/bench_context_packer.py --queries 500 --k 6 --budget 2500
+"""
+import time
+import random
+import argparse
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from context_packer import ContextPacker
+from tokens import estimate_tokens
+
+WORDS = (
+    "node express server route middleware request response async await promise module "
+    "npm install package json config env variable database mongoose schema model query"
+).split()
+
+
+def make_pages(rng, pages):
+    docs = []
+    for page in range(pages):
+        source = f"https://docs.chaicode.com/youtube/chai-aur-node/page-{page}/"
+        paragraphs = [
+            "\n".join(" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 12))) for _ in range(rng.randint(1, 3)))
+            for _ in range(rng.randint(20, 60))
+        ]
+        title = f"Page {page}"
+        docs.append(Document(page_content="\n\n".join(paragraphs) + f"\n\n[{title}]({source})",
+                             metadata={"source": source}))
+    return docs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=6)
+    parser.add_argument("--budget", type=int, default=2500)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+    chunks = splitter.split_documents(make_pages(rng, args.pages))
+    by_source = {}
+    for i, chunk in enumerate(chunks):
+        chunk.id = str(i)
+        by_source.setdefault(chunk.metadata["source"], []).append(chunk)
+    sources = list(by_source)
+
+    packer = ContextPacker(max_tokens=args.budget)
+    tokens_in = tokens_out = covered = total_sources = 0
+    elapsed = 0.0
+    for _ in range(args.queries):
+        retrieved = []
+        while len(retrieved) < args.k:
+            page = by_source[rng.choice(sources[:rng.randint(1, len(sources))])]
+            start = rng.randrange(len(page))
+            for chunk in page[start:start + rng.randint(1, 3)]:
+                if chunk not in retrieved and len(retrieved) < args.k:
+                    retrieved.append(chunk)
+        started = time.perf_counter()
+        packed = packer.pack(retrieved)
+        elapsed += time.perf_counter() - started
+        tokens_in += sum(estimate_tokens(doc.page_content) for doc in retrieved)
+        tokens_out += sum(estimate_tokens(doc.page_content) for doc in packed)
+        total_sources += packer.last_stats["sources_in"]
+        covered += packer.last_stats["sources_out"]
+
+    print(f"{len(chunks)} chunks from {args.pages} pages, {args.queries} queries, k={args.k}, budget={args.budget}")
+    print(f"avg prompt tokens: {tokens_in / args.queries:.0f} raw -> {tokens_out / args.queries:.0f} packed "
+          f"({100 * (1 - tokens_out / tokens_in):.1f}% fewer)")
+    print(f"source coverage: {covered}/{total_sources}")
+    print(f"pack time: {1000 * elapsed / args.queries:.3f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark EmbeddingService against a local fake embedding endpoint.
+
+The fake speaks the OpenAI-style POST /embeddings protocol, takes a fixed
+time per request plus a small cost per input, and answers 429 with a short
+Retry-After once more than --server-slots requests are in flight. Vectors are
+derived from the text hash, so the output order can be checked exactly.
+
+    python Rag/bench_embedding_service.py --chunks 2000 --concurrency 1 4 8
+"""
+import json
+import time
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from embedding_service import EmbeddingService, OpenAICompatibleEmbedder
+
+DIMENSIONS = 16
+
+
+def fake_vector(text):
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return [byte / 255.0 for byte in digest[:DIMENSIONS]]
+
+
+class FakeEmbeddingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    request_latency = 0.05
+    per_item_latency = 0.0005
+    slots = None
+    rejected = 0
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if not self.slots.acquire(blocking=False):
+            FakeEmbeddingHandler.rejected += 1
+            self._send(429, {"error": {"message": "Resource has been exhausted"}}, {"Retry-After": "0.1"})
+            return
+        try:
+            time.sleep(self.request_latency + self.per_item_latency * len(payload["input"]))
+            data = [
+                {"object": "embedding", "index": i, "embedding": fake_vector(text)}
+                for i, text in enumerate(payload["input"])
+            ]
+        finally:
+            self.slots.release()
+        self._send(200, {"object": "list", "data": data, "model": payload["model"]})
+
+    def _send(self, status, body, headers=None):
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_server(slots):
+    FakeEmbeddingHandler.slots = threading.BoundedSemaphore(slots)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeEmbeddingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--server-slots", type=int, default=6, help="in-flight requests before the fake answers 429")
+    args = parser.parse_args()
+
+    server = start_fake_server(args.server_slots)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    texts = [f"chunk {i}: " + "chai aur code " * (20 + i % 50) for i in range(args.chunks)]
+    expected = [fake_vector(text) for text in texts]
+
+    print(f"{args.chunks} chunks, batch size {args.batch_size}, fake endpoint allows {args.server_slots} in flight\n")
+    print(f"{'concurrency':>11} {'seconds':>8} {'chunks/s':>9} {'retries':>8} {'429s':>5}  order")
+    for concurrency in args.concurrency:
+        FakeEmbeddingHandler.rejected = 0
+        service = EmbeddingService(
+            embedder=OpenAICompatibleEmbedder(base_url, "fake-embedding"),
+            batch_size=args.batch_size,
+            max_concurrency=concurrency,
+            backoff=0.1,
+            verbose=False,
+        )
+        vectors = service.embed_documents(texts)
+        ok = "ok" if vectors == expected else "MISMATCH"
+        print(
+            f"{concurrency:>11} {service.stats['seconds']:>8.2f} {service.stats['chunks_per_sec']:>9.1f} "
+            f"{service.stats['retries']:>8} {FakeEmbeddingHandler.rejected:>5}  {ok}"
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
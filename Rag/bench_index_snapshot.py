@@ -0,0 +1,75 @@
+"""Startup cost of opening an index: numpy store vs. memory-mapped snapshot.
+
+For each corpus size, random unit vectors and ~800-char chunks are written
+as a NumpyVectorIndex directory (embeddings.npy + docs.json) and exported
+to a snapshot. A fresh interpreter then opens each one and answers one
+top-k query; the time is the median over --runs interpreters. The numpy
+store parses every chunk's text and metadata at load, the snapshot only
+reads its header.
+
+    python Rag/bench_index_snapshot.py --sizes 1000 10000 100000 --dim 768
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+import numpy as np
+
+
+def build(directory, count, dim):
+    from vector_index import NumpyVectorIndex
+    from index_snapshot import export_store
+
+    rng = np.random.default_rng(0)
+    store = NumpyVectorIndex(embedding_function=None, persist_directory=os.path.join(directory, "numpy"))
+    texts = [f"Chunk {i}: " + "express routing middleware docker volumes git branches " * 14 for i in range(count)]
+    metadatas = [{"source": f"https://chaidocs.vercel.app/page-{i // 8}/"} for i in range(count)]
+    store.add_embeddings(texts, rng.normal(size=(count, dim)), metadatas=metadatas,
+                         ids=[f"chunk-{i}" for i in range(count)])
+    snapshot = os.path.join(directory, "index.snap")
+    started = time.perf_counter()
+    export_store(store.persist_directory, snapshot, backend="numpy")
+    return store.persist_directory, snapshot, time.perf_counter() - started
+
+
+def measure_open(kind, path, dim, runs):
+    code = (
+        "import time; t = time.perf_counter();"
+        "import numpy as np;"
+        "from index_snapshot import SnapshotVectorIndex; from vector_index import NumpyVectorIndex;"
+        f"s = SnapshotVectorIndex({path!r}, None, {path!r} + '.local') if {kind!r} == 'snapshot' "
+        f"else NumpyVectorIndex(None, {path!r});"
+        f"s.similarity_search_by_vector(np.ones({dim}), k=10);"
+        "print(time.perf_counter() - t)"
+    )
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=cwd)
+        timings.append(float(output.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'chunks':>8} {'numpy store open':>17} {'snapshot open':>14} {'snapshot MB':>12} {'export s':>9}")
+    for count in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            numpy_dir, snapshot, export_seconds = build(directory, count, args.dim)
+            numpy_open = measure_open("numpy", numpy_dir, args.dim, args.runs)
+            snapshot_open = measure_open("snapshot", snapshot, args.dim, args.runs)
+            print(f"{count:>8} {numpy_open * 1000:>14.1f} ms {snapshot_open * 1000:>11.1f} ms "
+                  f"{os.path.getsize(snapshot) / 1e6:>12.1f} {export_seconds:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
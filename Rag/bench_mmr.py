@@ -0,0 +1,70 @@
+"""Benchmark the vectorized MMR in mmr.py against LangChain's reference loop.
+
+First checks that both pick the same indices on random data at ChaiBot's
+parameters (k=10, fetch_k=20, lambda_mult=0.7), then times selection for
+growing fetch_k and the batch API for many queries at once.
+
+    python Rag/bench_mmr.py --dim 768 --fetch-k 20 200 2000 5000
+"""
+import time
+import argparse
+
+import numpy as np
+from langchain_core.vectorstores.utils import maximal_marginal_relevance as reference_mmr
+
+from mmr import maximal_marginal_relevance, maximal_marginal_relevance_batch
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--lambda-mult", type=float, default=0.7)
+    parser.add_argument("--fetch-k", type=int, nargs="+", default=[20, 200, 2000, 5000])
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--trials", type=int, default=500)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    mismatches = 0
+    for _ in range(args.trials):
+        query = rng.normal(size=args.dim).astype(np.float32)
+        candidates = rng.normal(size=(20, args.dim)).astype(np.float32)
+        expected = reference_mmr(query, candidates, lambda_mult=args.lambda_mult, k=args.k)
+        mismatches += expected != maximal_marginal_relevance(query, candidates, lambda_mult=args.lambda_mult, k=args.k)
+    print(f"equivalence at fetch_k=20: {args.trials - mismatches}/{args.trials} identical selections\n")
+
+    print(f"{'fetch_k':>8} {'reference ms':>13} {'vectorized ms':>14} {'speedup':>8}")
+    for fetch_k in args.fetch_k:
+        query = rng.normal(size=args.dim).astype(np.float32)
+        candidates = rng.normal(size=(fetch_k, args.dim)).astype(np.float32)
+        repeat = 3 if fetch_k > 1000 else 10
+        reference = best_of(lambda: reference_mmr(query, candidates, args.lambda_mult, args.k), repeat)
+        vectorized = best_of(lambda: maximal_marginal_relevance(query, candidates, args.lambda_mult, args.k), repeat)
+        print(f"{fetch_k:>8} {reference:>13.2f} {vectorized:>14.3f} {reference / vectorized:>7.0f}x")
+
+    fetch_k = 20
+    queries = rng.normal(size=(args.batch, args.dim)).astype(np.float32)
+    candidates = rng.normal(size=(args.batch, fetch_k, args.dim)).astype(np.float32)
+    one_by_one = best_of(lambda: [
+        maximal_marginal_relevance(q, c, args.lambda_mult, args.k) for q, c in zip(queries, candidates)
+    ], 5)
+    batched = best_of(lambda: maximal_marginal_relevance_batch(queries, candidates, args.lambda_mult, args.k), 5)
+    same = maximal_marginal_relevance_batch(queries, candidates, args.lambda_mult, args.k) == [
+        maximal_marginal_relevance(q, c, args.lambda_mult, args.k) for q, c in zip(queries, candidates)
+    ]
+    print(f"\nbatch of {args.batch} queries at fetch_k={fetch_k}: {one_by_one:.2f}ms one by one, "
+          f"{batched:.2f}ms batched ({'identical' if same else 'MISMATCH'})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Scaling of parallel_split by worker count, checked against the serial splitter.
+
+The corpus is the text of nodejs.pdf's pages repeated --repeat times, each
+copy with its own source metadata. For each worker count the chunks must
+equal RecursiveCharacterTextSplitter.split_documents exactly (text,
+metadata and order). "cold" includes starting the pool, "warm" is a second
+call on the same pool.
+
+    python Rag/bench_parallel_split.py --repeat 40 --workers 1 2 4 8
+"""
+import os
+import time
+import logging
+import argparse
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from parallel_split import ParallelSplitter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_corpus(pdf, repeat):
+    from pypdf import PdfReader
+
+    logging.getLogger("pypdf").setLevel(logging.ERROR)
+    pages = [page.extract_text() for page in PdfReader(pdf).pages]
+    return [
+        Document(page_content=text, metadata={"source": f"copy-{copy}/nodejs.pdf", "page": number})
+        for copy in range(repeat) for number, text in enumerate(pages)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pdf", default=os.path.join(HERE, "nodejs.pdf"))
+    parser.add_argument("--repeat", type=int, default=40)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--start-index", action="store_true", help="use add_start_index=True")
+    args = parser.parse_args()
+
+    docs = load_corpus(args.pdf, args.repeat)
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200, add_start_index=args.start_index)
+    chars = sum(len(doc.page_content) for doc in docs)
+
+    started = time.perf_counter()
+    expected = splitter.split_documents(docs)
+    serial = time.perf_counter() - started
+    print(f"{len(docs)} documents, {chars / 1e6:.1f}M chars, {len(expected)} chunks, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'cold s':>8} {'warm s':>8} {'warm speedup':>13} {'identical':>10}")
+    print(f"{'serial':>8} {serial:>8.2f} {serial:>8.2f} {1.0:>13.2f} {'-':>10}")
+    key = [(chunk.page_content, chunk.metadata) for chunk in expected]
+    for workers in args.workers:
+        with ParallelSplitter(splitter, workers=workers, min_chars=0) as parallel:
+            started = time.perf_counter()
+            chunks = parallel.split_documents(docs)
+            cold = time.perf_counter() - started
+            started = time.perf_counter()
+            chunks = parallel.split_documents(docs)
+            warm = time.perf_counter() - started
+        identical = [(chunk.page_content, chunk.metadata) for chunk in chunks] == key
+        print(f"{workers:>8} {cold:>8.2f} {warm:>8.2f} {serial / warm:>13.2f} {str(identical):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Peak memory and pages/sec: load-everything vs. streaming PDF ingestion.
+
+"load" mirrors ragPDF.ipynb: extract every page into a list (what
+PyPDFLoader.load() does), then split_documents over the whole list.
+"stream" is pdf_ingest.ingest_pdf with --workers processes. Neither
+embeds; both produce the same chunks. To show how memory scales with page
+count, nodejs.pdf is also repeated --repeat times into a larger PDF. Each
+run happens in a fresh interpreter so peak RSS is not shared between runs.
+
+    python Rag/bench_pdf_ingest.py --pdf Rag/nodejs.pdf --repeat 1 8 --workers 1 2 4
+"""
+import os
+import sys
+import json
+import logging
+import argparse
+import tempfile
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+LOAD_ALL = """
+import json, logging, time
+from pypdf import PdfReader
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from pdf_ingest import peak_rss_mb
+logging.getLogger("pypdf").setLevel(logging.ERROR)
+started = time.perf_counter()
+path = {path!r}
+pages = [Document(page_content=page.extract_text(), metadata={{"source": path, "page": i}})
+         for i, page in enumerate(PdfReader(path).pages)]
+chunks = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200).split_documents(pages)
+seconds = time.perf_counter() - started
+print(json.dumps({{"pages": len(pages), "chunks": len(chunks), "seconds": seconds,
+                  "peak_rss_mb": peak_rss_mb()[0], "worker_peak_rss_mb": 0.0}}))
+"""
+
+STREAM = """
+import json
+from pdf_ingest import ingest_pdf
+stats = ingest_pdf({path!r}, workers={workers}, verbose=False)
+print(json.dumps(stats))
+"""
+
+
+def repeat_pdf(path, times, target):
+    from pypdf import PdfReader, PdfWriter
+
+    logging.getLogger("pypdf").setLevel(logging.ERROR)
+    reader = PdfReader(path)
+    writer = PdfWriter()
+    for _ in range(times):
+        for page in reader.pages:
+            writer.add_page(page)
+    with open(target, "wb") as f:
+        writer.write(f)
+
+
+def run(code):
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=HERE)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pdf", default=os.path.join(HERE, "nodejs.pdf"))
+    parser.add_argument("--repeat", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'mode':>10} {'chunks':>7} {'pages/s':>8} {'peak RSS MB':>12} {'worker RSS MB':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for times in args.repeat:
+            path = os.path.abspath(args.pdf)
+            if times > 1:
+                path = os.path.join(directory, f"repeated-{times}.pdf")
+                repeat_pdf(args.pdf, times, path)
+            modes = [("load", LOAD_ALL.format(path=path))]
+            modes += [(f"stream x{workers}", STREAM.format(path=path, workers=workers)) for workers in args.workers]
+            for name, code in modes:
+                stats = run(code)
+                worker_rss = f"{stats['worker_peak_rss_mb']:.1f}" if name not in ("load", "stream x1") else "-"
+                print(f"{stats['pages']:>6} {name:>10} {stats['chunks']:>7} "
+                      f"{stats['pages'] / stats['seconds']:>8.1f} {stats['peak_rss_mb']:>12.1f} {worker_rss:>14}")
+
+
+if __name__ == "__main__":
+    main()
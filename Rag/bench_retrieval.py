@@ -0,0 +1,79 @@
+"""Hit rate of ChaiBot's retrieval modes on a labeled query set.
+
+Each line of Rag/retrieval_queries.jsonl is a query, its kind
+("identifier" for commands, CLI flags and code, "concept" for plain
+questions) and the sitemap pages that answer it. A query is a hit when any
+returned chunk comes from one of those pages. Both modes are run on the
+same query embeddings against ChaiBot's own index: mmr (vector only, k=10)
+and hybrid (BM25 + vector with reciprocal rank fusion, k=HYBRID_K).
+
+Needs the synced doc_store and GOOGLE_API_KEY for the query embeddings;
+run it from the repository root like chai_doc.py:
+
+    python Rag/bench_retrieval.py --misses
+"""
+import os
+import json
+import argparse
+
+from chai_doc import ChaiBot, HYBRID_K
+
+QUERIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "retrieval_queries.jsonl")
+MODES = (("mmr", "mmr k=10"), ("hybrid", f"hybrid k={HYBRID_K}"))
+
+
+def load_queries(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def first_hit(docs, sources):
+    """1-based rank of the first chunk from one of `sources`, or None."""
+    wanted = {source.rstrip("/") for source in sources}
+    for rank, doc in enumerate(docs, 1):
+        if doc.metadata.get("source", "").rstrip("/") in wanted:
+            return rank
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", default=QUERIES_PATH)
+    parser.add_argument("--misses", action="store_true", help="list the queries each mode missed")
+    args = parser.parse_args()
+
+    queries = load_queries(args.queries)
+    bot = ChaiBot(background=False)
+    embeddings = [bot.embed_query(item["query"]) for item in queries]
+    kinds = sorted({item["kind"] for item in queries})
+
+    counts = ", ".join(f"{sum(item['kind'] == kind for item in queries)} {kind}" for kind in kinds)
+    print(f"\n{len(queries)} labeled queries ({counts})")
+    print(f"{'mode':>12} {'hit rate':>9} " + " ".join(f"{kind:>11}" for kind in kinds)
+          + f" {'MRR':>6} {'chunks':>7} {'chars':>7}")
+    misses = {}
+    for mode, name in MODES:
+        ranks, chunks, chars = [], 0, 0
+        for item, embedding in zip(queries, embeddings):
+            docs = bot.search(item["query"], embedding, mode=mode)
+            ranks.append(first_hit(docs, item["sources"]))
+            chunks += len(docs)
+            chars += sum(len(doc.page_content) for doc in docs)
+        misses[name] = [item["query"] for item, rank in zip(queries, ranks) if rank is None]
+        by_kind = []
+        for kind in kinds:
+            hits = [rank is not None for item, rank in zip(queries, ranks) if item["kind"] == kind]
+            by_kind.append(f"{sum(hits) / len(hits):>11.0%}")
+        print(f"{name:>12} {sum(rank is not None for rank in ranks) / len(ranks):>9.0%} " + " ".join(by_kind)
+              + f" {sum(1 / rank for rank in ranks if rank) / len(ranks):>6.2f}"
+              + f" {chunks / len(queries):>7.1f} {chars / len(queries):>7.0f}")
+
+    if args.misses:
+        for name, missed in misses.items():
+            print(f"\n{name} missed {len(missed)}:")
+            for query in missed:
+                print(f"  {query}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Throughput benchmark for SitemapCrawler against a local stub server.
+
+The stub serves every URL from sitemap.xml (rewritten to 127.0.0.1) with a
+fixed per-request latency and honours If-None-Match, so the three runs show
+one-at-a-time fetching (what SitemapLoader does), concurrent cold fetching,
+and concurrent revalidation where every page answers 304.
+
+    python Rag/bench_sitemap_crawler.py --latency 0.1 --concurrency 8
+"""
+import os
+import time
+import argparse
+import tempfile
+import threading
+import hashlib
+from urllib.parse import urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from doc_index import parse_sitemap
+from sitemap_crawler import SitemapCrawler
+
+SITEMAP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sitemap.xml")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.05
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        body = (
+            f"<html><body><h1>{self.path}</h1>"
+            + "<p>Lorem ipsum dolor sit amet, chai aur code. </p>" * 200
+            + "</body></html>"
+        ).encode("utf-8")
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(latency):
+    StubHandler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def local_entries(port):
+    entries = {}
+    for url, lastmod in parse_sitemap(SITEMAP_PATH).items():
+        path = urlparse(url).path
+        entries[f"http://127.0.0.1:{port}{path}"] = lastmod
+    return entries
+
+
+def run(label, crawler, entries):
+    started = time.perf_counter()
+    docs = crawler.crawl(entries)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {len(docs):>3} pages  {elapsed:6.2f}s  {len(docs) / elapsed:8.1f} pages/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05, help="stub server latency per request (s)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    server = start_stub_server(args.latency)
+    entries = local_entries(server.server_address[1])
+    print(f"Stub server on port {server.server_address[1]} serving {len(entries)} URLs, "
+          f"{args.latency * 1000:.0f}ms latency\n")
+
+    with tempfile.TemporaryDirectory() as serial_cache, tempfile.TemporaryDirectory() as cache:
+        serial = run("sequential (cold)", SitemapCrawler(cache_dir=serial_cache, max_concurrency=1), entries)
+        cold = run(f"concurrent x{args.concurrency} (cold)",
+                   SitemapCrawler(cache_dir=cache, max_concurrency=args.concurrency), entries)
+        warm = run(f"concurrent x{args.concurrency} (304s)",
+                   SitemapCrawler(cache_dir=cache, max_concurrency=args.concurrency), entries)
+
+    print(f"\nspeedup cold: {serial / cold:.1f}x, revalidation: {serial / warm:.1f}x vs sequential")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Latency and tokens: ragCsv's retrieval chain vs. the SQL query router.
+
+A synthetic CSV with the TSX columns and --rows rows is loaded two ways.
+For the current chain, every row is a CSVLoader-style document in a
+NumpyVectorIndex with hash embeddings; each question retrieves k=5 rows
+and sends them in a stuffed prompt. For the router, the same CSV goes into
+table_router.CsvTable. A stub OpenAI-compatible server plays the model:
+it returns a scripted route/SQL for router prompts and an answer listing
+the context for stuffed prompts. Every call costs --rtt plus prefill time
+per prompt token and decode time per output token.
+
+SQL answers are checked against values computed directly from the CSV.
+
+    python Rag/bench_table_router.py --rows 200 --rtt 0.3 --prefill-ms 0.02 --decode-ms 4
+"""
+import io
+import csv
+import json
+import time
+import random
+import hashlib
+import argparse
+import tempfile
+import threading
+import contextlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from openai import OpenAI
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from table_router import CsvTable, QueryRouter
+from tokens import estimate_tokens, estimate_message_tokens
+from vector_index import NumpyVectorIndex
+
+HEADERS = ["First Name", "Last Name", "Contact Number", "Gender", "Area", "Sub Area",
+           "Guptin (No)", "Repeat Guption (No)", "Sales ROI", "Margin"]
+AREAS = {"North": ["Downtown", "Uptown"], "South": ["Riverside", "Docks"], "East": ["Harbor", "Market"],
+         "West": ["Hillside", "Park"]}
+FIRST = ["Sarah", "Michael", "James", "Emma", "Olivia", "Liam", "Noah", "Ava", "Mia", "Lucas"]
+LAST = ["Johnson", "Chen", "Patel", "Wilson", "Garcia", "Kim", "Singh", "Brown", "Lopez", "Khan"]
+
+# question -> scripted router decision; the stub "model" returns these.
+QUESTIONS = {
+    "Provide me a full list of all user": {
+        "route": "sql",
+        "sql": "SELECT first_name, last_name, contact_number, gender, area, sub_area FROM data"},
+    "How many users are in the North area?": {
+        "route": "sql", "sql": "SELECT COUNT(*) AS users FROM data WHERE area = 'North' COLLATE NOCASE"},
+    "What is the average Sales ROI per area?": {
+        "route": "sql", "sql": "SELECT area, ROUND(AVG(sales_roi), 2) AS avg_roi FROM data GROUP BY area ORDER BY area"},
+    "Which 3 users have the most Guptin?": {
+        "route": "sql",
+        "sql": "SELECT first_name, last_name, guptin_no FROM data ORDER BY guptin_no DESC, rowid LIMIT 3"},
+    "Who seems to be doing well in the Harbor sub area?": {"route": "search"},
+}
+
+
+def expected_answers(rows):
+    north = sum(1 for row in rows if row["Area"] == "North")
+    by_area = {}
+    for row in rows:
+        by_area.setdefault(row["Area"], []).append(float(row["Sales ROI"]))
+    top = sorted(enumerate(rows), key=lambda item: (-int(item[1]["Guptin (No)"]), item[0]))[:3]
+    return {
+        "Provide me a full list of all user": len(rows),
+        "How many users are in the North area?": [(north,)],
+        "What is the average Sales ROI per area?": [
+            (area, round(sum(values) / len(values), 2)) for area, values in sorted(by_area.items())],
+        "Which 3 users have the most Guptin?": [
+            (row["First Name"], row["Last Name"], int(row["Guptin (No)"])) for _, row in top],
+    }
+
+
+def write_csv(path, count):
+    rng = random.Random(0)
+    rows = []
+    for i in range(count):
+        area = rng.choice(sorted(AREAS))
+        rows.append({
+            "First Name": rng.choice(FIRST), "Last Name": f"{rng.choice(LAST)}{i}",
+            "Contact Number": f" (212) 555-{rng.randint(1000, 9999)}", "Gender": rng.choice(["Female", "Male"]),
+            "Area": area, "Sub Area": rng.choice(AREAS[area]), "Guptin (No)": str(rng.randint(500, 5000)),
+            "Repeat Guption (No)": str(rng.randint(0, 5)), "Sales ROI": f"{rng.uniform(1, 5):.1f}",
+            "Margin": f"{rng.uniform(5, 20):.2f}%",
+        })
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=HEADERS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+class HashEmbeddings(Embeddings):
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:4], "little")
+        return np.random.default_rng(seed).normal(size=64).tolist()
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    rtt = 0.3
+    prefill_ms = 0.02
+    decode_ms = 4.0
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        messages = request["messages"]
+        system, question = messages[0]["content"], messages[-1]["content"]
+        if system.startswith("You answer questions about one SQLite table"):
+            reply = json.dumps(QUESTIONS[question])
+        else:
+            # Like the notebook's answer: the retrieved rows, restated.
+            reply = "Here is what the data shows:\n" + system.split("CSV file. ", 1)[1]
+        prompt_tokens, completion_tokens = estimate_message_tokens(messages), estimate_tokens(reply)
+        time.sleep(self.rtt + prompt_tokens * self.prefill_ms / 1000 + completion_tokens * self.decode_ms / 1000)
+        body = json.dumps({
+            "id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": reply}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def current_chain(client, retriever, question):
+    """retrieve k=5 rows -> stuffed system prompt -> one completion, as in ragCsv.ipynb."""
+    started = time.perf_counter()
+    docs = retriever.invoke(question)
+    context = "\n\n".join(doc.page_content for doc in docs)
+    messages = [
+        {"role": "system", "content": f"You are a helpful assistant that answers questions about the TSX data Of CSV file. {context}"},
+        {"role": "user", "content": question},
+    ]
+    response = client.chat.completions.create(model="stub", messages=messages)
+    return {"seconds": time.perf_counter() - started, "llm_calls": 1, "rows_used": len(docs),
+            "prompt_tokens": response.usage.prompt_tokens, "completion_tokens": response.usage.completion_tokens}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--rtt", type=float, default=0.3, help="seconds of fixed latency per call")
+    parser.add_argument("--prefill-ms", type=float, default=0.02, help="ms per prompt token")
+    parser.add_argument("--decode-ms", type=float, default=4.0, help="ms per output token")
+    args = parser.parse_args()
+
+    StubLLMHandler.rtt = args.rtt
+    StubLLMHandler.prefill_ms = args.prefill_ms
+    StubLLMHandler.decode_ms = args.decode_ms
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = OpenAI(api_key="stub", base_url=f"http://127.0.0.1:{server.server_port}/v1/")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = f"{directory}/TSX.csv"
+        rows = write_csv(path, args.rows)
+        expected = expected_answers(rows)
+        # CSVLoader's page_content: one "Header: value" line per column.
+        docs = [Document(page_content="\n".join(f"{h}: {row[h]}" for h in HEADERS), metadata={"row": i})
+                for i, row in enumerate(rows)]
+        store = NumpyVectorIndex(HashEmbeddings(), directory)
+        store.add_documents(docs, ids=[str(i) for i in range(len(docs))])
+        retriever = store.as_retriever(search_type="similarity", search_kwargs={"k": 5})
+        router = QueryRouter(CsvTable(path), client=client, retriever=retriever, name="TSX")
+
+        print(f"{args.rows} rows, {args.rtt * 1000:.0f}ms per call, {args.prefill_ms}ms/prompt token, "
+              f"{args.decode_ms}ms/output token")
+        print(f"{'question':<52} {'path':>7} {'calls':>5} {'latency s':>9} {'tokens in/out':>14} {'data used':>18}")
+        totals = {"chain": [0.0, 0, 0], "router": [0.0, 0, 0]}
+        for question in QUESTIONS:
+            chain = current_chain(client, retriever, question)
+            with contextlib.redirect_stdout(io.StringIO()):
+                routed = router.answer(question)
+            if routed["route"] == "sql":
+                got = len(routed["rows"]) if isinstance(expected[question], int) else routed["rows"]
+                assert got == expected[question], (question, got, expected[question])
+                used = f"SQL, {args.rows} rows"
+            else:
+                used = "k=5 rows (search)"
+            for name, result, data in (("chain", chain, f"k=5 of {args.rows} rows"), ("router", routed, used)):
+                totals[name][0] += result["seconds"]
+                totals[name][1] += result["prompt_tokens"]
+                totals[name][2] += result["completion_tokens"]
+                print(f"{question[:52]:<52} {name:>7} {result['llm_calls']:>5} {result['seconds']:>9.2f} "
+                      f"{result['prompt_tokens']:>7}/{result['completion_tokens']:<6} {data:>18}")
+        print()
+        for name, (seconds, prompt_tokens, completion_tokens) in totals.items():
+            print(f"{name:>7}: {seconds / len(QUESTIONS):.2f}s/question, "
+                  f"{(prompt_tokens + completion_tokens) / len(QUESTIONS):.0f} tokens/question")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
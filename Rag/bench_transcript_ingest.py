@@ -0,0 +1,127 @@
+"""Multi-video transcript ingestion against a fake transcript provider.
+
+FakeTranscriptProvider mimics youtube_transcript_api's TranscriptList:
+each video has a manual English, generated English or generated Hindi
+transcript (the last needs a translate call), and a few videos have none.
+Listing, fetching and translating each sleep for a fixed latency. The same
+playlist is ingested three ways: one video at a time with a cold cache
+(what looping over the notebook's get_transcript does), on --workers
+threads with a cold cache, and again with the cache warm.
+
+    python Rag/bench_transcript_ingest.py --videos 40 --workers 8 --latency 0.15
+"""
+import time
+import random
+import argparse
+import tempfile
+import threading
+
+from transcript_ingest import TranscriptCache, TranscriptFetcher, ingest_videos
+from transcript_chunker import TimeRangeIndex
+
+WORDS = "python uv pip install project script dependency rust fast virtual environment lock file".split()
+
+
+class NoTranscriptFound(Exception):
+    pass
+
+
+class FakeTranscript:
+    def __init__(self, provider, video_id, language_code, is_generated, segments):
+        self.provider = provider
+        self.video_id = video_id
+        self.language_code = language_code
+        self.is_generated = is_generated
+        self.segments = segments
+
+    def fetch(self):
+        self.provider.call("fetch")
+        return [dict(segment) for segment in self.segments]
+
+    def translate(self, language_code):
+        self.provider.call("translate")
+        translated = [dict(segment, text=f"[{language_code}] {segment['text']}") for segment in self.segments]
+        return FakeTranscript(self.provider, self.video_id, language_code, self.is_generated, translated)
+
+
+class FakeTranscriptList:
+    def __init__(self, transcripts):
+        self.transcripts = transcripts
+
+    def _find(self, languages, generated):
+        for language in languages:
+            for transcript in self.transcripts:
+                if transcript.language_code == language and transcript.is_generated == generated:
+                    return transcript
+        raise NoTranscriptFound(languages)
+
+    def find_manually_created_transcript(self, languages):
+        return self._find(languages, generated=False)
+
+    def find_generated_transcript(self, languages):
+        return self._find(languages, generated=True)
+
+
+class FakeTranscriptProvider:
+    """In-process stand-in for YouTube with per-call latency and call counts."""
+
+    def __init__(self, videos, latency=0.15):
+        self.videos = videos
+        self.latency = latency
+        self.calls = {"list": 0, "fetch": 0, "translate": 0}
+        self._lock = threading.Lock()
+
+    def call(self, kind):
+        with self._lock:
+            self.calls[kind] += 1
+        time.sleep(self.latency)
+
+    def list_transcripts(self, video_id):
+        self.call("list")
+        kind, segments = self.videos[video_id]
+        if kind is None:
+            return FakeTranscriptList([])
+        language, generated = {"manual-en": ("en", False), "generated-en": ("en", True),
+                               "generated-hi": ("hi", True)}[kind]
+        return FakeTranscriptList([FakeTranscript(self, video_id, language, generated, segments)])
+
+
+def make_videos(count, seed=0):
+    rng = random.Random(seed)
+    videos = {}
+    for i in range(count):
+        kind = None if i % 10 == 9 else rng.choice(["manual-en", "generated-en", "generated-hi"])
+        start, segments = 0.0, []
+        for _ in range(rng.randint(300, 700)):
+            duration = rng.uniform(2.0, 5.0)
+            segments.append({"start": round(start, 3), "duration": round(duration, 3),
+                             "text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 9)))})
+            start += duration * 0.8
+        videos[f"video{i:04d}"] = (kind, segments)
+    return videos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.15, help="seconds per list/fetch/translate call")
+    args = parser.parse_args()
+
+    videos = make_videos(args.videos)
+    video_ids = list(videos)
+    print(f"{args.videos} videos, {args.latency * 1000:.0f}ms per provider call")
+    print(f"{'mode':>22} {'seconds':>8} {'first chunk s':>14} {'calls':>6} {'chunks':>7} {'failed':>7}")
+    with tempfile.TemporaryDirectory() as serial_dir, tempfile.TemporaryDirectory() as parallel_dir:
+        for name, workers, cache_dir in (("serial, cold cache", 1, serial_dir),
+                                         (f"{args.workers} workers, cold cache", args.workers, parallel_dir),
+                                         (f"{args.workers} workers, warm cache", args.workers, parallel_dir)):
+            provider = FakeTranscriptProvider(videos, latency=args.latency)
+            fetcher = TranscriptFetcher(provider=provider, cache=TranscriptCache(cache_dir))
+            stats = ingest_videos(video_ids, fetcher, index=TimeRangeIndex(), workers=workers, verbose=False)
+            print(f"{name:>22} {stats['seconds']:>8.2f} {stats['first_chunk_seconds']:>14.2f} "
+                  f"{sum(provider.calls.values()):>6} {stats['chunks']:>7} {stats['failed']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Compare NumpyVectorIndex with Chroma on load time and query latency.
+
+Both stores get the same random unit vectors (no embedding API involved).
+Load time is measured in a fresh interpreter: open the persisted store and
+answer one query. Query latency is p50/p99 over --queries random queries,
+for plain top-k and for the MMR search ChaiBot uses (k=10, fetch_k=20).
+
+    python Rag/bench_vector_index.py --chunks 5000 --dim 768
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+class PrecomputedEmbeddings(Embeddings):
+    def __init__(self, vectors=None, dim=768):
+        self.vectors = vectors or {}
+        self.dim = dim
+
+    def embed_documents(self, texts):
+        return [self.vectors[text] for text in texts]
+
+    def embed_query(self, text):
+        return np.random.default_rng(abs(hash(text)) % 2 ** 32).normal(size=self.dim).tolist()
+
+
+def open_store(backend, directory, dim):
+    if backend == "numpy":
+        from vector_index import NumpyVectorIndex
+        return NumpyVectorIndex(PrecomputedEmbeddings(dim=dim), directory)
+    from langchain_chroma import Chroma
+    return Chroma(embedding_function=PrecomputedEmbeddings(dim=dim), persist_directory=directory, collection_name="docs")
+
+
+def build(backend, directory, texts, vectors, dim):
+    store = open_store(backend, directory, dim)
+    store.embeddings.vectors = dict(zip(texts, vectors))
+    ids = [str(i) for i in range(len(texts))]
+    metadatas = [{"source": f"https://example.com/{i // 10}"} for i in range(len(texts))]
+    for start in range(0, len(texts), 1000):
+        end = start + 1000
+        store.add_texts(texts[start:end], metadatas=metadatas[start:end], ids=ids[start:end])
+
+
+def measure_load(backend, directory, dim):
+    code = (
+        "import time; t = time.perf_counter();"
+        "from bench_vector_index import open_store;"
+        f"s = open_store({backend!r}, {directory!r}, {dim});"
+        "s.similarity_search_by_vector(s.embeddings.embed_query('warmup'), k=10);"
+        "print(time.perf_counter() - t)"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def percentiles(samples):
+    samples = np.array(samples) * 1000
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+def measure_queries(store, queries):
+    plain, mmr = [], []
+    for query in queries:
+        started = time.perf_counter()
+        store.similarity_search_by_vector(query, k=10)
+        plain.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        store.max_marginal_relevance_search_by_vector(query, k=10, fetch_k=20, lambda_mult=0.7)
+        mmr.append(time.perf_counter() - started)
+    return percentiles(plain), percentiles(mmr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(args.chunks, args.dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    texts = [f"chunk {i}" for i in range(args.chunks)]
+    queries = rng.normal(size=(args.queries, args.dim)).tolist()
+
+    print(f"{args.chunks} chunks x {args.dim} dims, {args.queries} queries\n")
+    print(f"{'backend':<8} {'load s':>7} {'top-k p50':>10} {'p99':>7} {'mmr p50':>8} {'p99':>7}  (ms)")
+    for backend in ("chroma", "numpy"):
+        with tempfile.TemporaryDirectory() as directory:
+            build(backend, directory, texts, vectors.tolist(), args.dim)
+            load = measure_load(backend, directory, args.dim)
+            store = open_store(backend, directory, args.dim)
+            (plain50, plain99), (mmr50, mmr99) = measure_queries(store, queries)
+            print(f"{backend:<8} {load:>7.2f} {plain50:>10.2f} {plain99:>7.2f} {mmr50:>8.2f} {mmr99:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
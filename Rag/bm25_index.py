@@ -0,0 +1,183 @@
+import os
+import re
+import math
+import json
+from collections import Counter
+
+import numpy as np
+from langchain_core.documents import Document
+
+# Keeps CLI flags (--force), dotted / dashed / slashed identifiers (node.js,
+# git-commit, src/app) and version-ish tokens (v2.3) together as one token.
+TOKEN_PATTERN = re.compile(r"-{0,2}[a-z0-9_]+(?:[./\-:@+#][a-z0-9_]+)*")
+
+
+def tokenize(text):
+    """Lower-cased tokens; compound identifiers also emit their parts."""
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text.lower()):
+        token = match.group()
+        tokens.append(token)
+        stripped = token.lstrip("-")
+        if stripped != token:
+            tokens.append(stripped)
+        parts = re.split(r"[./\-:@+#]", stripped)
+        if len(parts) > 1:
+            tokens.extend(part for part in parts if part)
+    return tokens
+
+
+class BM25Index:
+    """Inverted index over chunks, scored with Okapi BM25.
+
+    Persisted as a compressed .npz in CSR layout: the vocabulary, an offset
+    per term, and flat int32 doc / uint16 term-frequency arrays. In memory
+    the postings are a dict so pages can be added and removed incrementally.
+    """
+
+    def __init__(self, path, k1=1.5, b=0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.ids = []
+        self.lengths = []
+        self.postings = {}
+        self._row = {}
+        self._dead = set()
+        self.load()
+
+    def __len__(self):
+        return len(self.ids) - len(self._dead)
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        data = np.load(self.path)
+        vocabulary = json.loads(str(data["vocabulary"]))
+        offsets = data["offsets"]
+        docs = data["docs"]
+        freqs = data["freqs"]
+        self.ids = json.loads(str(data["ids"]))
+        self.lengths = data["lengths"].tolist()
+        self._row = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        self.postings = {
+            term: dict(zip(docs[offsets[i]:offsets[i + 1]].tolist(), freqs[offsets[i]:offsets[i + 1]].tolist()))
+            for i, term in enumerate(vocabulary)
+        }
+
+    def save(self):
+        self._compact()
+        vocabulary = sorted(self.postings)
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        docs, freqs = [], []
+        for i, term in enumerate(vocabulary):
+            entries = sorted(self.postings[term].items())
+            docs.extend(doc for doc, _ in entries)
+            freqs.extend(min(freq, 65535) for _, freq in entries)
+            offsets[i + 1] = len(docs)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            vocabulary=json.dumps(vocabulary),
+            ids=json.dumps(self.ids),
+            lengths=np.asarray(self.lengths, dtype=np.int32),
+            offsets=offsets,
+            docs=np.asarray(docs, dtype=np.int32),
+            freqs=np.asarray(freqs, dtype=np.uint16),
+        )
+        os.replace(tmp_path, self.path)
+
+    def _compact(self):
+        if not self._dead:
+            return
+        remap = {}
+        for old, doc_id in enumerate(self.ids):
+            if old not in self._dead:
+                remap[old] = len(remap)
+        self.ids = [doc_id for old, doc_id in enumerate(self.ids) if old in remap]
+        self.lengths = [length for old, length in enumerate(self.lengths) if old in remap]
+        postings = {}
+        for term, entries in self.postings.items():
+            kept = {remap[doc]: freq for doc, freq in entries.items() if doc in remap}
+            if kept:
+                postings[term] = kept
+        self.postings = postings
+        self._row = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        self._dead = set()
+
+    def add(self, ids, texts):
+        self.remove([doc_id for doc_id in ids if doc_id in self._row])
+        for doc_id, text in zip(ids, texts):
+            row = len(self.ids)
+            tokens = tokenize(text)
+            self.ids.append(doc_id)
+            self.lengths.append(len(tokens))
+            self._row[doc_id] = row
+            for term, freq in Counter(tokens).items():
+                self.postings.setdefault(term, {})[row] = freq
+
+    def remove(self, ids):
+        for doc_id in ids:
+            row = self._row.pop(doc_id, None)
+            if row is not None:
+                self._dead.add(row)
+
+    def reset(self):
+        self.ids, self.lengths, self.postings = [], [], {}
+        self._row, self._dead = {}, set()
+
+    def search(self, query, k=10):
+        """Return [(chunk id, score)] for the k best BM25 matches."""
+        if not len(self):
+            return []
+        lengths = np.asarray(self.lengths, dtype=np.float32)
+        alive = np.ones(len(self.ids), dtype=bool)
+        alive[list(self._dead)] = False
+        average = lengths[alive].mean() or 1.0
+        norm = self.k1 * (1 - self.b + self.b * lengths / average)
+
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        for term in set(tokenize(query)):
+            entries = self.postings.get(term)
+            if not entries:
+                continue
+            rows = np.fromiter(entries.keys(), dtype=np.int64, count=len(entries))
+            freqs = np.fromiter(entries.values(), dtype=np.float32, count=len(entries))
+            df = int(alive[rows].sum())
+            idf = math.log(1 + (len(self) - df + 0.5) / (df + 0.5))
+            scores[rows] += idf * freqs * (self.k1 + 1) / (freqs + norm[rows])
+        scores[~alive] = 0.0
+
+        hits = np.flatnonzero(scores)
+        if not len(hits):
+            return []
+        top = hits[np.argsort(-scores[hits], kind="stable")[:k]]
+        return [(self.ids[row], float(scores[row])) for row in top]
+
+
+def reciprocal_rank_fusion(rankings, k=60):
+    """Fuse ranked id lists: score(id) = sum over lists of 1 / (k + rank)."""
+    scores = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+def hybrid_search(store, bm25, query, candidates, k=6, fetch_k=20, rrf_k=60):
+    """Combine BM25 hits with vector candidates using reciprocal rank fusion.
+
+    `candidates` is the vector-ranked Document list (most similar first).
+    Chunks only found by BM25 are read back from the store by id.
+    """
+    by_id = {doc.id: doc for doc in candidates}
+    lexical = [doc_id for doc_id, _ in bm25.search(query, k=fetch_k)]
+    fused = reciprocal_rank_fusion([[doc.id for doc in candidates], lexical], k=rrf_k)[:k]
+
+    missing = [doc_id for doc_id in fused if doc_id not in by_id]
+    if missing:
+        found = store.get(ids=missing)
+        for doc_id, text, metadata in zip(found["ids"], found["documents"], found["metadatas"]):
+            by_id[doc_id] = Document(id=doc_id, page_content=text, metadata=metadata or {})
+    return [by_id[doc_id] for doc_id in fused if doc_id in by_id]
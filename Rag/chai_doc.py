@@ -1,23 +1,54 @@
-from langchain_community.document_loaders.sitemap import SitemapLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 import os
+import sys
 import json
-from openai import OpenAI
+import argparse
+import threading
 from dotenv import load_dotenv
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_chroma import Chroma
+from doc_index import IndexManifest, parse_sitemap, content_hash, chunk_ids
+from query_cache import TTLCache, SemanticAnswerCache, normalize_query
+from history import ConversationHistory
+from context_packer import ContextPacker
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from json_stream import stream_json_completion, stream_json_sections
+
+# The OpenAI SDK, LangChain, Chroma and the crawler take ~2s to import; they
+# are imported where they are first used so the prompt can appear right away.
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
 
 load_dotenv()
 
-class ChaiBot:
-    def __init__(self):
-        print("Initializing ChaiBot...")
-        self.client = OpenAI(
-            api_key=os.getenv("GOOGLE_API_KEY"),
-            base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-        )
-        
-        self.system_prompt = """
+SITEMAP_PATH = "Rag/sitemap.xml"
+PERSIST_DIRECTORY = "doc_store"
+NUMPY_PERSIST_DIRECTORY = "doc_store_numpy"
+# "chroma" or "numpy" (in-process memory-mapped index, see vector_index.py)
+VECTOR_BACKEND = os.getenv("CHAIBOT_VECTOR_BACKEND", "chroma")
+# Prebuilt index snapshot (see index_snapshot.py) to start from instead of re-embedding.
+SNAPSHOT_PATH = os.getenv("CHAIBOT_SNAPSHOT")
+CRAWL_CACHE_DIRECTORY = "crawl_cache"
+ANSWER_CACHE_THRESHOLD = 0.95
+# "mmr" (vector only) or "hybrid" (BM25 + vector, reciprocal rank fusion);
+# compare their hit rates with Rag/bench_retrieval.py before switching.
+RETRIEVAL_MODE = os.getenv("CHAIBOT_RETRIEVAL_MODE", "mmr")
+HYBRID_K = 6
+HISTORY_TOKEN_BUDGET = 12000
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CHAIBOT_CONTEXT_TOKENS", "2500"))
+# "steps" (one LLM call per workflow step) or "single" (every step in one call)
+ANSWER_MODE = os.getenv("CHAIBOT_ANSWER_MODE", "steps")
+# Set AGENT_STREAM=0 to wait for the whole JSON step before printing.
+STREAM = os.getenv("AGENT_STREAM", "1") != "0"
+STEP_LABELS = {
+    "plan": "🧠 PLANNING: ",
+    "analyze": "🔍 ANALYZING: ",
+    "retrieve": "📚 RETRIEVING: ",
+    "synthesize": "🧩 SYNTHESIZING: ",
+    "output": "\n📝 ANSWER:\n",
+}
+
+SYSTEM_PROMPT = """
 You are ChaiBot, an intelligent documentation assistant trained specifically on the official ChaiCode documentation.
 
 
@@ -153,29 +184,137 @@ Output:
     "content": {{Exact content from the documentation}}
 }
 """
+
+# One completion carrying every workflow step, in order, as top-level keys.
+SINGLE_CALL_FORMAT = """IMPORTANT: Go through every workflow step, but answer in ONE response using only the following JSON format, with the keys in this order:
+
+{
+"plan": "<plan step>",
+"analyze": "<analyze step>",
+"retrieve": "<retrieve step>",
+"synthesize": "<synthesize step>",
+"output": "<your final answer>"
+}
+
+Never include anything outside this JSON. No explanations, no extra formatting, no markdown.
+
+Example:
+User query: "How do I use Git branches?"
+
+Output:
+{
+    "plan": "User wants to know about Git branches. I'll find documentation about Git branches.",
+    "analyze": "I found documentation about Git branches that explains what they are and how to use them.",
+    "retrieve": "The documentation explicitly covers Git branches in detail here: - https://chaidocs.vercel.app/youtube/chai-aur-git/branches/",
+    "synthesize": "I'll extract the exact content from the documentation about Git branches, preserving all examples, headings, and formatting.",
+    "output": {{Exact content from the documentation}}
+}
+"""
+SINGLE_CALL_PROMPT = SYSTEM_PROMPT[:SYSTEM_PROMPT.index("IMPORTANT:")] + SINGLE_CALL_FORMAT
+
+
+class ChaiBot:
+    def __init__(self, client=None, store=None, bm25=None, background=True, force_refresh=False):
+        """`store` / `bm25` reuse an already built index instead of syncing doc_store.
+
+        Otherwise the index is synced on a background thread (or inline with
+        `background=False`); the first query waits for it if it is not ready.
+        `force_refresh` revalidates every sitemap page instead of trusting
+        unchanged <lastmod> values.
+        """
+        started = time.perf_counter()
+        print("Initializing ChaiBot...")
+        self._client = client
+        self.force_refresh = force_refresh
+        
+        self.system_prompt = SINGLE_CALL_PROMPT if ANSWER_MODE == "single" else SYSTEM_PROMPT
         
-        self.messages = [
-            {"role": "system", "content": self.system_prompt}
-        ]
+        self.history = ConversationHistory(self.system_prompt, max_tokens=HISTORY_TOKEN_BUDGET)
         
         self.context = ""
+        self.bm25 = None
+        
+        self.search_kwargs = {
+            "k": 10, 
+            "fetch_k": 20,  
+            "lambda_mult": 0.7,
+        }
+        self.query_embeddings = TTLCache(maxsize=1024, ttl=24 * 3600)
+        self.query_contexts = TTLCache(maxsize=512, ttl=3600)
+        self.answer_cache = SemanticAnswerCache(threshold=ANSWER_CACHE_THRESHOLD)
+        self.packer = ContextPacker(max_tokens=CONTEXT_TOKEN_BUDGET)
         
-        print("Setting up vector store and retriever...")
-        self.retriever = self.setup_retriever()
+        self.timings = {"import": IMPORT_SECONDS}
+        self._retriever_ready = threading.Event()
+        self._retriever_error = None
+        
+        if store is None:
+            if background:
+                print("Setting up vector store and retriever in the background...")
+                threading.Thread(target=self._load_retriever, name="chaibot-retriever", daemon=True).start()
+            else:
+                print("Setting up vector store and retriever...")
+                self._load_retriever()
+        else:
+            self.embeddings, self.store, self.bm25 = store.embeddings, store, bm25
+            self.retriever = store.as_retriever(search_type="mmr", search_kwargs=self.search_kwargs)
+            self._retriever_ready.set()
+        self.timings["init"] = time.perf_counter() - started
         print("ChaiBot initialization completed.")
     
-    def load_sitemap(self):
-        print("Loading sitemap...")
-        sitemap_loader = SitemapLoader(web_path="Rag/sitemap.xml", is_local=True)
-        docs = sitemap_loader.load()
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(
+                api_key=os.getenv("GOOGLE_API_KEY"),
+                base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
+            )
+        return self._client
+    
+    @client.setter
+    def client(self, client):
+        self._client = client
+    
+    def _load_retriever(self):
+        started = time.perf_counter()
+        try:
+            self.retriever = self.setup_retriever(force_refresh=self.force_refresh)
+            # Pay for the SDK import now rather than on the first answer.
+            import openai  # noqa: F401
+        except Exception as e:
+            self._retriever_error = e
+            print(f"❌ Error: could not set up the retriever: {e}")
+        finally:
+            self.timings["retriever"] = time.perf_counter() - started
+            self._retriever_ready.set()
+    
+    def wait_for_retriever(self, timeout=None):
+        """Block until the background index sync has finished; re-raises its error."""
+        if not self._retriever_ready.is_set():
+            print("⏳ Waiting for the document index to finish loading...")
+            if not self._retriever_ready.wait(timeout):
+                raise TimeoutError("Document index is still loading")
+        if self._retriever_error is not None:
+            raise self._retriever_error
+    
+    def load_sitemap(self, urls=None):
+        from sitemap_crawler import SitemapCrawler
         
-        urls = [doc.metadata["source"] for doc in docs]
-        page_content = [doc.page_content for doc in docs]
+        print("Loading sitemap...")
+        entries = parse_sitemap(SITEMAP_PATH)
+        if urls is not None:
+            entries = {url: entries[url] for url in urls if url in entries}
+        crawler = SitemapCrawler(cache_dir=CRAWL_CACHE_DIRECTORY, max_concurrency=8)
+        docs = crawler.crawl(entries)
         
         print(f"Loaded {len(docs)} documents from sitemap")
         return docs
     
     def split_text(self, data):
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+        from parallel_split import split_documents
+        
         print("Splitting text into chunks...")
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size = 1000,
@@ -190,48 +329,204 @@ Output:
 
             doc.page_content = f"{doc.page_content}\n\n[{title}]({source})"
             
-        texts = text_splitter.split_documents(documents=data)
+        # Large re-syncs are sharded over a process pool; output is identical.
+        texts = split_documents(text_splitter, data)
+        
+        by_source = {}
+        for chunk in texts:
+            by_source.setdefault(chunk.metadata.get("source"), []).append(chunk)
+        for source, chunks in by_source.items():
+            for chunk_id, chunk in zip(chunk_ids(source, [chunk.page_content for chunk in chunks]), chunks):
+                chunk.id = chunk_id
+        
+        # Keep the keyword index in step with the chunks we just produced.
+        if self.bm25 is not None:
+            self.bm25.add([chunk.id for chunk in texts], [chunk.page_content for chunk in texts])
+        
         print(f"Split into {len(texts)} chunks")
         return texts
     
-    def setup_retriever(self):
-        data = self.load_sitemap()
-        splitted = self.split_text(data)
+    def setup_retriever(self, force_refresh=False, backend=VECTOR_BACKEND):
+        from bm25_index import BM25Index
+        from embedding_cache import EmbeddingCache
+        from embedding_service import EmbeddingService
         
-        if not os.path.exists("doc_store"):
-            print("Creating new Chroma DB...")
-            store = Chroma.from_documents(
-                documents=splitted,
-                embedding=GoogleGenerativeAIEmbeddings(model="models/embedding-001"),
-                persist_directory="doc_store",
-                collection_name="docs"
+        self.embeddings = EmbeddingService(model="models/embedding-001", cache=EmbeddingCache())
+        if backend == "numpy" and SNAPSHOT_PATH:
+            from index_snapshot import SnapshotVectorIndex
+            persist_directory = NUMPY_PERSIST_DIRECTORY
+            print(f"Serving the index from snapshot {SNAPSHOT_PATH}")
+            store = SnapshotVectorIndex(SNAPSHOT_PATH, self.embeddings, persist_directory)
+            store.snapshot.write_files(persist_directory)
+        elif backend == "numpy":
+            from vector_index import NumpyVectorIndex
+            persist_directory = NUMPY_PERSIST_DIRECTORY
+            store = NumpyVectorIndex(
+                embedding_function=self.embeddings,
+                persist_directory=persist_directory
             )
-            print("New Chroma DB created.")
         else:
+            from langchain_chroma import Chroma
+            persist_directory = PERSIST_DIRECTORY
+            if SNAPSHOT_PATH and not os.path.exists(os.path.join(persist_directory, "manifest.json")):
+                from index_snapshot import restore_snapshot
+                count = restore_snapshot(SNAPSHOT_PATH, persist_directory, collection_name="docs")
+                print(f"Restored {count} chunks from snapshot {SNAPSHOT_PATH}")
             store = Chroma(
-                embedding_function=GoogleGenerativeAIEmbeddings(model="models/embedding-001"),
-                persist_directory="doc_store",
+                embedding_function=self.embeddings,
+                persist_directory=persist_directory,
                 collection_name="docs"
             )
-            print("Existing Chroma DB loaded.")
+        self.bm25 = BM25Index(os.path.join(persist_directory, "bm25_index.npz"))
+        self.sync_index(store, persist_directory, force_refresh=force_refresh)
+        self.store = store
+        
+        if not len(self.bm25) and store.get(limit=1)["ids"]:
+            print("Building keyword index from the existing vector store...")
+            existing = store.get()
+            self.bm25.add(existing["ids"], existing["documents"])
+            self.bm25.save()
                     
         retriever = store.as_retriever(
             search_type="mmr",
-            search_kwargs={
-                "k": 10, 
-                "fetch_k": 20,  
-                "lambda_mult": 0.7,
-            }
+            search_kwargs=self.search_kwargs
         )
 
         return retriever
     
-    def get_context_for_query(self, query):
+    def sync_index(self, store, persist_directory, force_refresh=False):
+        """Bring the Chroma collection in line with the sitemap.
+
+        Only new pages or pages whose <lastmod> changed are fetched, only pages
+        whose content hash changed are re-split, and only chunks that did not
+        exist before are embedded. An unchanged sitemap costs a manifest read.
+        With `force_refresh` (chai_doc.py --refresh) every page is requested
+        again; the crawl cache revalidates it with ETag / Last-Modified, so an
+        unchanged page costs a 304 and is not re-split.
+        """
+        manifest = IndexManifest(os.path.join(persist_directory, "manifest.json"))
+        entries = parse_sitemap(SITEMAP_PATH)
+
+        if not manifest.pages and store.get(limit=1)["ids"]:
+            print("Existing Chroma DB has no manifest, rebuilding it...")
+            store.reset_collection()
+            self.bm25.reset()
+
+        if force_refresh:
+            stale, removed = list(entries), [url for url in manifest.pages if url not in entries]
+        else:
+            stale, removed = manifest.diff(entries)
+
+        if not stale and not removed:
+            print(f"Index up to date ({len(manifest.pages)} pages), skipping crawl.")
+            return
+
+        print(f"Index sync: {len(stale)} new/updated pages, {len(removed)} removed pages")
+
+        deleted_ids = []
+        for url in removed:
+            deleted_ids.extend(manifest.remove_page(url))
+
+        changed_docs = []
+        data = self.load_sitemap(urls=stale) if stale else []
+        for doc in data:
+            url = doc.metadata["source"]
+            page_hash = content_hash(doc.page_content)
+            if manifest.page_changed(url, page_hash):
+                changed_docs.append((doc, page_hash))
+            else:
+                manifest.update_page(url, entries[url], page_hash)
+
+        new_chunks = []
+        new_ids = []
+        splitted = self.split_text([doc for doc, _ in changed_docs])
+        by_source = {}
+        for chunk in splitted:
+            by_source.setdefault(chunk.metadata["source"], []).append(chunk)
+
+        for doc, page_hash in changed_docs:
+            url = doc.metadata["source"]
+            chunks = by_source.get(url, [])
+            ids = [chunk.id for chunk in chunks]
+            old_ids = set(manifest.chunks_for(url))
+            deleted_ids.extend(old_ids.difference(ids))
+            for chunk_id, chunk in zip(ids, chunks):
+                if chunk_id not in old_ids:
+                    new_ids.append(chunk_id)
+                    new_chunks.append(chunk)
+            manifest.update_page(url, entries[url], page_hash, ids)
+
+        if deleted_ids:
+            store.delete(ids=deleted_ids)
+            self.bm25.remove(deleted_ids)
+        if new_chunks:
+            store.add_documents(documents=new_chunks, ids=new_ids)
+        manifest.save()
+        self.bm25.save()
+        print(f"Index sync done: {len(new_chunks)} chunks embedded, {len(deleted_ids)} chunks removed.")
+
+    def embed_query(self, query):
+        key = normalize_query(query)
+        embedding = self.query_embeddings.get(key)
+        if embedding is None:
+            self.wait_for_retriever()
+            embedding = self.embeddings.embed_query(query)
+            self.query_embeddings.put(key, embedding)
+        return embedding
+    
+    def retrieve(self, query):
         print(f"🔍 Retrieving context for: {query}")
-        docs = self.retriever.invoke(query)
-        context = "\n\n".join([doc.page_content for doc in docs])
+        key = normalize_query(query)
+        docs = self.query_contexts.get(key)
+        if docs is not None:
+            print("Retrieved context from cache")
+            return docs
+        
+        embedding = self.embed_query(query)
+        docs = self.search(query, embedding)
+        self.query_contexts.put(key, docs)
         print(f"Retrieved {len(docs)} relevant documents")
-        return context
+        return docs
+    
+    def search(self, query, embedding, mode=None):
+        """Uncached retrieval: MMR over vectors (k=10), or hybrid BM25 + vector (k=HYBRID_K)."""
+        from mmr import mmr_search_by_vector, vector_candidates
+        from bm25_index import hybrid_search
+        
+        self.wait_for_retriever()
+        if (mode or RETRIEVAL_MODE) == "hybrid":
+            candidates, _ = vector_candidates(self.store, embedding, self.search_kwargs["fetch_k"])
+            return hybrid_search(
+                self.store, self.bm25, query, candidates,
+                k=HYBRID_K, fetch_k=self.search_kwargs["fetch_k"]
+            )
+        return mmr_search_by_vector(self.store, embedding, **self.search_kwargs)
+    
+    def get_context_docs(self, query, sent=()):
+        """Retrieved chunks merged, de-duplicated and packed to CONTEXT_TOKEN_BUDGET.
+
+        Chunks whose ids are in `sent` (already in the conversation) are not
+        packed with new ones; they are returned as they are, after the packed
+        blocks, so the history can refer to them by id.
+        """
+        retrieved = self.retrieve(query)
+        already = [doc for doc in retrieved if doc.id in sent]
+        docs = self.packer.pack([doc for doc in retrieved if doc.id not in sent]) + already
+        stats = self.packer.last_stats
+        print(f"🧱 Packed {stats['chunks']} chunks into {stats['packed']} blocks "
+              f"(~{stats['tokens_in']} → ~{stats['tokens_out']} tokens, "
+              f"{stats['sources_out']}/{stats['sources_in']} sources)")
+        return docs
+    
+    def get_context_for_query(self, query):
+        return "\n\n".join([doc.page_content for doc in self.get_context_docs(query)])
+    
+    def cache_stats(self):
+        return {
+            "query_embeddings": self.query_embeddings.stats(),
+            "query_contexts": self.query_contexts.stats(),
+            "answers": self.answer_cache.stats(),
+        }
     
     def process_response(self, content):
         """Format the response for better readability"""
@@ -239,19 +534,101 @@ Output:
             step = content["step"].lower()
             step_content = content["content"]
             
-            if step == "plan":
-                return f"🧠 PLANNING: {step_content}"
-            elif step == "analyze":
-                return f"🔍 ANALYZING: {step_content}"
-            elif step == "retrieve":
-                return f"📚 RETRIEVING: {step_content}"
-            elif step == "synthesize":
-                return f"🧩 SYNTHESIZING: {step_content}"
-            elif step == "output":
-                return f"\n📝 ANSWER:\n{step_content}"
+            if step in STEP_LABELS:
+                return f"{STEP_LABELS[step]}{step_content}"
         
         return content
     
+    def complete(self, messages, labels, streamer):
+        """One LLM call; returns (response text, whether it was already printed)."""
+        if STREAM:
+            response_content, stream_stats = streamer(
+                self.client,
+                labels,
+                model="gemini-2.0-flash",
+                response_format={"type": "json_object"},
+                messages=messages,
+            )
+            return response_content, stream_stats["rendered"]
+        response = self.client.chat.completions.create(
+            model="gemini-2.0-flash",
+            response_format={"type": "json_object"},
+            messages=messages,
+        )
+        return response.choices[0].message.content, False
+    
+    def answer_stepwise(self):
+        """One LLM call per workflow step until the model emits "output"."""
+        conversation_active = True
+        current_step = None
+        answer = None
+        
+        while conversation_active:
+            try:
+                messages = self.history.messages()
+                self.history.log_request(messages)
+                # Like the blocking path, only a change of step is printed.
+                labels = {name: label for name, label in STEP_LABELS.items() if name != current_step}
+                response_content, rendered = self.complete(messages, labels, stream_json_completion)
+                
+                try:
+                    parsed_output = json.loads(response_content)
+                    
+                    self.history.append({
+                        "role": "assistant",
+                        "content": response_content
+                    })
+                    
+                    step = parsed_output.get("step", "").lower()
+                    
+                    if step != current_step:
+                        current_step = step
+                        if not rendered:
+                            formatted_output = self.process_response(parsed_output)
+                            print(formatted_output)
+                    
+                    if step == "output":
+                        answer = parsed_output.get("content")
+                        conversation_active = False
+                    
+                except json.JSONDecodeError:
+                    print("❌ Error: Invalid JSON response from API")
+                    print(f"Raw response: {response_content[:100]}...")
+                    conversation_active = False
+                    
+            except Exception as e:
+                print(f"❌ Error: {str(e)}")
+                conversation_active = False
+        return answer
+    
+    def answer_single_call(self):
+        """All workflow steps from one LLM call (see SINGLE_CALL_FORMAT)."""
+        try:
+            messages = self.history.messages()
+            self.history.log_request(messages)
+            response_content, rendered = self.complete(messages, STEP_LABELS, stream_json_sections)
+            
+            try:
+                parsed_output = json.loads(response_content)
+            except json.JSONDecodeError:
+                print("❌ Error: Invalid JSON response from API")
+                print(f"Raw response: {response_content[:100]}...")
+                return None
+            
+            self.history.append({
+                "role": "assistant",
+                "content": response_content
+            })
+            if not rendered:
+                for step, step_content in parsed_output.items():
+                    if step.lower() in STEP_LABELS:
+                        print(self.process_response({"step": step, "content": step_content}))
+            return parsed_output.get("output")
+            
+        except Exception as e:
+            print(f"❌ Error: {str(e)}")
+            return None
+    
     def run(self):
         print("\n" + "=" * 60)
         print("🚀 ChaiBot Documentation Assistant 🚀")
@@ -265,67 +642,98 @@ Output:
                 query = input("➤ Ask about ChaiCode docs: ")
                 
                 if query.lower() in ["exit", "quit"]:
+                    print(f"📊 Cache stats: {json.dumps(self.cache_stats())}")
                     print("\n👋 Goodbye! ChaiBot Documentation Assistant is shutting down.")
                     break
                 
-                context = self.get_context_for_query(query)
-                self.messages.append({
-                    "role": "user", 
-                    "content": query
-                })
-                self.messages.append({
-                    "role": "assistant", 
-                    "content": f"Relevant ChaiCode documentation context:\n\n{context}"
-                })
+                query_embedding = self.embed_query(query)
+                cached_answer = self.answer_cache.get(query_embedding)
+                if cached_answer is not None:
+                    cached_output = {"step": "output", "content": cached_answer}
+                    self.history.start_turn(query)
+                    self.history.append({
+                        "role": "assistant",
+                        "content": json.dumps({"output": cached_answer} if ANSWER_MODE == "single" else cached_output)
+                    })
+                    print("\n⚡ Answer served from cache")
+                    print(self.process_response(cached_output))
+                    print("\n" + "-" * 60 + "\n")
+                    continue
                 
-                conversation_active = True
-                current_step = None
+                docs = self.get_context_docs(query, sent=self.history.sent_chunk_ids())
+                self.history.start_turn(query, docs)
                 
                 print("\n⏳ Processing your query...\n")
                 
-                while conversation_active:
-                    try:
-                        response = self.client.chat.completions.create(
-                            model="gemini-2.0-flash",
-                            response_format={"type": "json_object"},
-                            messages=self.messages,
-                        )
-                        
-                        try:
-                            response_content = response.choices[0].message.content
-
-
-                            parsed_output = json.loads(response_content)
-                            
-                            self.messages.append({
-                                "role": "assistant",
-                                "content": response_content
-                            })
-                            
-                            step = parsed_output.get("step", "").lower()
-                            
-                            if step != current_step:
-                                current_step = step
-                                formatted_output = self.process_response(parsed_output)
-                                print(formatted_output)
-                            
-                            if step == "output":
-                                conversation_active = False
-                            
-                        except json.JSONDecodeError:
-                            print("❌ Error: Invalid JSON response from API")
-                            print(f"Raw response: {response_content[:100]}...")
-                            conversation_active = False
-                            
-                    except Exception as e:
-                        print(f"❌ Error: {str(e)}")
-                        conversation_active = False
+                if ANSWER_MODE == "single":
+                    answer = self.answer_single_call()
+                else:
+                    answer = self.answer_stepwise()
+                if answer is not None:
+                    self.answer_cache.put(query_embedding, query, answer)
                 
+                summary = self.history.turn_summary()
+                print(f"\n📊 Turn {summary['turn']}: {summary['requests']} requests, ~{summary['tokens']} prompt tokens")
                 print("\n" + "-" * 60 + "\n")
                 
         except KeyboardInterrupt:
             print("\n👋 Goodbye! ChaiBot Documentation Assistant is shutting down.")
 
+def import_profile(module="chai_doc", top=10):
+    """(total seconds, [(name, seconds)] of the slowest direct imports) for `module`.
+
+    Measured with `python -X importtime` in a fresh interpreter.
+    """
+    import subprocess
+    
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True,
+    )
+    # "import time: <self us> | <cumulative us> | <2 spaces per level><name>", children before parents.
+    rows = []
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            rows.append((len(name) - len(name.lstrip()), name.strip(), int(cumulative) / 1e6))
+    if not rows or rows[-1][1] != module:
+        return 0.0, []
+    depth, _, total = rows[-1]
+    children = []
+    for level, name, seconds in reversed(rows[:-1]):
+        if level <= depth:
+            break
+        if level == depth + 2:
+            children.append((name, seconds))
+    return total, sorted(children, key=lambda child: -child[1])[:top]
+
+
+def startup_report(bot):
+    """Print where startup time goes: module import, ChaiBot(), index load, slowest imports."""
+    bot._retriever_ready.wait()
+    print("\n⏱️  Startup report")
+    print(f"  import chai_doc      {bot.timings['import'] * 1000:8.1f} ms")
+    print(f"  ChaiBot() → prompt   {bot.timings['init'] * 1000:8.1f} ms")
+    if "retriever" in bot.timings:
+        print(f"  index ready (bg)     {bot.timings['retriever'] * 1000:8.1f} ms")
+    total, imports = import_profile()
+    if imports:
+        print(f"\n  import chai_doc in a fresh interpreter: {total * 1000:.1f} ms; slowest direct imports:")
+        for name, seconds in imports:
+            print(f"    {seconds * 1000:8.1f} ms  {name}")
+
+
 if __name__ == "__main__":
-    bot = ChaiBot()
-    bot.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="ChaiBot documentation assistant")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print startup timings and the slowest imports, then exit")
+    parser.add_argument("--sync", action="store_true",
+                        help="load the index before showing the prompt instead of in the background")
+    parser.add_argument("--refresh", action="store_true",
+                        help="re-check every page (conditional GET), not just those whose <lastmod> changed")
+    args = parser.parse_args()
+    bot = ChaiBot(background=not args.sync, force_refresh=args.refresh)
+    if args.startup_report:
+        startup_report(bot)
+    else:
+        bot.run()
\ No newline at end of file
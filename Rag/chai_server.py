@@ -0,0 +1,284 @@
+"""Multi-session HTTP server for ChaiBot.
+
+The vector store, keyword index, caches and LLM client are loaded once and
+shared by every session; each session only owns its ConversationHistory.
+Embedding and retrieval run in worker threads and LLM calls go through
+AsyncOpenAI, so one slow request never blocks the others.
+
+    python Rag/chai_server.py --port 8000
+
+    POST /chat            {"query": "...", "session_id": "..."}  -> JSON answer
+    POST /chat/stream     same body -> text/event-stream of session/step/delta/done events
+    DELETE /sessions/{id}
+    GET /stats
+"""
+import os
+import json
+import time
+import uuid
+import asyncio
+import argparse
+from collections import OrderedDict
+from contextlib import aclosing, asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from openai import AsyncOpenAI
+from pydantic import BaseModel
+
+from chai_doc import ChaiBot, ANSWER_MODE, HISTORY_TOKEN_BUDGET, STEP_LABELS, SYSTEM_PROMPT, SINGLE_CALL_PROMPT
+from embedding_service import error_status, retry_after_seconds
+from history import ConversationHistory
+from json_stream import JSONEnvelopeParser
+
+MODEL = "gemini-2.0-flash"
+MAX_SESSIONS = 1000
+SESSION_IDLE_TTL = 3600
+# Guards the step-per-call loop against a model that never reaches "output".
+MAX_STEPS = 8
+
+
+class Session:
+    def __init__(self, session_id, history):
+        self.id = session_id
+        self.history = history
+        # Requests within one session are answered in order.
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+
+class SessionStore:
+    """Bounded LRU of per-session histories; idle sessions expire after `idle_ttl` seconds."""
+
+    def __init__(self, system_prompt, max_sessions=MAX_SESSIONS, idle_ttl=SESSION_IDLE_TTL):
+        self.system_prompt = system_prompt
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self._sessions = OrderedDict()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.idle_ttl
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.last_used > cutoff:
+                break
+            self._sessions.popitem(last=False)
+
+    def get(self, session_id=None):
+        """Return the session, creating it (with a new id if none is given)."""
+        self._expire()
+        session = self._sessions.get(session_id) if session_id else None
+        if session is None:
+            session_id = session_id or uuid.uuid4().hex
+            history = ConversationHistory(self.system_prompt, max_tokens=HISTORY_TOKEN_BUDGET)
+            session = self._sessions[session_id] = Session(session_id, history)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        session.last_used = time.monotonic()
+        self._sessions.move_to_end(session.id)
+        return session
+
+    def remove(self, session_id):
+        return self._sessions.pop(session_id, None) is not None
+
+
+class ChaiService:
+    """Answers queries for many sessions on top of one shared ChaiBot."""
+
+    def __init__(self, bot, llm=None, answer_mode=ANSWER_MODE, max_sessions=MAX_SESSIONS):
+        self.bot = bot
+        self.llm = llm or AsyncOpenAI(
+            api_key=os.getenv("GOOGLE_API_KEY"),
+            base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
+        )
+        self.answer_mode = answer_mode
+        prompt = SINGLE_CALL_PROMPT if answer_mode == "single" else SYSTEM_PROMPT
+        self.sessions = SessionStore(prompt, max_sessions=max_sessions)
+
+    async def _completion_text(self, messages):
+        # Read the SSE lines directly: building the SDK's pydantic chunk objects
+        # costs more CPU than everything else the server does per token.
+        async with self.llm.chat.completions.with_streaming_response.create(
+            model=MODEL,
+            response_format={"type": "json_object"},
+            messages=messages,
+            stream=True,
+        ) as response:
+            async for line in response.iter_lines():
+                if not line.startswith("data: ") or line == "data: [DONE]":
+                    continue
+                choices = json.loads(line[6:]).get("choices")
+                if choices and choices[0].get("delta", {}).get("content"):
+                    yield choices[0]["delta"]["content"]
+
+    async def _stream(self, history, sections):
+        """Yield step/delta events for one completion, then {"event": "raw"} with the full text."""
+        messages = history.messages()
+        history.log_request(messages)
+        parser = JSONEnvelopeParser()
+        chunks, held, opened, step = [], [], [], None
+        async for text in self._completion_text(messages):
+            chunks.append(text)
+            for kind, key, value in parser.feed(text):
+                if sections:
+                    if key.lower() not in STEP_LABELS:
+                        continue
+                    if key not in opened:
+                        opened.append(key)
+                        yield {"event": "step", "step": key.lower()}
+                    if kind == "delta" or not isinstance(value, str):
+                        yield {"event": "delta", "text": value if kind == "delta" else json.dumps(value)}
+                elif key == "step" and kind == "value":
+                    step = str(value).lower()
+                    yield {"event": "step", "step": step}
+                    for piece in held:
+                        yield {"event": "delta", "text": piece}
+                    held = []
+                elif key == "content" and (kind == "delta" or not isinstance(value, str)):
+                    piece = value if kind == "delta" else json.dumps(value)
+                    if step is None:
+                        held.append(piece)
+                    else:
+                        yield {"event": "delta", "text": piece}
+        yield {"event": "raw", "text": "".join(chunks)}
+
+    async def answer_events(self, query, session_id=None):
+        """Async generator of the events for one query; the last one is "done" or "error"."""
+        session = self.sessions.get(session_id)
+        async with session.lock:
+            history = session.history
+            yield {"event": "session", "session_id": session.id}
+
+            try:
+                embedding = await asyncio.to_thread(self.bot.embed_query, query)
+                cached = self.bot.answer_cache.get(embedding)
+                if cached is not None:
+                    history.start_turn(query)
+                    output = {"output": cached} if self.answer_mode == "single" else {"step": "output", "content": cached}
+                    history.append({"role": "assistant", "content": json.dumps(output)})
+                    yield {"event": "step", "step": "output"}
+                    yield {"event": "delta", "text": cached}
+                    yield {"event": "done", "answer": cached, "cached": True}
+                    return
+
+                docs = await asyncio.to_thread(self.bot.get_context_docs, query, history.sent_chunk_ids())
+                history.start_turn(query, docs)
+
+                answer = None
+                for _ in range(1 if self.answer_mode == "single" else MAX_STEPS):
+                    raw = None
+                    async for event in self._stream(history, sections=self.answer_mode == "single"):
+                        if event["event"] == "raw":
+                            raw = event["text"]
+                        else:
+                            yield event
+                    try:
+                        parsed_output = json.loads(raw)
+                    except json.JSONDecodeError:
+                        yield {"event": "error", "message": f"Invalid JSON response from API: {raw[:100]}"}
+                        return
+                    history.append({"role": "assistant", "content": raw})
+                    if self.answer_mode == "single":
+                        answer = parsed_output.get("output")
+                    elif parsed_output.get("step", "").lower() == "output":
+                        answer = parsed_output.get("content")
+                    if answer is not None:
+                        break
+
+                if answer is None:
+                    yield {"event": "error", "message": "No answer produced"}
+                    return
+                self.bot.answer_cache.put(embedding, query, answer)
+                yield {"event": "done", "answer": answer, "cached": False}
+            except Exception as e:
+                yield {"event": "error", "message": str(e), "status": error_status(e),
+                       "retry_after": retry_after_seconds(e)}
+
+    async def answer(self, query, session_id=None):
+        steps, result = [], {}
+        # aclosing releases the session lock as soon as we stop, even on error.
+        async with aclosing(self.answer_events(query, session_id)) as events:
+            async for event in events:
+                if event["event"] == "session":
+                    result["session_id"] = event["session_id"]
+                elif event["event"] == "step":
+                    steps.append({"step": event["step"], "content": ""})
+                elif event["event"] == "delta" and steps:
+                    steps[-1]["content"] += event["text"]
+                elif event["event"] == "done":
+                    result.update(answer=event["answer"], cached=event["cached"])
+                elif event["event"] == "error":
+                    # Upstream rate limits stay 429 (with Retry-After) so callers can back off.
+                    retry_after = event.get("retry_after")
+                    raise HTTPException(
+                        status_code=429 if event.get("status") == 429 else 502,
+                        detail=event["message"],
+                        headers={"Retry-After": f"{retry_after:g}"} if retry_after is not None else None,
+                    )
+        result["steps"] = steps
+        return result
+
+    def stats(self):
+        return {"sessions": len(self.sessions), "answer_mode": self.answer_mode, "caches": self.bot.cache_stats()}
+
+
+class ChatRequest(BaseModel):
+    query: str
+    session_id: str | None = None
+
+
+def create_app(service_factory=None, max_workers=64):
+    """FastAPI app; `service_factory` builds the ChaiService once at startup."""
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # Embedding and retrieval calls are blocking; give them enough threads.
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=max_workers))
+        factory = service_factory or (lambda: ChaiService(ChaiBot()))
+        app.state.service = await asyncio.to_thread(factory)
+        yield
+
+    app = FastAPI(title="ChaiBot", lifespan=lifespan)
+
+    @app.post("/chat")
+    async def chat(request: ChatRequest):
+        return await app.state.service.answer(request.query, request.session_id)
+
+    @app.post("/chat/stream")
+    async def chat_stream(request: ChatRequest):
+        async def events():
+            # A client that disconnects mid-stream must not leave the session locked.
+            async with aclosing(app.state.service.answer_events(request.query, request.session_id)) as stream:
+                async for event in stream:
+                    yield f"data: {json.dumps(event)}\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.delete("/sessions/{session_id}")
+    async def delete_session(session_id: str):
+        if not app.state.service.sessions.remove(session_id):
+            raise HTTPException(status_code=404, detail="Unknown session")
+        return {"deleted": session_id}
+
+    @app.get("/stats")
+    async def stats():
+        return app.state.service.stats()
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve ChaiBot over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    uvicorn.run(create_app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
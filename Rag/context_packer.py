@@ -0,0 +1,138 @@
+import re
+
+from tokens import estimate_tokens
+
+# The "[Title](url)" line split_text appends to every page. With a 200-char
+# overlap it can end up in the last two chunks of a page.
+FOOTER_PATTERN = re.compile(r"(?:^|\n+)\[[^\]\n]+\]\(https?://[^)\s]+\)[ \t]*(?=\n|$)")
+MIN_OVERLAP = 20
+
+
+def split_footer(text):
+    """Return (text without [Title](url) footers, the first footer or None)."""
+    match = FOOTER_PATTERN.search(text)
+    if not match:
+        return text, None
+    return FOOTER_PATTERN.sub("", text).strip(), match.group().strip()
+
+
+def overlap_length(left, right, max_overlap=None, min_overlap=MIN_OVERLAP):
+    """Length of the longest suffix of `left` that is a prefix of `right`."""
+    limit = min(len(left), len(right), max_overlap or len(right))
+    if limit < min_overlap:
+        return 0
+    probe = right[:min_overlap]
+    start = len(left) - limit
+    while True:
+        position = left.find(probe, start)
+        if position < 0:
+            return 0
+        size = len(left) - position
+        if size <= len(right) and right.startswith(left[position:]):
+            return size
+        start = position + 1
+
+
+class ContextPacker:
+    """Turns retrieved chunks into a compact, token-budgeted context.
+
+    Chunks from the same page that overlap (the splitter repeats up to
+    `chunk_overlap` characters between neighbours) are stitched back into one
+    span, the repeated "[Title](url)" footers are stripped and emitted once
+    per source, and spans are then packed by score until `max_tokens` is
+    reached, taking the best span of every source before any second span so
+    the budget trims depth rather than source coverage.
+    """
+
+    def __init__(self, max_tokens=2500, max_overlap=None):
+        self.max_tokens = max_tokens
+        self.max_overlap = max_overlap
+        self.last_stats = {}
+
+    def _merge(self, spans):
+        # spans: [{"ids", "text", "score", "metadata"}] from one source, in retrieval order.
+        merged = True
+        while merged and len(spans) > 1:
+            merged = False
+            for i, left in enumerate(spans):
+                for j, right in enumerate(spans):
+                    if i == j:
+                        continue
+                    size = overlap_length(left["text"], right["text"], self.max_overlap)
+                    if size or right["text"] in left["text"]:
+                        left.update(
+                            ids=left["ids"] + right["ids"],
+                            text=left["text"] + right["text"][size:] if size else left["text"],
+                            score=max(left["score"], right["score"]),
+                        )
+                        spans.pop(j)
+                        merged = True
+                        break
+                if merged:
+                    break
+        return spans
+
+    def pack(self, docs, scores=None):
+        """Pack `docs` (best first, or ranked by `scores`) into merged Documents.
+
+        Each returned Document covers one or more adjacent chunks of a page;
+        its id joins the chunk ids and `metadata["chunk_ids"]` lists them.
+        """
+        # Imported here so that importing the packer stays cheap at startup.
+        from langchain_core.documents import Document
+
+        if scores is None:
+            scores = [1.0 / (rank + 1) for rank in range(len(docs))]
+
+        by_source, footers = {}, {}
+        for doc, score in zip(docs, scores):
+            source = doc.metadata.get("source", "")
+            text, footer = split_footer(doc.page_content)
+            if footer:
+                footers.setdefault(source, footer)
+            if not text:
+                continue
+            by_source.setdefault(source, []).append({
+                "ids": [doc.id or str(hash(doc.page_content))],
+                "text": text,
+                "score": score,
+                "metadata": doc.metadata,
+            })
+
+        spans = []
+        for source, source_spans in by_source.items():
+            spans.extend((source, span) for span in self._merge(source_spans))
+        spans.sort(key=lambda item: item[1]["score"], reverse=True)
+
+        firsts, rest, seen = [], [], set()
+        for order, (source, span) in enumerate(spans):
+            (rest if source in seen else firsts).append((order, source, span))
+            seen.add(source)
+
+        selected, used, covered = [], 0, set()
+        for order, source, span in firsts + rest:
+            text = span["text"]
+            if source not in covered and source in footers:
+                text = f"{text}\n\n{footers[source]}"
+            tokens = estimate_tokens(text)
+            if used + tokens > self.max_tokens and selected:
+                continue
+            used += tokens
+            covered.add(source)
+            selected.append((order, text, span))
+
+        packed = []
+        for _, text, span in sorted(selected, key=lambda item: item[0]):
+            metadata = dict(span["metadata"], chunk_ids=span["ids"])
+            packed.append(Document(id="+".join(span["ids"]), page_content=text, metadata=metadata))
+
+        self.last_stats = {
+            "chunks": len(docs),
+            "spans": len(spans),
+            "packed": len(packed),
+            "tokens_in": sum(estimate_tokens(doc.page_content) for doc in docs),
+            "tokens_out": used,
+            "sources_in": len({doc.metadata.get("source", "") for doc in docs}),
+            "sources_out": len(covered),
+        }
+        return packed
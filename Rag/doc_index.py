@@ -0,0 +1,99 @@
+import os
+import json
+import hashlib
+import xml.etree.ElementTree as ET
+
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+MANIFEST_VERSION = 1
+
+
+def parse_sitemap(path):
+    """Return {url: lastmod} for every <url> entry of a local sitemap file."""
+    root = ET.parse(path).getroot()
+    entries = {}
+    for url in root.iter(f"{SITEMAP_NS}url"):
+        loc = url.findtext(f"{SITEMAP_NS}loc", default="").strip()
+        if loc:
+            entries[loc] = url.findtext(f"{SITEMAP_NS}lastmod", default="").strip()
+    return entries
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_ids(source, texts):
+    """Stable ids derived from the chunk content, so unchanged chunks keep their id.
+
+    Identical chunks on the same page get a running suffix to stay unique.
+    """
+    ids = []
+    seen = {}
+    for text in texts:
+        digest = content_hash(f"{source}\n{text}")[:32]
+        count = seen.get(digest, 0)
+        seen[digest] = count + 1
+        ids.append(f"{digest}-{count}")
+    return ids
+
+
+class IndexManifest:
+    """Tracks what is already embedded in the vector store, per sitemap URL.
+
+    Layout of the JSON file:
+        {"version": 1, "pages": {url: {"lastmod": str, "hash": str, "chunks": [id, ...]}}}
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.pages = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Ignoring unreadable index manifest {self.path}: {e}")
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self.pages = data.get("pages", {})
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"version": MANIFEST_VERSION, "pages": self.pages}, file)
+        os.replace(tmp_path, self.path)
+
+    def diff(self, entries):
+        """Compare sitemap entries against the manifest.
+
+        Returns (stale, removed): URLs that are new or whose <lastmod> moved,
+        and URLs that are no longer in the sitemap.
+        """
+        stale = [
+            url for url, lastmod in entries.items()
+            if url not in self.pages or self.pages[url].get("lastmod") != lastmod
+        ]
+        removed = [url for url in self.pages if url not in entries]
+        return stale, removed
+
+    def page_changed(self, url, page_hash):
+        page = self.pages.get(url)
+        return page is None or page.get("hash") != page_hash
+
+    def chunks_for(self, url):
+        return list(self.pages.get(url, {}).get("chunks", []))
+
+    def update_page(self, url, lastmod, page_hash, ids=None):
+        page = self.pages.setdefault(url, {"chunks": []})
+        page["lastmod"] = lastmod
+        page["hash"] = page_hash
+        if ids is not None:
+            page["chunks"] = list(ids)
+
+    def remove_page(self, url):
+        return self.pages.pop(url, {}).get("chunks", [])
@@ -0,0 +1,128 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from array import array
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "embedding_cache.sqlite")
+
+
+def normalize_text(text):
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(model, text):
+    return hashlib.sha256(f"{model}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Disk-backed embedding cache keyed by (embedding model, normalized chunk hash).
+
+    Vectors are stored as float32 blobs in SQLite. Once the stored vectors
+    exceed `max_bytes`, the least recently used entries are evicted down to
+    90% of the limit.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=512 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+
+    def get_many(self, model, texts):
+        """Return a list with a vector per text, or None where the text is not cached."""
+        keys = [cache_key(model, text) for text in texts]
+        found = {}
+        with self._lock:
+            # SQLite caps the number of bound parameters, so look keys up in slices.
+            for i in range(0, len(keys), 500):
+                part = keys[i:i + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self.conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", part
+                ).fetchall()
+                found.update(rows)
+            if found:
+                now = time.time()
+                self.conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, key) for key in found]
+                )
+                self.conn.commit()
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+
+        vectors = []
+        for key in keys:
+            blob = found.get(key)
+            if blob is None:
+                vectors.append(None)
+            else:
+                vector = array("f")
+                vector.frombytes(blob)
+                vectors.append(vector.tolist())
+        return vectors
+
+    def put_many(self, model, texts, vectors):
+        now = time.time()
+        # One row per key: a text repeated in the batch is stored (and counted) once.
+        rows = {}
+        for text, vector in zip(texts, vectors):
+            blob = array("f", vector).tobytes()
+            key = cache_key(model, text)
+            rows[key] = (key, model, blob, len(blob), now)
+        rows = list(rows.values())
+        with self._lock:
+            for key, _, blob, size, _ in rows:
+                old = self.conn.execute("SELECT size FROM embeddings WHERE key = ?", (key,)).fetchone()
+                self.total_bytes += size - (old[0] if old else 0)
+            self.conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?)", rows)
+            self.conn.commit()
+            if self.total_bytes > self.max_bytes:
+                self._evict(int(self.max_bytes * 0.9))
+
+    def _evict(self, target_bytes):
+        evicted = 0
+        cursor = self.conn.execute("SELECT key, size FROM embeddings ORDER BY last_used")
+        doomed = []
+        for key, size in cursor:
+            if self.total_bytes <= target_bytes:
+                break
+            doomed.append((key,))
+            self.total_bytes -= size
+            evicted += 1
+        self.conn.executemany("DELETE FROM embeddings WHERE key = ?", doomed)
+        self.conn.commit()
+        print(f"🧹 Embedding cache evicted {evicted} entries ({self.total_bytes / 1e6:.1f} MB left)")
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "bytes": self.total_bytes,
+        }
+
+    def close(self):
+        self.conn.close()
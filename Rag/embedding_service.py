@@ -0,0 +1,184 @@
+import re
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from langchain_core.embeddings import Embeddings
+
+DEFAULT_MODEL = "models/embedding-001"
+# The OpenAI SDK's message prefix, e.g. "Error code: 429 - {...}".
+RATE_LIMIT_MESSAGE = re.compile(r"^Error code: 429\b")
+
+
+def is_rate_limit_error(error):
+    """True for 429s raised by httpx, the OpenAI SDK, the Google SDKs or FastAPI.
+
+    Only the status (status_code, code or response.status_code) or an
+    "Error code: 429" message prefix counts; a "429" elsewhere in a message
+    (an id, a token count, an echoed payload) does not.
+    """
+    return error_status(error) == 429 or bool(RATE_LIMIT_MESSAGE.match(str(error)))
+
+
+def error_status(error):
+    """HTTP status carried by an httpx / OpenAI SDK / Google SDK / FastAPI error, or None."""
+    response = getattr(error, "response", None)
+    for status in (getattr(error, "status_code", None), getattr(error, "code", None),
+                   getattr(response, "status_code", None)):
+        if isinstance(status, int):
+            return status
+    return None
+
+
+def retry_after_seconds(error):
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or getattr(error, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class OpenAICompatibleEmbedder:
+    """Minimal client for an OpenAI-style POST {base_url}/embeddings endpoint.
+
+    Gemini exposes one under /v1beta/openai/, and it is what the local fake
+    endpoint in bench_embedding_service.py implements.
+    """
+
+    def __init__(self, base_url, model, api_key=None, timeout=60.0):
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.model = model
+        self.client = httpx.Client(base_url=base_url.rstrip("/"), headers=headers, timeout=timeout)
+
+    def embed_documents(self, texts):
+        response = self.client.post("/embeddings", json={"model": self.model, "input": texts})
+        response.raise_for_status()
+        data = sorted(response.json()["data"], key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+class EmbeddingService(Embeddings):
+    """Embedding layer shared by ChaiBot and the RAG notebooks.
+
+    Splits the input into batches capped by chunk count and total characters,
+    embeds up to `max_concurrency` batches at a time, retries rate-limited
+    batches with exponential backoff and returns vectors in input order.
+    With an EmbeddingCache, only chunks missing from the cache are embedded.
+    """
+
+    def __init__(
+        self,
+        embedder=None,
+        model=DEFAULT_MODEL,
+        batch_size=100,
+        max_batch_chars=60000,
+        max_concurrency=4,
+        max_retries=6,
+        backoff=1.0,
+        max_backoff=60.0,
+        cache=None,
+        verbose=True,
+    ):
+        if embedder is None:
+            from langchain_google_genai import GoogleGenerativeAIEmbeddings
+            embedder = GoogleGenerativeAIEmbeddings(model=model)
+        self.embedder = embedder
+        self.model = getattr(embedder, "model", model)
+        self.cache = cache
+        self.batch_size = batch_size
+        self.max_batch_chars = max_batch_chars
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.verbose = verbose
+        self.stats = {"chunks": 0, "batches": 0, "retries": 0, "seconds": 0.0, "chunks_per_sec": 0.0}
+        self._lock = threading.Lock()
+
+    def make_batches(self, texts):
+        """Group texts into (start, texts) batches that respect both size caps."""
+        batches = []
+        start = 0
+        current = []
+        current_chars = 0
+        for i, text in enumerate(texts):
+            if current and (len(current) >= self.batch_size or current_chars + len(text) > self.max_batch_chars):
+                batches.append((start, current))
+                start, current, current_chars = i, [], 0
+            current.append(text)
+            current_chars += len(text)
+        if current:
+            batches.append((start, current))
+        return batches
+
+    def _with_retry(self, fn, *args):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return fn(*args)
+            except Exception as e:
+                if attempt == self.max_retries or not is_rate_limit_error(e):
+                    raise
+                delay = retry_after_seconds(e)
+                if delay is None:
+                    delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+                    delay *= random.uniform(0.5, 1.0)
+                with self._lock:
+                    self.stats["retries"] += 1
+                time.sleep(delay)
+
+    def embed_documents(self, texts):
+        texts = list(texts)
+        if not texts:
+            return []
+        started = time.perf_counter()
+
+        if self.cache is not None:
+            vectors = self.cache.get_many(self.model, texts)
+        else:
+            vectors = [None] * len(texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        missing_texts = [texts[i] for i in missing]
+
+        batches = self.make_batches(missing_texts)
+        fetched = [None] * len(missing_texts)
+
+        def run(batch):
+            start, batch_texts = batch
+            result = self._with_retry(self.embedder.embed_documents, batch_texts)
+            if len(result) != len(batch_texts):
+                raise ValueError(f"Embedder returned {len(result)} vectors for a batch of {len(batch_texts)} texts")
+            fetched[start:start + len(batch_texts)] = result
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            # list() re-raises the first batch error, if any.
+            list(pool.map(run, batches))
+
+        for i, vector in zip(missing, fetched):
+            vectors[i] = vector
+        if self.cache is not None and missing_texts:
+            self.cache.put_many(self.model, missing_texts, fetched)
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.stats["chunks"] += len(texts)
+            self.stats["batches"] += len(batches)
+            self.stats["seconds"] += elapsed
+            self.stats["chunks_per_sec"] = self.stats["chunks"] / self.stats["seconds"] if self.stats["seconds"] else 0.0
+        if self.verbose:
+            cached = ""
+            if self.cache is not None:
+                cached = f", {len(texts) - len(missing_texts)} from cache (hit rate {self.cache.hit_rate:.0%})"
+            print(
+                f"Embedded {len(texts)} chunks in {len(batches)} batches, {elapsed:.2f}s "
+                f"({len(texts) / elapsed if elapsed else 0:.1f} chunks/sec, {self.stats['retries']} retries so far{cached})"
+            )
+        return vectors
+
+    def embed_query(self, text):
+        return self._with_retry(self.embedder.embed_query, text)
@@ -0,0 +1,130 @@
+from tokens import estimate_message_tokens
+
+CONTEXT_HEADER = "Relevant ChaiCode documentation context:"
+
+
+class ConversationHistory:
+    """Chat history for ChaiBot that stays within a token budget.
+
+    Each turn keeps the user query, the retrieved chunks sent with it and the
+    assistant steps. A chunk is sent in full only the first time it is
+    retrieved in a session; later turns refer to it by id. When the
+    conversation exceeds `max_tokens`, older turns are compacted to the
+    query plus the final answer (keeping only chunks later turns still refer
+    to), and if that is not enough the oldest turns are dropped.
+    """
+
+    def __init__(self, system_prompt, max_tokens=12000):
+        self.system_message = {"role": "system", "content": system_prompt}
+        self.max_tokens = max_tokens
+        self.turns = []
+        self.turn_count = 0
+        self.requests = []
+
+    def sent_chunk_ids(self):
+        return set(self._sent_owners())
+
+    def _sent_owners(self):
+        """Every chunk id sent so far, including ids inside merged blocks, -> id of the block that carried it."""
+        return {member: chunk_id for turn in self.turns for chunk_id, _ in turn["chunks"]
+                for member in turn["members"].get(chunk_id, [chunk_id])}
+
+    def start_turn(self, query, docs=None):
+        """Open a new turn; `docs` are the retrieved chunks (Documents with ids).
+
+        A packed block (metadata["chunk_ids"]) counts as sent when every chunk
+        in it was sent before, possibly inside differently merged blocks.
+        """
+        owners = self._sent_owners()
+        chunks, refs, members = [], [], {}
+        for doc in docs or []:
+            chunk_id = doc.id or str(hash(doc.page_content))
+            chunk_ids = doc.metadata.get("chunk_ids") or [chunk_id]
+            if all(member in owners for member in chunk_ids):
+                for member in chunk_ids:
+                    if owners[member] not in refs:
+                        refs.append(owners[member])
+            else:
+                chunks.append((chunk_id, doc.page_content))
+                members[chunk_id] = list(chunk_ids)
+                owners.update({member: chunk_id for member in chunk_ids})
+        self.turns.append({"query": query, "chunks": chunks, "refs": refs, "members": members, "steps": [],
+                           "compacted": False})
+        self.turn_count += 1
+
+    def append(self, message):
+        self.turns[-1]["steps"].append(message)
+
+    def _context_message(self, chunks, refs):
+        parts = [f"[chunk {chunk_id}]\n{text}" for chunk_id, text in chunks]
+        if refs:
+            parts.append("Also relevant, already provided earlier in this conversation: " + ", ".join(
+                f"[chunk {chunk_id}]" for chunk_id in refs
+            ))
+        return {"role": "assistant", "content": f"{CONTEXT_HEADER}\n\n" + "\n\n".join(parts)}
+
+    def _render(self, turn):
+        messages = [{"role": "user", "content": turn["query"]}]
+        if turn["chunks"] or turn["refs"]:
+            messages.append(self._context_message(turn["chunks"], turn["refs"]))
+        messages.extend(turn["steps"][-1:] if turn["compacted"] else turn["steps"])
+        return messages
+
+    def _referenced_after(self, index):
+        return {chunk_id for turn in self.turns[index + 1:] for chunk_id in turn["refs"]}
+
+    def _compact(self, index):
+        turn = self.turns[index]
+        keep = self._referenced_after(index)
+        turn["chunks"] = [(chunk_id, text) for chunk_id, text in turn["chunks"] if chunk_id in keep]
+        turn["refs"] = [chunk_id for chunk_id in turn["refs"] if chunk_id in keep]
+        turn["compacted"] = True
+
+    def _drop_oldest(self):
+        oldest = self.turns.pop(0)
+        # Chunks later turns only refer to by id move to the first turn that refers to them.
+        for chunk_id, text in oldest["chunks"]:
+            for turn in self.turns:
+                if chunk_id in turn["refs"]:
+                    turn["refs"].remove(chunk_id)
+                    turn["chunks"].append((chunk_id, text))
+                    turn["members"][chunk_id] = oldest["members"].get(chunk_id, [chunk_id])
+                    break
+
+    def _size(self):
+        return estimate_message_tokens(self.flatten())
+
+    def flatten(self):
+        messages = [self.system_message]
+        for turn in self.turns:
+            messages.extend(self._render(turn))
+        return messages
+
+    def messages(self):
+        """Messages for the next request, trimmed to the token budget."""
+        index = 0
+        while self._size() > self.max_tokens and index < len(self.turns) - 1:
+            if not self.turns[index]["compacted"]:
+                self._compact(index)
+            index += 1
+        while self._size() > self.max_tokens and len(self.turns) > 1:
+            self._drop_oldest()
+        return self.flatten()
+
+    def log_request(self, messages):
+        chars = sum(len(message["content"]) for message in messages)
+        tokens = estimate_message_tokens(messages)
+        self.requests.append({"turn": self.turn_count, "messages": len(messages), "chars": chars, "tokens": tokens})
+        print(f"📦 Request size: {len(messages)} messages, {chars} chars, ~{tokens} tokens")
+        return tokens
+
+    def turn_summary(self):
+        """Total estimated request tokens spent on the current turn."""
+        turn = self.turn_count
+        requests = [request for request in self.requests if request["turn"] == turn]
+        return {
+            "turn": turn,
+            "requests": len(requests),
+            "tokens": sum(request["tokens"] for request in requests),
+        }
+
@@ -0,0 +1,359 @@
+"""Portable, versioned snapshots of a built RAG index.
+
+    python Rag/index_snapshot.py export doc_store chaidocs.snap
+    python Rag/index_snapshot.py export doc_store_numpy chaidocs.snap --backend numpy
+    python Rag/index_snapshot.py import chaidocs.snap qdrant_store --backend chroma --collection langchain
+    python Rag/index_snapshot.py info chaidocs.snap
+
+A snapshot is a single file: an 8-byte magic, the length of a JSON header,
+the header, then 64-byte aligned columns. The header records the format
+version, embedding model, dimension, chunk count and where each column
+lives. The columns are:
+
+    embeddings          float32 (count, dim), L2-normalized
+    ids / texts / metadatas
+                        UTF-8 (JSON for metadata) blobs with int64 offsets
+    files/<name>        small sidecar files of the store directory
+                        (doc_index manifest.json, bm25_index.npz)
+
+IndexSnapshot maps the file with mmap and only reads the header up front,
+so opening one costs the same for 1k chunks as for 1M. SnapshotVectorIndex
+serves queries straight from the mapping. restore_snapshot writes a
+Chroma or numpy store directory from it without calling the embedding API,
+and can seed an EmbeddingCache so pipelines that re-split the same
+documents get cache hits instead of re-embedding.
+"""
+import os
+import json
+import time
+import argparse
+
+import numpy as np
+
+from vector_index import NumpyVectorIndex
+
+MAGIC = b"RAGSNAP\0"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+SIDECAR_FILES = ("manifest.json", "bm25_index.npz")
+
+
+class StringColumn:
+    """Read-only sequence of strings decoded on access from a mapped blob."""
+
+    def __init__(self, data, offsets, decode=None):
+        self.data = data
+        self.offsets = offsets
+        self.decode = decode
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = int(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        value = bytes(self.data[self.offsets[index]:self.offsets[index + 1]]).decode("utf-8")
+        return self.decode(value) if self.decode else value
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+def _encode_strings(values):
+    blobs = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(blobs) + 1, dtype=np.int64)
+    np.cumsum([len(blob) for blob in blobs], out=offsets[1:])
+    return np.frombuffer(b"".join(blobs), dtype=np.uint8), offsets
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def write_snapshot(path, ids, texts, metadatas, embeddings, model=None, files=None, info=None):
+    """Write one snapshot file; `files` maps sidecar names to their bytes."""
+    ids, texts = list(ids), list(texts)
+    metadatas = [metadata or {} for metadata in metadatas]
+    embeddings = _normalize(embeddings) if len(ids) else np.zeros((0, 0), dtype=np.float32)
+    if not (len(ids) == len(texts) == len(metadatas) == len(embeddings)):
+        raise ValueError("ids, texts, metadatas and embeddings must have the same length")
+
+    columns = {"embeddings": embeddings}
+    for name, values in (("ids", ids), ("texts", texts),
+                         ("metadatas", [json.dumps(metadata, ensure_ascii=False) for metadata in metadatas])):
+        columns[f"{name}.data"], columns[f"{name}.offsets"] = _encode_strings(values)
+    for name, content in (files or {}).items():
+        columns[f"files/{name}"] = np.frombuffer(content, dtype=np.uint8)
+
+    header = {
+        "format": "rag-index-snapshot",
+        "version": FORMAT_VERSION,
+        "created": time.time(),
+        "model": model,
+        "count": len(ids),
+        "dim": int(embeddings.shape[1]) if embeddings.ndim == 2 else 0,
+        "info": info or {},
+        "columns": {},
+    }
+    # Offsets depend on the header length, which depends on the offsets; the
+    # header is padded to a fixed size so one layout pass is enough.
+    header_size = len(json.dumps(header)) + 200 * len(columns) + 256
+    header_size += -(len(MAGIC) + 8 + header_size) % ALIGNMENT
+    offset = len(MAGIC) + 8 + header_size
+    for name, array in columns.items():
+        header["columns"][name] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+        offset += array.nbytes + (-array.nbytes % ALIGNMENT)
+    encoded = json.dumps(header).encode("utf-8")
+    encoded += b" " * (header_size - len(encoded))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + len(encoded).to_bytes(8, "little") + encoded)
+        for array in columns.values():
+            f.write(np.ascontiguousarray(array).tobytes())
+            f.write(b"\0" * (-array.nbytes % ALIGNMENT))
+    os.replace(tmp_path, path)
+    return header
+
+
+class IndexSnapshot:
+    """Memory-mapped view of a snapshot file; columns are decoded lazily."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not an index snapshot")
+            header_size = int.from_bytes(f.read(8), "little")
+            self.header = json.loads(f.read(header_size))
+        if self.header["version"] > FORMAT_VERSION:
+            raise ValueError(
+                f"{path} uses snapshot format v{self.header['version']}, this code reads up to v{FORMAT_VERSION}"
+            )
+        self._map = np.memmap(path, dtype=np.uint8, mode="r")
+        self.embeddings = self._column("embeddings")
+        self.ids = self._strings("ids")
+        self.texts = self._strings("texts")
+        self.metadatas = self._strings("metadatas", decode=json.loads)
+
+    def __len__(self):
+        return self.header["count"]
+
+    @property
+    def model(self):
+        return self.header["model"]
+
+    @property
+    def dim(self):
+        return self.header["dim"]
+
+    @property
+    def files(self):
+        return [name[len("files/"):] for name in self.header["columns"] if name.startswith("files/")]
+
+    def read_file(self, name):
+        return self._column(f"files/{name}").tobytes()
+
+    def _column(self, name):
+        column = self.header["columns"][name]
+        dtype = np.dtype(column["dtype"])
+        size = int(np.prod(column["shape"])) * dtype.itemsize
+        start = column["offset"]
+        return self._map[start:start + size].view(dtype).reshape(column["shape"])
+
+    def _strings(self, name, decode=None):
+        return StringColumn(self._column(f"{name}.data"), self._column(f"{name}.offsets"), decode)
+
+    def check_model(self, model):
+        """Raise if the snapshot was embedded with a different model than `model`."""
+        if self.model and model and self.model != model:
+            raise ValueError(f"Snapshot {self.path} was embedded with {self.model}, the index uses {model}")
+
+    def write_files(self, directory, overwrite=False):
+        """Copy the sidecar files into `directory`; existing ones are kept unless `overwrite`."""
+        os.makedirs(directory, exist_ok=True)
+        written = []
+        for name in self.files:
+            target = os.path.join(directory, name)
+            if overwrite or not os.path.exists(target):
+                with open(target, "wb") as f:
+                    f.write(self.read_file(name))
+                written.append(name)
+        return written
+
+
+class SnapshotVectorIndex(NumpyVectorIndex):
+    """NumpyVectorIndex served from a memory-mapped snapshot.
+
+    Nothing is read from the snapshot until a query touches it, and the id
+    lookup table is only built when an id is looked up. The first write
+    (add or delete) copies the rows into memory and from then on the index
+    persists to `persist_directory` in the regular numpy store format; if
+    that directory already holds a numpy store, it is used instead of the
+    snapshot.
+    """
+
+    def __init__(self, snapshot, embedding_function, persist_directory):
+        self.snapshot = snapshot if isinstance(snapshot, IndexSnapshot) else IndexSnapshot(snapshot)
+        self.snapshot.check_model(getattr(embedding_function, "model", None))
+        self._rows = None
+        super().__init__(embedding_function=embedding_function, persist_directory=persist_directory)
+
+    @property
+    def _row(self):
+        if self._rows is None:
+            self._rows = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        return self._rows
+
+    @_row.setter
+    def _row(self, value):
+        self._rows = value
+
+    @property
+    def from_snapshot(self):
+        return isinstance(self.ids, StringColumn)
+
+    def load(self):
+        if os.path.exists(self.matrix_path) and os.path.exists(self.docs_path):
+            super().load()
+            return
+        self.ids = self.snapshot.ids
+        self.texts = self.snapshot.texts
+        self.metadatas = self.snapshot.metadatas
+        self.matrix = self.snapshot.embeddings if len(self.snapshot) else None
+        self._rows = None
+
+    def _materialize(self):
+        if self.from_snapshot:
+            self.ids, self.texts, self.metadatas = list(self.ids), list(self.texts), list(self.metadatas)
+            self._rows = None
+
+    def add_embeddings(self, texts, embeddings, metadatas=None, ids=None):
+        self._materialize()
+        return super().add_embeddings(texts, embeddings, metadatas=metadatas, ids=ids)
+
+    def delete(self, ids=None, **kwargs):
+        self._materialize()
+        return super().delete(ids=ids, **kwargs)
+
+    def reset_collection(self):
+        super().reset_collection()
+        self._rows = {}
+
+
+def read_store(directory, backend="chroma", collection_name="docs"):
+    """(ids, texts, metadatas, embeddings) of a persisted Chroma or numpy store."""
+    if backend == "numpy":
+        store = NumpyVectorIndex(embedding_function=None, persist_directory=directory)
+        if store.matrix is None:
+            return [], [], [], np.zeros((0, 0), dtype=np.float32)
+        return store.ids, store.texts, store.metadatas, store.matrix
+    import chromadb
+
+    collection = chromadb.PersistentClient(path=directory).get_collection(collection_name)
+    data = collection.get(include=["documents", "metadatas", "embeddings"])
+    return data["ids"], data["documents"], data["metadatas"], np.asarray(data["embeddings"], dtype=np.float32)
+
+
+def export_store(directory, path, backend="chroma", collection_name="docs", model=None):
+    """Snapshot a persisted store together with its manifest.json / bm25_index.npz."""
+    ids, texts, metadatas, embeddings = read_store(directory, backend, collection_name)
+    files = {}
+    for name in SIDECAR_FILES:
+        sidecar = os.path.join(directory, name)
+        if os.path.exists(sidecar):
+            with open(sidecar, "rb") as f:
+                files[name] = f.read()
+    info = {"source": os.path.basename(os.path.abspath(directory)), "backend": backend,
+            "collection": collection_name}
+    return write_snapshot(path, ids, texts, metadatas, embeddings, model=model, files=files, info=info)
+
+
+def restore_snapshot(snapshot, directory, backend="chroma", collection_name="docs", cache=None,
+                     batch_size=1000):
+    """Write a ready-to-use store directory from a snapshot, without embedding anything.
+
+    With an EmbeddingCache, every chunk's vector is also put into the cache
+    under the snapshot's model.
+    """
+    if not isinstance(snapshot, IndexSnapshot):
+        snapshot = IndexSnapshot(snapshot)
+    count = len(snapshot)
+    if backend == "numpy":
+        store = NumpyVectorIndex(embedding_function=None, persist_directory=directory)
+        store.reset_collection()
+        store.add_embeddings(list(snapshot.texts), snapshot.embeddings, list(snapshot.metadatas), list(snapshot.ids))
+    else:
+        import chromadb
+
+        collection = chromadb.PersistentClient(path=directory).get_or_create_collection(collection_name)
+        for start in range(0, count, batch_size):
+            end = min(start + batch_size, count)
+            collection.upsert(
+                ids=snapshot.ids[start:end],
+                documents=snapshot.texts[start:end],
+                # Chroma rejects empty metadata dicts.
+                metadatas=[metadata or None for metadata in snapshot.metadatas[start:end]],
+                embeddings=np.asarray(snapshot.embeddings[start:end]),
+            )
+    snapshot.write_files(directory, overwrite=True)
+    if cache is not None and snapshot.model:
+        for start in range(0, count, batch_size):
+            end = min(start + batch_size, count)
+            cache.put_many(snapshot.model, snapshot.texts[start:end], np.asarray(snapshot.embeddings[start:end]))
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="write a snapshot of a store directory")
+    export.add_argument("directory")
+    export.add_argument("snapshot")
+    export.add_argument("--backend", choices=["chroma", "numpy"], default="chroma")
+    export.add_argument("--collection", default="docs")
+    export.add_argument("--model", default="models/embedding-001", help="embedding model the store was built with")
+
+    restore = commands.add_parser("import", help="build a store directory from a snapshot")
+    restore.add_argument("snapshot")
+    restore.add_argument("directory")
+    restore.add_argument("--backend", choices=["chroma", "numpy"], default="chroma")
+    restore.add_argument("--collection", default="docs")
+    restore.add_argument("--warm-cache", action="store_true", help="also seed the embedding cache")
+
+    info = commands.add_parser("info", help="print a snapshot's header")
+    info.add_argument("snapshot")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.command == "export":
+        header = export_store(args.directory, args.snapshot, args.backend, args.collection, args.model)
+        size = os.path.getsize(args.snapshot)
+        print(f"📦 Exported {header['count']} chunks ({header['dim']}-d) to {args.snapshot} "
+              f"({size / 1e6:.1f} MB) in {time.perf_counter() - started:.2f}s")
+    elif args.command == "import":
+        cache = None
+        if args.warm_cache:
+            from embedding_cache import EmbeddingCache
+            cache = EmbeddingCache()
+        count = restore_snapshot(args.snapshot, args.directory, args.backend, args.collection, cache=cache)
+        print(f"📥 Imported {count} chunks into {args.directory} ({args.backend}) "
+              f"in {time.perf_counter() - started:.2f}s")
+    else:
+        snapshot = IndexSnapshot(args.snapshot)
+        header = {key: value for key, value in snapshot.header.items() if key != "columns"}
+        header["files"] = snapshot.files
+        print(json.dumps(header, indent=2))
+
+
+if __name__ == "__main__":
+    main()
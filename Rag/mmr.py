@@ -0,0 +1,162 @@
+import numpy as np
+from langchain_core.documents import Document
+
+# maximal_marginal_relevance refreshes stale similarities lazily, REFRESH_BLOCK
+# candidates at a time, once there are at least LAZY_MIN_CANDIDATES of them.
+REFRESH_BLOCK = 32
+LAZY_MIN_CANDIDATES = 512
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        normalized = vectors / norms
+    normalized[~np.isfinite(normalized)] = 0.0
+    return normalized
+
+
+def _inverse_norms(vectors):
+    norms = np.sqrt(np.einsum("ij,ij->i", vectors, vectors))
+    with np.errstate(divide="ignore"):
+        inverse = 1.0 / norms
+    inverse[~np.isfinite(inverse)] = 0.0
+    return inverse
+
+
+def maximal_marginal_relevance(query_embedding, embedding_list, lambda_mult=0.5, k=4):
+    """Vectorized drop-in for LangChain's maximal_marginal_relevance.
+
+    Picks the same indices in the same order. Cosines come from dot products
+    scaled by precomputed inverse norms, so the candidates are never copied
+    into a normalized matrix. After the first pick, each candidate's
+    max-similarity to the selection is refreshed lazily: a stale value only
+    overstates its score, so only the REFRESH_BLOCK best-looking stale
+    candidates are brought up to date until the best one is current. Below
+    LAZY_MIN_CANDIDATES all of them are updated after every pick instead.
+
+    Measured at dim 768, k=10 on one CPU: 0.12 ms for fetch_k=20, 0.26 ms
+    for 200, 1.4 ms for 2000 and 3.3 ms for 5000 (the per-pick update was
+    0.12 / 0.39 / 6.3 / 16 ms). So it is sub-millisecond only up to fetch_k
+    of several hundred; beyond that the norm and query-similarity passes
+    over the candidates set the floor.
+    """
+    candidates = np.asarray(embedding_list, dtype=np.float32)
+    limit = min(k, len(candidates))
+    if limit <= 0:
+        return []
+    query = np.asarray(query_embedding, dtype=np.float32).reshape(1, -1)
+    inverse_norms = _inverse_norms(candidates)
+    similarity_to_query = (candidates @ query[0]) * inverse_norms * _inverse_norms(query)[0]
+
+    first = int(np.argmax(similarity_to_query))
+    idxs = [first]
+    max_similarity = (candidates @ candidates[first]) * inverse_norms * inverse_norms[first]
+    # How many picks each max_similarity entry accounts for.
+    fresh = np.ones(len(candidates), dtype=np.intp)
+    taken = np.zeros(len(candidates), dtype=bool)
+    taken[first] = True
+
+    while len(idxs) < limit:
+        scores = lambda_mult * similarity_to_query - (1 - lambda_mult) * max_similarity
+        scores[taken] = -np.inf
+        best = int(np.argmax(scores))
+        while fresh[best] < len(idxs):
+            picked = np.array(idxs[1:])
+            rows = np.append(np.argpartition(scores, -REFRESH_BLOCK)[-REFRESH_BLOCK:], best)
+            rows = rows[(fresh[rows] < len(idxs)) & ~taken[rows]]
+            similarity = (candidates[rows] @ candidates[picked].T) * inverse_norms[rows, None] * inverse_norms[picked]
+            max_similarity[rows] = np.maximum(max_similarity[rows], similarity.max(axis=1))
+            fresh[rows] = len(idxs)
+            scores[rows] = lambda_mult * similarity_to_query[rows] - (1 - lambda_mult) * max_similarity[rows]
+            best = int(np.argmax(scores))
+        idxs.append(best)
+        taken[best] = True
+        if len(candidates) < LAZY_MIN_CANDIDATES:
+            update = (candidates @ candidates[best]) * inverse_norms * inverse_norms[best]
+            np.maximum(max_similarity, update, out=max_similarity)
+            fresh[:] = len(idxs)
+    return idxs
+
+
+def maximal_marginal_relevance_batch(query_embeddings, candidate_embeddings, lambda_mult=0.5, k=4):
+    """MMR for many queries at once.
+
+    `candidate_embeddings` is either a (queries, fetch_k, dim) array or a list
+    with one (n_i, dim) candidate matrix per query. Returns one index list per
+    query, identical to calling maximal_marginal_relevance on each.
+    """
+    queries = _normalize(query_embeddings)
+    if isinstance(candidate_embeddings, np.ndarray) and candidate_embeddings.ndim == 3:
+        candidates = _normalize(candidate_embeddings)
+        sizes = [candidates.shape[1]] * len(candidates)
+        valid = np.ones(candidates.shape[:2], dtype=bool)
+    else:
+        sizes = [len(block) for block in candidate_embeddings]
+        if not sizes:
+            return []
+        candidates = np.zeros((len(sizes), max(sizes), queries.shape[1]), dtype=np.float32)
+        valid = np.zeros((len(sizes), max(sizes)), dtype=bool)
+        for i, block in enumerate(candidate_embeddings):
+            if sizes[i]:
+                candidates[i, :sizes[i]] = _normalize(block)
+                valid[i, :sizes[i]] = True
+    if not sizes:
+        return []
+
+    limits = np.minimum(k, np.array(sizes))
+    rows = np.arange(len(sizes))
+    similarity_to_query = np.matmul(candidates, queries[:, :, None])[:, :, 0]
+    similarity_to_query[~valid] = -np.inf
+
+    best = np.argmax(similarity_to_query, axis=1)
+    results = [[int(best[i])] if limits[i] > 0 else [] for i in rows]
+    taken = ~valid
+    taken[rows, best] = True
+    max_similarity = np.matmul(candidates, candidates[rows, best][:, :, None])[:, :, 0]
+
+    for step in range(1, int(limits.max(initial=0))):
+        scores = lambda_mult * similarity_to_query - (1 - lambda_mult) * max_similarity
+        scores[taken] = -np.inf
+        best = np.argmax(scores, axis=1)
+        active = rows[limits > step]
+        for i in active:
+            results[i].append(int(best[i]))
+        taken[active, best[active]] = True
+        picked = np.matmul(candidates, candidates[rows, best][:, :, None])[:, :, 0]
+        np.maximum(max_similarity, picked, out=max_similarity)
+    return results
+
+
+def chroma_candidates(store, embedding, fetch_k):
+    """Top fetch_k documents from a Chroma store, with their embeddings."""
+    results = store._collection.query(
+        query_embeddings=[embedding],
+        n_results=fetch_k,
+        include=["metadatas", "documents", "embeddings"],
+    )
+    docs = [
+        Document(id=doc_id, page_content=text, metadata=metadata or {})
+        for doc_id, text, metadata in zip(results["ids"][0], results["documents"][0], results["metadatas"][0])
+    ]
+    return docs, np.asarray(results["embeddings"][0], dtype=np.float32)
+
+
+def vector_candidates(store, embedding, fetch_k):
+    """Top fetch_k (documents, embeddings) from Chroma or NumpyVectorIndex."""
+    if hasattr(store, "candidates_by_vector"):
+        return store.candidates_by_vector(embedding, fetch_k)
+    return chroma_candidates(store, embedding, fetch_k)
+
+
+def mmr_search_by_vector(store, embedding, k=4, fetch_k=20, lambda_mult=0.5):
+    """max_marginal_relevance_search_by_vector for Chroma or NumpyVectorIndex.
+
+    Results come back in candidate (similarity) order filtered to the MMR
+    picks, which is what Chroma's own implementation returns.
+    """
+    docs, vectors = vector_candidates(store, embedding, fetch_k)
+    if not docs:
+        return []
+    selected = set(maximal_marginal_relevance(embedding, vectors, lambda_mult=lambda_mult, k=k))
+    return [doc for i, doc in enumerate(docs) if i in selected]
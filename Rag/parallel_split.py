@@ -0,0 +1,137 @@
+"""Split documents on a process pool with exactly the serial splitter's output.
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+    chunks = split_documents(splitter, docs)               # same as splitter.split_documents(docs)
+
+    with ParallelSplitter(splitter, workers=4) as parallel:  # keep the pool for several calls
+        chunks = parallel.split_documents(docs)
+
+Documents are cut into contiguous shards of about `shard_chars` characters
+and only their texts go to the workers, which receive the splitter once
+when they start. Workers send back each text's chunk strings (and start
+offsets with add_start_index); the parent rebuilds the Documents with a
+deep copy of each source's metadata, in input order, the same way
+TextSplitter.create_documents does. One document is always split by a
+single worker, so the speedup comes from having many documents.
+
+Inputs below `min_chars` characters are split in-process. The serial
+splitter handles roughly 20M characters a second, about as long as it takes
+to start the workers and import the splitter in them.
+"""
+import os
+import copy
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+SHARD_CHARS = 500_000
+MIN_PARALLEL_CHARS = 20_000_000
+
+# The worker process's splitter, set once by the pool initializer.
+_splitter = None
+
+
+def _init_worker(splitter):
+    global _splitter
+    _splitter = splitter
+
+
+def split_with_offsets(splitter, text):
+    """(chunks, start offsets or None) for one text, as create_documents computes them."""
+    chunks = splitter.split_text(text)
+    if not splitter._add_start_index:
+        return chunks, None
+    starts = []
+    index = 0
+    previous_chunk_len = 0
+    for chunk in chunks:
+        offset = index + previous_chunk_len - splitter._chunk_overlap
+        index = text.find(chunk, max(0, offset))
+        starts.append(index)
+        previous_chunk_len = len(chunk)
+    return chunks, starts
+
+
+def _split_shard(texts):
+    return [split_with_offsets(_splitter, text) for text in texts]
+
+
+def _shards(texts, shard_chars):
+    shard, size = [], 0
+    for text in texts:
+        shard.append(text)
+        size += len(text)
+        if size >= shard_chars:
+            yield shard
+            shard, size = [], 0
+    if shard:
+        yield shard
+
+
+def pool_context():
+    # Forking a process that already runs threads (Chroma, the background
+    # index loader) can deadlock the child; start workers from a clean process.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class ParallelSplitter:
+    """Process pool that splits documents with a fixed TextSplitter.
+
+    The splitter must be picklable (a lambda as length_function is not).
+    """
+
+    def __init__(self, splitter, workers=None, shard_chars=SHARD_CHARS, min_chars=MIN_PARALLEL_CHARS):
+        self.splitter = splitter
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_chars = shard_chars
+        self.min_chars = min_chars
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=pool_context(),
+                initializer=_init_worker, initargs=(self.splitter,),
+            )
+        return self._pool
+
+    def split_texts(self, texts):
+        """[(chunks, starts)] per text, in input order."""
+        texts = list(texts)
+        if self.workers <= 1 or sum(len(text) for text in texts) < self.min_chars:
+            return [split_with_offsets(self.splitter, text) for text in texts]
+        results = []
+        for shard in self.pool.map(_split_shard, _shards(texts, self.shard_chars)):
+            results.extend(shard)
+        return results
+
+    def split_documents(self, documents):
+        from langchain_core.documents import Document
+
+        documents = list(documents)
+        chunks = []
+        for doc, (texts, starts) in zip(documents, self.split_texts(doc.page_content for doc in documents)):
+            for i, text in enumerate(texts):
+                metadata = copy.deepcopy(doc.metadata)
+                if starts is not None:
+                    metadata["start_index"] = starts[i]
+                chunks.append(Document(page_content=text, metadata=metadata))
+        return chunks
+
+
+def split_documents(splitter, documents, workers=None, **kwargs):
+    """splitter.split_documents(documents), sharded over `workers` processes."""
+    with ParallelSplitter(splitter, workers=workers, **kwargs) as parallel:
+        return parallel.split_documents(documents)
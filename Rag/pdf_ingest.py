@@ -0,0 +1,194 @@
+"""Stream a PDF into a vector store page by page.
+
+    python Rag/pdf_ingest.py Rag/nodejs.pdf --store qdrant_store --workers 4
+    python Rag/pdf_ingest.py Rag/nodejs.pdf --workers 4          # extract + split only
+
+PyPDFLoader(...).load() extracts every page before anything is split or
+embedded, so memory grows with the page count. Here a pool of worker
+processes (each opening the PDF once) extracts pages in small tasks. The
+pages come back in page order through a bounded window of in-flight tasks.
+They are split and upserted in batches of `batch_chunks` chunks while the
+workers keep extracting. Only the pages in flight and one chunk batch are
+ever held in memory.
+
+Pages carry PyPDFLoader's metadata ({"source": path, "page": n}). Chunk ids
+are derived from the source, page and chunk text, so re-running the
+ingestion upserts the same ids instead of adding duplicates.
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from doc_index import chunk_ids
+from parallel_split import pool_context
+
+# The worker process's PdfReader, opened once by the pool initializer.
+_reader = None
+
+
+def _open_reader(path):
+    from pypdf import PdfReader
+
+    global _reader
+    # pypdf logs every recoverable xref problem, once per page for some files.
+    logging.getLogger("pypdf").setLevel(logging.ERROR)
+    _reader = PdfReader(path)
+
+
+def _extract_pages(page_numbers):
+    return [(number, _reader.pages[number].extract_text()) for number in page_numbers]
+
+
+def _extract_task(page_numbers):
+    # Workers are children of the forkserver, not of us, so each reports its own peak.
+    return _extract_pages(page_numbers), peak_rss_mb()[0]
+
+
+def page_count(path):
+    from pypdf import PdfReader
+
+    logging.getLogger("pypdf").setLevel(logging.ERROR)
+    return len(PdfReader(path).pages)
+
+
+def iter_pdf_pages(path, workers=None, pages_per_task=4, max_pending=None, stats=None):
+    """Yield one Document per page, in page order.
+
+    With more than one worker, at most `max_pending` tasks of
+    `pages_per_task` pages are in flight (default: two per worker), and the
+    largest worker peak RSS seen is kept in stats["worker_peak_rss_mb"].
+    """
+    from langchain_core.documents import Document
+
+    path = str(path)
+    workers = workers or os.cpu_count() or 1
+    count = page_count(path)
+    tasks = iter([range(start, min(start + pages_per_task, count)) for start in range(0, count, pages_per_task)])
+
+    if workers == 1:
+        _open_reader(path)
+        for task in tasks:
+            for number, text in _extract_pages(task):
+                yield Document(page_content=text, metadata={"source": path, "page": number})
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context(),
+                             initializer=_open_reader, initargs=(path,)) as pool:
+        pending = deque()
+        try:
+            for task in tasks:
+                pending.append(pool.submit(_extract_task, task))
+                if len(pending) >= (max_pending or workers * 2):
+                    break
+            while pending:
+                pages, worker_rss = pending.popleft().result()
+                if stats is not None and worker_rss is not None:
+                    stats["worker_peak_rss_mb"] = max(stats.get("worker_peak_rss_mb") or 0.0, worker_rss)
+                task = next(tasks, None)
+                if task is not None:
+                    pending.append(pool.submit(_extract_task, task))
+                for number, text in pages:
+                    yield Document(page_content=text, metadata={"source": path, "page": number})
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def peak_rss_mb():
+    """(this process, largest finished child) peak resident set size in MB; None where unknown.
+
+    `resource` is Unix-only. On Windows the process peak comes from psutil
+    when it is installed, and the children's peak is not available.
+    """
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None, None
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / 1024 ** 2, None
+    scale = 1 / 1024 ** 2 if sys.platform == "darwin" else 1 / 1024
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale)
+
+
+def ingest_pdf(path, store=None, splitter=None, workers=None, batch_chunks=256, verbose=True):
+    """Extract, split and upsert `path` into `store` as pages arrive; returns stats.
+
+    Without a store the chunks are only produced and counted.
+    """
+    if splitter is None:
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+        splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+
+    stats = {"pages": 0, "chunks": 0, "batches": 0}
+    started = time.perf_counter()
+    batch = []
+
+    def flush():
+        if store is not None:
+            store.add_documents(documents=batch, ids=[chunk.id for chunk in batch])
+        stats["chunks"] += len(batch)
+        stats["batches"] += 1
+        batch.clear()
+        if verbose:
+            rate = stats["pages"] / (time.perf_counter() - started)
+            print(f"📄 {stats['pages']} pages, {stats['chunks']} chunks upserted ({rate:.1f} pages/s)")
+
+    for page in iter_pdf_pages(path, workers=workers, stats=stats):
+        chunks = splitter.split_documents([page])
+        source = f"{page.metadata['source']}#page={page.metadata['page']}"
+        for chunk, chunk_id in zip(chunks, chunk_ids(source, [chunk.page_content for chunk in chunks])):
+            chunk.id = chunk_id
+        batch.extend(chunks)
+        stats["pages"] += 1
+        if len(batch) >= batch_chunks:
+            flush()
+    if batch:
+        flush()
+
+    stats["seconds"] = round(time.perf_counter() - started, 2)
+    stats["pages_per_sec"] = round(stats["pages"] / stats["seconds"], 1) if stats["seconds"] else 0.0
+    main_rss = peak_rss_mb()[0]
+    worker_rss = stats.get("worker_peak_rss_mb")
+    stats["peak_rss_mb"] = round(main_rss, 1) if main_rss is not None else None
+    stats["worker_peak_rss_mb"] = round(worker_rss, 1) if worker_rss is not None else None
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdf")
+    parser.add_argument("--store", default=None, help="Chroma persist directory to upsert into")
+    parser.add_argument("--collection", default="langchain")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-chunks", type=int, default=256)
+    args = parser.parse_args()
+
+    store = None
+    if args.store:
+        from dotenv import load_dotenv
+        from langchain_chroma import Chroma
+        from embedding_cache import EmbeddingCache
+        from embedding_service import EmbeddingService
+
+        load_dotenv()
+        store = Chroma(
+            embedding_function=EmbeddingService(model="models/embedding-001", cache=EmbeddingCache()),
+            persist_directory=args.store,
+            collection_name=args.collection,
+        )
+    stats = ingest_pdf(args.pdf, store, workers=args.workers, batch_chunks=args.batch_chunks)
+    print(f"✅ {stats['pages']} pages → {stats['chunks']} chunks in {stats['seconds']}s "
+          f"({stats['pages_per_sec']} pages/s), peak RSS {stats['peak_rss_mb']} MB "
+          f"(workers {stats['worker_peak_rss_mb']} MB)")
+
+
+if __name__ == "__main__":
+    main()
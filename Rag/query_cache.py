@@ -0,0 +1,120 @@
+import time
+import threading
+from collections import OrderedDict, deque
+
+import numpy as np
+
+
+def normalize_query(query):
+    return " ".join(query.lower().split())
+
+
+class TTLCache:
+    """Exact-match LRU cache whose entries expire `ttl` seconds after insertion."""
+
+    def __init__(self, maxsize=512, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[1]
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class SemanticAnswerCache:
+    """Returns a stored final answer for queries whose embedding is close enough.
+
+    A lookup is a hit when the cosine similarity between the new query and a
+    previously answered one is at least `threshold`. The best similarity of
+    recent lookups is kept in `similarities` so the threshold can be tuned
+    against real traffic.
+    """
+
+    def __init__(self, threshold=0.95, maxsize=256, ttl=24 * 3600):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.similarities = deque(maxlen=1000)
+        self._vectors = None
+        self._entries = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _drop(self, keep):
+        self._entries = [entry for entry, flag in zip(self._entries, keep) if flag]
+        self._vectors = self._vectors[keep] if self._entries else None
+
+    def get(self, embedding):
+        with self._lock:
+            if self._entries:
+                keep = np.array([expires > time.monotonic() for expires, _, _ in self._entries])
+                if not keep.all():
+                    self._drop(keep)
+            if not self._entries:
+                self.misses += 1
+                return None
+
+            scores = self._vectors @ self._normalize(embedding)
+            best = int(np.argmax(scores))
+            similarity = float(scores[best])
+            self.similarities.append(similarity)
+            if similarity >= self.threshold:
+                self.hits += 1
+                return self._entries[best][2]
+            self.misses += 1
+            return None
+
+    def put(self, embedding, query, answer):
+        vector = self._normalize(embedding)[None, :]
+        with self._lock:
+            self._entries.append((time.monotonic() + self.ttl, query, answer))
+            self._vectors = vector if self._vectors is None else np.vstack([self._vectors, vector])
+            if len(self._entries) > self.maxsize:
+                self._entries.pop(0)
+                self._vectors = self._vectors[1:]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "mean_similarity": float(np.mean(self.similarities)) if self.similarities else None,
+        }
@@ -0,0 +1,211 @@
+"""Answer questions about a CSV with SQL where possible, vector retrieval otherwise.
+
+    router = QueryRouter(CsvTable("TSX Data  - Sheet1.csv"), retriever=retriver)
+    result = router.answer("Provide me a full list of all user")
+    print(result["answer"])
+
+ragCsv.ipynb embeds every row as a text document and answers from the top
+k=5 rows, so lists, counts and averages over the whole file come out
+incomplete or wrong. Here the CSV is also loaded into an in-memory SQLite
+table. One JSON-mode LLM call sees only the schema and a few sample rows
+and either writes a SELECT for the question or routes it to vector search.
+SQL results are rendered as a table without a second LLM call; search
+questions go through the retriever and a stuffed prompt like the notebook
+chain. A query that fails to run falls back to search.
+"""
+import os
+import re
+import csv
+import json
+import time
+import sqlite3
+
+from tokens import estimate_tokens, estimate_message_tokens
+
+MODEL = "gemini-2.0-flash"
+SAMPLE_ROWS = 3
+MAX_RESULT_ROWS = 200
+
+ROUTER_PROMPT = """You answer questions about one SQLite table by writing SQL, or route them to text search.
+
+{schema}
+
+If the question can be answered from this table with a single SQLite SELECT (lists, filters, counts, sums,
+averages, rankings, lookups of rows or values), respond with:
+{{"route": "sql", "sql": "<one SELECT statement over {table}>"}}
+Select the columns the question asks for (all descriptive columns for "list all" questions) and use the exact
+column names above, double-quoted as in the schema; text comparisons should be case-insensitive.
+
+Otherwise (open-ended or descriptive questions, or information the columns do not hold) respond with:
+{{"route": "search"}}
+
+Respond with JSON only."""
+
+SEARCH_PROMPT = "You are a helpful assistant that answers questions about the {name} data Of CSV file. {context}"
+
+NUMBER = re.compile(r"^-?\d+(\.\d+)?$")
+INTEGER = re.compile(r"^-?\d+$")
+PERCENT = re.compile(r"^-?\d+(\.\d+)?%$")
+
+
+def sql_name(header, taken):
+    name = re.sub(r"[^0-9a-z]+", "_", header.strip().lower()).strip("_") or "column"
+    if name[0].isdigit():
+        name = f"c_{name}"
+    unique, suffix = name, 2
+    while unique in taken:
+        unique, suffix = f"{name}_{suffix}", suffix + 1
+    taken.add(unique)
+    return unique
+
+
+def quote_name(name):
+    """SQLite identifier, quoted so headers like "Order" or "Group" are valid column names."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def infer_type(values):
+    """(SQLite type, converter, note) for one column's non-empty string values."""
+    if values and all(INTEGER.match(value) for value in values):
+        return "INTEGER", int, None
+    if values and all(NUMBER.match(value) for value in values):
+        return "REAL", float, None
+    if values and all(PERCENT.match(value) for value in values):
+        return "REAL", lambda value: float(value[:-1]), "percent"
+    return "TEXT", str, None
+
+
+def format_rows(columns, rows, limit=MAX_RESULT_ROWS):
+    """Markdown table of a query result."""
+    if not rows:
+        return "No matching rows."
+    lines = ["| " + " | ".join(columns) + " |", "|" + "---|" * len(columns)]
+    for row in rows[:limit]:
+        lines.append("| " + " | ".join("" if value is None else str(value) for value in row) + " |")
+    if len(rows) > limit:
+        lines.append(f"... {len(rows) - limit} more rows")
+    return "\n".join(lines)
+
+
+class CsvTable:
+    """A CSV file loaded into an in-memory, read-only SQLite table.
+
+    Column names become snake_case identifiers; columns whose values are all
+    integers, numbers or percentages ("11.50%") are stored as numbers.
+    """
+
+    def __init__(self, path, table="data"):
+        self.path = path
+        self.table = table
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            self.headers = [header.strip() for header in next(reader)]
+            rows = [[cell.strip() for cell in row] for row in reader if any(cell.strip() for cell in row)]
+        rows = [row + [""] * (len(self.headers) - len(row)) for row in rows]
+
+        taken = set()
+        self.columns = [sql_name(header, taken) for header in self.headers]
+        self.types = []
+        converters = []
+        for i in range(len(self.columns)):
+            sql_type, convert, note = infer_type([row[i] for row in rows if row[i]])
+            self.types.append((sql_type, note))
+            converters.append(convert)
+
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+        definition = ", ".join(f"{quote_name(name)} {sql_type}" for name, (sql_type, _) in zip(self.columns, self.types))
+        self.conn.execute(f"CREATE TABLE {quote_name(table)} ({definition})")
+        self.conn.executemany(
+            f"INSERT INTO {quote_name(table)} VALUES ({', '.join('?' * len(self.columns))})",
+            [[convert(value) if value else None for convert, value in zip(converters, row)] for row in rows],
+        )
+        self.conn.commit()
+        self.conn.execute("PRAGMA query_only = ON")
+        self.row_count = len(rows)
+
+    def schema(self, sample_rows=SAMPLE_ROWS):
+        """CREATE TABLE statement, original headers and a few sample rows, for the router prompt."""
+        lines = [f"CREATE TABLE {quote_name(self.table)} ("]
+        for i, (name, (sql_type, note), header) in enumerate(zip(self.columns, self.types, self.headers)):
+            comment = f'"{header}"' + (f", {note}" if note else "")
+            lines.append(f"  {quote_name(name)} {sql_type}{',' if i < len(self.columns) - 1 else ''}  -- {comment}")
+        lines.append(f");  -- {self.row_count} rows")
+        columns, rows = self.query(f"SELECT * FROM {quote_name(self.table)} LIMIT {sample_rows}")
+        return "\n".join(lines) + "\n\nSample rows:\n" + format_rows(columns, rows)
+
+    def query(self, sql):
+        """Run one SELECT; returns (column names, rows)."""
+        if not sql.lstrip().lower().startswith(("select", "with")):
+            raise ValueError(f"Only SELECT queries are allowed: {sql[:80]}")
+        cursor = self.conn.execute(sql)
+        return [column[0] for column in cursor.description], cursor.fetchall()
+
+
+class QueryRouter:
+    """Routes each question to SQL over a CsvTable or to vector retrieval."""
+
+    def __init__(self, table, client=None, retriever=None, model=MODEL, name=None):
+        self.table = table
+        self.retriever = retriever
+        self.model = model
+        self.name = name or os.path.splitext(os.path.basename(table.path))[0].split(" ")[0]
+        self.router_prompt = ROUTER_PROMPT.format(schema=table.schema(), table=quote_name(table.table))
+        if client is None:
+            from openai import OpenAI
+            client = OpenAI(
+                api_key=os.getenv("GOOGLE_API_KEY"),
+                base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
+            )
+        self.client = client
+
+    def _complete(self, messages, usage, **kwargs):
+        response = self.client.chat.completions.create(model=self.model, messages=messages, **kwargs)
+        content = response.choices[0].message.content
+        usage["llm_calls"] += 1
+        if response.usage is not None:
+            usage["prompt_tokens"] += response.usage.prompt_tokens
+            usage["completion_tokens"] += response.usage.completion_tokens
+        else:
+            usage["prompt_tokens"] += estimate_message_tokens(messages)
+            usage["completion_tokens"] += estimate_tokens(content)
+        return content
+
+    def route(self, question, usage):
+        """{"route": "sql", "sql": ...} or {"route": "search"}."""
+        messages = [{"role": "system", "content": self.router_prompt}, {"role": "user", "content": question}]
+        content = self._complete(messages, usage, response_format={"type": "json_object"})
+        try:
+            decision = json.loads(content)
+        except json.JSONDecodeError:
+            return {"route": "search"}
+        if decision.get("route") == "sql" and decision.get("sql"):
+            return decision
+        return {"route": "search"}
+
+    def search(self, question, usage):
+        if self.retriever is None:
+            return "This question needs text search, but no retriever is configured."
+        context = "\n\n".join(doc.page_content for doc in self.retriever.invoke(question))
+        messages = [
+            {"role": "system", "content": SEARCH_PROMPT.format(name=self.name, context=context)},
+            {"role": "user", "content": question},
+        ]
+        return self._complete(messages, usage)
+
+    def answer(self, question):
+        started = time.perf_counter()
+        usage = {"llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        decision = self.route(question, usage)
+        result = {"question": question, "route": decision["route"], "sql": decision.get("sql")}
+        if decision["route"] == "sql":
+            try:
+                columns, rows = self.table.query(decision["sql"])
+                result.update(answer=format_rows(columns, rows), columns=columns, rows=rows)
+            except (sqlite3.Error, ValueError) as e:
+                print(f"⚠️ SQL failed ({e}), falling back to search")
+                result["route"] = "search"
+                result["error"] = str(e)
+        if result["route"] == "search":
+            result["answer"] = self.search(question, usage)
+        result.update(usage, seconds=round(time.perf_counter() - started, 3))
+        return result
@@ -0,0 +1,8 @@
+def estimate_tokens(text):
+    """Cheap token estimate (~4 characters per token for English prose and code)."""
+    return (len(text) + 3) // 4
+
+
+def estimate_message_tokens(messages):
+    # A few tokens of per-message overhead for role and separators.
+    return sum(estimate_tokens(message["content"]) + 4 for message in messages)
@@ -0,0 +1,189 @@
+"""Timestamp-aware chunking of YouTube transcripts, plus a time-range index.
+
+    chunker = TranscriptChunker(max_tokens=200, max_seconds=60)
+    index = TimeRangeIndex()
+    chunks = list(chunker.chunk_segments(transcript, video_id, index=index))
+    ...
+    for hit in index.merge_hits(retriever.invoke(query)):
+        print(format_timestamp(hit["start"]), hit["url"], hit["text"])
+
+ragYT.ipynb concatenated every segment into one string with `+=` and split
+the flat text, so chunks lost their timing. Here segments stream straight
+into chunks. A chunk is closed before it would exceed `max_tokens`
+(estimated) or span more than `max_seconds`, and the last
+`overlap_segments` segments are carried into the next chunk. Each chunk's
+metadata holds its video id, start/end seconds, the positions of its first
+and last segment, and a playable URL.
+
+TimeRangeIndex keeps each video's segments in order. merge_hits turns
+retrieved chunks into playable time ranges: hits from the same video whose
+segments overlap or touch (or are within `gap` seconds) become one range.
+Its text is rebuilt from the segments, so overlapping chunks do not repeat
+text in the LLM context.
+"""
+import json
+from bisect import bisect_right
+
+from tokens import estimate_tokens
+
+
+def segment_fields(segment):
+    """(start, end, text) of a transcript segment, as a dict or a FetchedTranscriptSnippet."""
+    if isinstance(segment, dict):
+        start, duration, text = segment["start"], segment.get("duration", 0.0), segment["text"]
+    else:
+        start, duration, text = segment.start, segment.duration, segment.text
+    return float(start), float(start) + float(duration), " ".join(text.split())
+
+
+def format_timestamp(seconds):
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+def playable_url(video_id, start):
+    return f"https://www.youtube.com/watch?v={video_id}&t={int(start)}s"
+
+
+class TranscriptChunker:
+    """Groups transcript segments into chunks on token and time limits."""
+
+    def __init__(self, max_tokens=200, max_seconds=60.0, overlap_segments=1):
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+        self.overlap_segments = overlap_segments
+
+    def _chunk(self, video_id, window, first):
+        from langchain_core.documents import Document
+
+        start = window[0][0]
+        end = max(segment_end for _, segment_end, _ in window)
+        return Document(
+            id=f"{video_id}-{int(start * 1000)}",
+            page_content=" ".join(text for _, _, text in window),
+            metadata={
+                "video_id": video_id,
+                "start": start,
+                "end": end,
+                "first_segment": first,
+                "last_segment": first + len(window) - 1,
+                "source": playable_url(video_id, start),
+            },
+        )
+
+    def chunk_segments(self, segments, video_id, index=None):
+        """Yield chunk Documents as soon as each one is complete.
+
+        With an `index`, the video's segments are (re)recorded in it as they stream by.
+        """
+        if index is not None:
+            index.reset(video_id)
+        window, tokens, first, position, fresh = [], 0, 0, 0, 0
+        for segment in segments:
+            start, end, text = segment_fields(segment)
+            if not text:
+                continue
+            cost = estimate_tokens(text) + 1
+            if fresh and (tokens + cost > self.max_tokens or end - window[0][0] > self.max_seconds):
+                yield self._chunk(video_id, window, first)
+                keep = min(self.overlap_segments, len(window) - 1) if self.overlap_segments else 0
+                window = window[len(window) - keep:] if keep else []
+                first = position - len(window)
+                tokens = sum(estimate_tokens(kept) + 1 for _, _, kept in window)
+                fresh = 0
+            window.append((start, end, text))
+            tokens += cost
+            fresh += 1
+            if index is not None:
+                index.add_segment(video_id, start, end, text)
+            position += 1
+        if fresh:
+            yield self._chunk(video_id, window, first)
+
+
+class TimeRangeIndex:
+    """Per-video transcript segments in order, for time lookups and merging hits."""
+
+    def __init__(self):
+        self.segments = {}
+
+    def reset(self, video_id):
+        self.segments[video_id] = []
+
+    def add_segment(self, video_id, start, end, text):
+        self.segments.setdefault(video_id, []).append((start, end, text))
+
+    def videos(self):
+        return list(self.segments)
+
+    def segment_at(self, video_id, seconds):
+        """Position of the last segment starting at or before `seconds`, or None."""
+        starts = [start for start, _, _ in self.segments.get(video_id, [])]
+        position = bisect_right(starts, seconds) - 1
+        return position if position >= 0 else None
+
+    def text_between(self, video_id, first, last):
+        return " ".join(text for _, _, text in self.segments[video_id][first:last + 1])
+
+    def time_range(self, video_id, start, end):
+        """Text of the segments starting within [start, end) seconds."""
+        segments = self.segments.get(video_id, [])
+        return " ".join(text for segment_start, _, text in segments if start <= segment_start < end)
+
+    def merge_hits(self, docs, gap=0.0):
+        """Playable ranges for retrieved chunks, best hit first.
+
+        Each range is {"video_id", "start", "end", "url", "chunk_ids", "text"}.
+        Chunks of one video are merged when their segments overlap or are
+        adjacent, or when less than `gap` seconds separate them. Docs without
+        a video_id (e.g. flat-text chunks from an older store) are skipped.
+        """
+        by_video, rank = {}, {}
+        for i, doc in enumerate(docs):
+            video_id = doc.metadata.get("video_id")
+            if video_id is None:
+                continue
+            by_video.setdefault(video_id, []).append(doc)
+            rank.setdefault(doc.id, i)
+
+        ranges = []
+        for video_id, hits in by_video.items():
+            hits.sort(key=lambda doc: doc.metadata["first_segment"])
+            current = None
+            for doc in hits:
+                meta = doc.metadata
+                if current is not None and (meta["first_segment"] <= current["last_segment"] + 1
+                                            or meta["start"] - current["end"] <= gap):
+                    current["last_segment"] = max(current["last_segment"], meta["last_segment"])
+                    current["end"] = max(current["end"], meta["end"])
+                    current["chunk_ids"].append(doc.id)
+                    current["rank"] = min(current["rank"], rank[doc.id])
+                    continue
+                current = {"video_id": video_id, "start": meta["start"], "end": meta["end"],
+                           "first_segment": meta["first_segment"], "last_segment": meta["last_segment"],
+                           "chunk_ids": [doc.id], "rank": rank[doc.id]}
+                ranges.append(current)
+
+        ranges.sort(key=lambda item: item["rank"])
+        for item in ranges:
+            if item["video_id"] in self.segments:
+                item["text"] = self.text_between(item["video_id"], item["first_segment"], item["last_segment"])
+            else:
+                item["text"] = " ".join(doc.page_content for doc in docs if doc.id in item["chunk_ids"])
+            item["url"] = playable_url(item["video_id"], item["start"])
+            del item["rank"]
+        return ranges
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.segments, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        index = cls()
+        with open(path, encoding="utf-8") as f:
+            index.segments = {video_id: [tuple(segment) for segment in segments]
+                              for video_id, segments in json.load(f).items()}
+        return index
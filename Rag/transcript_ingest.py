@@ -0,0 +1,208 @@
+"""Fetch and chunk the transcripts of many videos concurrently, with a disk cache.
+
+    python Rag/transcript_ingest.py 8mk85fyzevc dQw4w9WgXcQ --workers 8 --store
+
+For each video the transcript is chosen like ragYT.ipynb's get_transcript:
+the manually created English one, else the generated one (Hindi or
+English), translated to English when needed. Transcripts are fetched on a
+bounded thread pool and handed to the TranscriptChunker as each video
+arrives, so chunking and upserting overlap with the remaining downloads.
+
+TranscriptCache stores every fetched transcript on disk as JSON, keyed by
+(video_id, language). Translations are stored under "<source>>en" and the
+transcript the pipeline used is also stored under "en". A cached video
+costs no request at all, and a failed translation can be retried later.
+
+The provider is anything with `list_transcripts(video_id)` that returns
+objects shaped like youtube_transcript_api's TranscriptList, so a fake
+provider can stand in for YouTube in tests and benchmarks.
+"""
+import os
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from transcript_chunker import TranscriptChunker, segment_fields
+
+MANUAL_LANGUAGES = ["en", "en-US", "en-GB"]
+GENERATED_LANGUAGES = ["hi", "en", "en-US", "en-GB"]
+TARGET_LANGUAGE = "en"
+TRANSCRIPT_CACHE_DIRECTORY = "transcript_cache"
+# The timestamped-chunk store ragYT.ipynb reads ("yt_db"/"tr1" hold older flat-text chunks).
+YT_DB = "yt_db_v2"
+YT_COLLECTION = "tr2"
+
+
+class YouTubeTranscriptProvider:
+    """youtube_transcript_api behind the provider interface (old and 1.x APIs)."""
+
+    def __init__(self):
+        from youtube_transcript_api import YouTubeTranscriptApi
+
+        api = YouTubeTranscriptApi()
+        self._list = getattr(api, "list", None) or YouTubeTranscriptApi.list_transcripts
+
+    def list_transcripts(self, video_id):
+        return self._list(video_id)
+
+
+def to_segments(fetched):
+    """Plain {"start", "duration", "text"} dicts from any fetched transcript."""
+    segments = []
+    for segment in fetched:
+        start, end, text = segment_fields(segment)
+        segments.append({"start": start, "duration": round(end - start, 3), "text": text})
+    return segments
+
+
+class TranscriptCache:
+    """Transcripts on disk, one JSON file per (video_id, language)."""
+
+    def __init__(self, cache_dir=TRANSCRIPT_CACHE_DIRECTORY):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, video_id, language):
+        name = hashlib.sha256(f"{video_id}\0{language}".encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    def get(self, video_id, language):
+        path = self._path(video_id, language)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Ignoring unreadable transcript cache entry {path}: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["segments"]
+
+    def put(self, video_id, language, segments, source_language=None):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(video_id, language)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"video_id": video_id, "language": language, "source_language": source_language,
+                       "fetched": time.time(), "segments": segments}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class TranscriptFetcher:
+    """get_transcript from ragYT.ipynb with a TranscriptCache in front of it."""
+
+    def __init__(self, provider=None, cache=None):
+        self.provider = provider or YouTubeTranscriptProvider()
+        self.cache = cache if cache is not None else TranscriptCache()
+
+    def get_transcript(self, video_id):
+        """English segments for `video_id` (translated if needed); raises if none exist."""
+        cached = self.cache.get(video_id, TARGET_LANGUAGE)
+        if cached is not None:
+            return cached
+
+        transcript_list = self.provider.list_transcripts(video_id)
+        try:
+            transcript = transcript_list.find_manually_created_transcript(MANUAL_LANGUAGES)
+        except Exception:
+            transcript = transcript_list.find_generated_transcript(GENERATED_LANGUAGES)
+
+        language = transcript.language_code
+        segments = self.cache.get(video_id, language) if language != TARGET_LANGUAGE else None
+        if segments is None:
+            segments = to_segments(transcript.fetch())
+            self.cache.put(video_id, language, segments)
+        if language != TARGET_LANGUAGE:
+            segments = to_segments(transcript.translate(TARGET_LANGUAGE).fetch())
+            self.cache.put(video_id, f"{language}>{TARGET_LANGUAGE}", segments, source_language=language)
+        self.cache.put(video_id, TARGET_LANGUAGE, segments, source_language=language)
+        return segments
+
+
+def iter_transcripts(fetcher, video_ids, workers=8):
+    """Yield (video_id, segments, error) in completion order from a bounded thread pool."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetcher.get_transcript, video_id): video_id for video_id in dict.fromkeys(video_ids)}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+
+def ingest_videos(video_ids, fetcher, store=None, chunker=None, index=None, workers=8, batch_chunks=256,
+                  verbose=True):
+    """Fetch, chunk and upsert every video; chunking starts as soon as the first one arrives."""
+    chunker = chunker or TranscriptChunker()
+    stats = {"videos": 0, "failed": 0, "segments": 0, "chunks": 0, "first_chunk_seconds": None, "errors": {}}
+    started = time.perf_counter()
+    batch = []
+
+    def flush():
+        if store is not None:
+            store.add_documents(documents=batch, ids=[chunk.id for chunk in batch])
+        stats["chunks"] += len(batch)
+        batch.clear()
+
+    for video_id, segments, error in iter_transcripts(fetcher, video_ids, workers=workers):
+        if error is not None:
+            stats["failed"] += 1
+            stats["errors"][video_id] = str(error)
+            if verbose:
+                print(f"❌ {video_id}: {error}")
+            continue
+        for chunk in chunker.chunk_segments(segments, video_id, index=index):
+            if stats["first_chunk_seconds"] is None:
+                stats["first_chunk_seconds"] = round(time.perf_counter() - started, 3)
+            batch.append(chunk)
+            if len(batch) >= batch_chunks:
+                flush()
+        stats["videos"] += 1
+        stats["segments"] += len(segments)
+        if verbose:
+            print(f"🎬 {video_id}: {len(segments)} segments ({stats['videos']}/{len(video_ids)} videos)")
+    if batch:
+        flush()
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    stats["cache"] = {"hits": fetcher.cache.hits, "misses": fetcher.cache.misses}
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("video_ids", nargs="+")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--store", nargs="?", const=YT_DB, default=None,
+                        help=f"Chroma persist directory to upsert into ({YT_DB} when given without a value)")
+    parser.add_argument("--collection", default=YT_COLLECTION)
+    parser.add_argument("--cache-dir", default=TRANSCRIPT_CACHE_DIRECTORY)
+    args = parser.parse_args()
+
+    store = None
+    if args.store:
+        from dotenv import load_dotenv
+        from langchain_chroma import Chroma
+        from embedding_cache import EmbeddingCache
+        from embedding_service import EmbeddingService
+
+        load_dotenv()
+        store = Chroma(
+            embedding_function=EmbeddingService(model="models/embedding-001", cache=EmbeddingCache()),
+            persist_directory=args.store,
+            collection_name=args.collection,
+        )
+    fetcher = TranscriptFetcher(cache=TranscriptCache(args.cache_dir))
+    stats = ingest_videos(args.video_ids, fetcher, store=store, workers=args.workers)
+    print(f"✅ {stats['videos']} videos ({stats['failed']} failed), {stats['chunks']} chunks "
+          f"in {stats['seconds']}s, cache {stats['cache']['hits']} hits / {stats['cache']['misses']} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import os
+import json
+import uuid
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+from mmr import mmr_search_by_vector
+
+
+class NumpyVectorIndex(VectorStore):
+    """In-process vector store backed by a memory-mapped float32 matrix.
+
+    `embeddings.npy` holds one L2-normalized row per chunk and is opened with
+    mmap, `docs.json` holds the ids, texts and metadata in the same row
+    order. Similarity is the dot product of the normalized rows with the
+    normalized query, so top-k is one matrix-vector product plus an
+    argpartition.
+
+    It implements the parts of the Chroma API ChaiBot uses (add_documents,
+    delete, get, reset_collection, search and MMR), so setup_retriever can
+    use either backend.
+    """
+
+    def __init__(self, embedding_function, persist_directory):
+        self.embedding_function = embedding_function
+        self.persist_directory = persist_directory
+        self.matrix_path = os.path.join(persist_directory, "embeddings.npy")
+        self.docs_path = os.path.join(persist_directory, "docs.json")
+        self.ids = []
+        self.texts = []
+        self.metadatas = []
+        self.matrix = None
+        self._row = {}
+        self.load()
+
+    @property
+    def embeddings(self):
+        return self.embedding_function
+
+    def load(self):
+        if not (os.path.exists(self.matrix_path) and os.path.exists(self.docs_path)):
+            return
+        with open(self.docs_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        self.ids = data["ids"]
+        self.texts = data["texts"]
+        self.metadatas = data["metadatas"]
+        self.matrix = np.load(self.matrix_path, mmap_mode="r")
+        self._row = {doc_id: i for i, doc_id in enumerate(self.ids)}
+
+    def _save(self, matrix):
+        os.makedirs(self.persist_directory, exist_ok=True)
+        tmp_matrix = f"{self.matrix_path}.tmp.npy"
+        tmp_docs = f"{self.docs_path}.tmp"
+        np.save(tmp_matrix, np.ascontiguousarray(matrix, dtype=np.float32))
+        with open(tmp_docs, "w", encoding="utf-8") as file:
+            json.dump({"ids": self.ids, "texts": self.texts, "metadatas": self.metadatas}, file)
+        # Drop the old mapping before replacing the file underneath it.
+        self.matrix = None
+        os.replace(tmp_matrix, self.matrix_path)
+        os.replace(tmp_docs, self.docs_path)
+        self.load()
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add_embeddings(self, texts, embeddings, metadatas=None, ids=None):
+        """Add precomputed embeddings; existing ids are replaced."""
+        texts = list(texts)
+        ids = list(ids) if ids is not None else [str(uuid.uuid4()) for _ in texts]
+        metadatas = list(metadatas) if metadatas is not None else [{} for _ in texts]
+        if not texts:
+            return []
+        replaced = [doc_id for doc_id in ids if doc_id in self._row]
+        if replaced:
+            self.delete(ids=replaced)
+
+        rows = self._normalize(embeddings)
+        matrix = rows if self.matrix is None or not len(self.ids) else np.concatenate([self.matrix, rows])
+        self.ids.extend(ids)
+        self.texts.extend(texts)
+        self.metadatas.extend(metadatas)
+        self._save(matrix)
+        return ids
+
+    def add_texts(self, texts, metadatas=None, ids=None, **kwargs):
+        texts = list(texts)
+        embeddings = self.embedding_function.embed_documents(texts)
+        return self.add_embeddings(texts, embeddings, metadatas=metadatas, ids=ids)
+
+    def delete(self, ids=None, **kwargs):
+        if not ids:
+            return
+        doomed = {self._row[doc_id] for doc_id in ids if doc_id in self._row}
+        if not doomed:
+            return
+        keep = [i for i in range(len(self.ids)) if i not in doomed]
+        matrix = np.asarray(self.matrix)[keep]
+        self.ids = [self.ids[i] for i in keep]
+        self.texts = [self.texts[i] for i in keep]
+        self.metadatas = [self.metadatas[i] for i in keep]
+        self._save(matrix)
+
+    def get(self, ids=None, limit=None, **kwargs):
+        rows = [self._row[doc_id] for doc_id in ids if doc_id in self._row] if ids else range(len(self.ids))
+        rows = list(rows)[:limit] if limit is not None else list(rows)
+        return {
+            "ids": [self.ids[i] for i in rows],
+            "documents": [self.texts[i] for i in rows],
+            "metadatas": [self.metadatas[i] for i in rows],
+        }
+
+    def reset_collection(self):
+        self.ids, self.texts, self.metadatas = [], [], []
+        self.matrix = None
+        self._row = {}
+        for path in (self.matrix_path, self.docs_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _document(self, row):
+        return Document(id=self.ids[row], page_content=self.texts[row], metadata=self.metadatas[row])
+
+    def _top_k(self, embedding, k):
+        if self.matrix is None or not len(self.ids):
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+        scores = self.matrix @ self._normalize(embedding)
+        k = min(k, len(scores))
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return top, scores[top]
+
+    def similarity_search_with_score_by_vector(self, embedding, k=4, **kwargs):
+        rows, scores = self._top_k(embedding, k)
+        return [(self._document(row), float(score)) for row, score in zip(rows, scores)]
+
+    def similarity_search_by_vector(self, embedding, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k)]
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        return self.similarity_search_with_score_by_vector(self.embedding_function.embed_query(query), k)
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return self.similarity_search_by_vector(self.embedding_function.embed_query(query), k)
+
+    def _select_relevance_score_fn(self):
+        return lambda score: (score + 1.0) / 2.0
+
+    def candidates_by_vector(self, embedding, fetch_k):
+        """Top fetch_k documents by similarity, with their (normalized) embeddings."""
+        rows, _ = self._top_k(embedding, fetch_k)
+        return [self._document(row) for row in rows], np.asarray(self.matrix[rows]) if len(rows) else None
+
+    def max_marginal_relevance_search_by_vector(self, embedding, k=4, fetch_k=20, lambda_mult=0.5, **kwargs):
+        return mmr_search_by_vector(self, embedding, k=k, fetch_k=fetch_k, lambda_mult=lambda_mult)
+
+    def max_marginal_relevance_search(self, query, k=4, fetch_k=20, lambda_mult=0.5, **kwargs):
+        embedding = self.embedding_function.embed_query(query)
+        return self.max_marginal_relevance_search_by_vector(embedding, k, fetch_k, lambda_mult)
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, ids=None, persist_directory="numpy_store", **kwargs):
+        index = cls(embedding_function=embedding, persist_directory=persist_directory)
+        index.add_texts(texts, metadatas=metadatas, ids=ids)
+        return index
@@ -1,20 +1,24 @@
 from google import genai
 import os
-import json
 from openai import OpenAI
 from dotenv import load_dotenv
-from requests import request
+from agent_engine import AgentEngine, PARALLEL_ACTIONS_PROMPT
+from weather_cache import WeatherCache
 load_dotenv()
 
+# Set AGENT_STREAM=0 to wait for the whole JSON step before printing.
+STREAM = os.getenv("AGENT_STREAM", "1") != "0"
+STREAM_LABELS = {"plan": "🧠: ", "output": "💬: "}
+
+weather_cache = WeatherCache()
+
 def get_weather(city: str):
     print("🔨 Tool Called: get_weather", city)
-    
-    url = f"https://wttr.in/{city}?format=%C+%t"
-    response = request("GET", url)
 
-    if response.status_code == 200:
-        return f"The weather in {city} is {response.text}."
-    return "Something went wrong"
+    try:
+        return f"The weather in {city} is {weather_cache.get(city)}."
+    except Exception:
+        return "Something went wrong"
 
 
 availabe_tools = {
@@ -63,49 +67,9 @@ client = OpenAI(
     base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
 )
 
-message = [
-    {
-            "role": "system", "content" : system_prompt,
-    },
-]
+engine = AgentEngine(client, system_prompt + PARALLEL_ACTIONS_PROMPT, labels=STREAM_LABELS, stream=STREAM)
+engine.register_tools(availabe_tools)
+
 while True:
     query = input("> ")
-    message.append({ "role": "user", "content": query })
-
-    while True:
-        response  = client.chat.completions.create(
-            model="gemini-2.0-flash",
-            response_format={"type": "json_object"},
-            messages=message,
-        )
-
-        parsed_ouput = json.loads(response.choices[0].message.content)
-
-        message.append({
-            "role" : "assistant",
-            "content" : json.dumps(parsed_ouput)
-        })
-
-        if(parsed_ouput.get("step") == 'plan') :
-            print(f"🧠: {parsed_ouput.get("content")}")
-
-        if(parsed_ouput.get("step") == 'action') :
-            print(f"🔨: {parsed_ouput.get("function")}")
-            function = parsed_ouput.get("function")
-            user_input = parsed_ouput.get("input") 
-
-            if function in availabe_tools:
-                tool = availabe_tools.get(function)
-                result = tool.get("function")(user_input)
-                message.append({
-                    "role" : "assistant",
-                    "content" : json.dumps({
-                        "step" : "observe",
-                        "content" : result,
-                    })
-                })
-                continue
-        
-        if(parsed_ouput.get("step") == "output") :
-            print(f"💬: {parsed_ouput.get("content")}")
-            break
\ No newline at end of file
+    engine.run(query)
@@ -0,0 +1,204 @@
+"""The plan → action → observe → output loop shared by the agent scripts.
+
+    engine = AgentEngine(client, system_prompt + PARALLEL_ACTIONS_PROMPT, labels=STREAM_LABELS)
+    engine.register_tools(available_tools)
+    while True:
+        engine.run(input("> "))
+
+Tools are registered from the scripts' `available_tools` dicts
+({"description": ..., "function": ...}). An entry may also set
+"parallel": False (or a function of the input returning a bool) for calls
+that must not overlap with others, such as writes and shell commands, and
+"format" to turn the tool's result into the observation content.
+
+Besides the usual single action ({"step": "action", "function": ..., "input":
+...}) the model may return {"step": "action", "actions": [{"function": ...,
+"input": ...}, ...]}. Runs of parallel-safe calls execute together on a
+thread pool; a call that is not parallel-safe waits for the calls before it
+and runs alone. The observation lists the results in the order the actions
+were given, so one round trip to the model replaces one per tool call.
+
+Each round trip is recorded in `timings`; set AGENT_TIMINGS=1 to print them.
+"""
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from json_stream import stream_json_completion
+
+MODEL = "gemini-2.0-flash"
+MAX_WORKERS = int(os.getenv("AGENT_TOOL_WORKERS", "8"))
+SHOW_TIMINGS = os.getenv("AGENT_TIMINGS") == "1"
+
+PARALLEL_ACTIONS_PROMPT = """
+Parallel actions:
+When several tool calls do not depend on each other's results, request them in one action step:
+{"step": "action", "content": "string", "actions": [{"function": "name", "input": "input"}, ...]}
+They run at the same time and the observation lists their results in the same order.
+Use a single "function"/"input" action when a call needs the result of an earlier one.
+"""
+
+
+def _jsonable(value):
+    """Tool results as JSON-safe values (CompletedProcess and friends become strings)."""
+    return json.loads(json.dumps(value, default=str))
+
+
+class AgentEngine:
+    """Runs one agent conversation: calls the model, dispatches tools, records timings."""
+
+    def __init__(self, client, system_prompt=None, messages=None, labels=None, stream=True, model=MODEL,
+                 action_format="🔨: {function}", max_workers=MAX_WORKERS, show_timings=SHOW_TIMINGS):
+        self.client = client
+        self.messages = messages if messages is not None else []
+        if system_prompt is not None:
+            self.messages.append({"role": "system", "content": system_prompt})
+        self.labels = labels or {"plan": "🧠: ", "output": "💬: "}
+        self.stream = stream
+        self.model = model
+        self.action_format = action_format
+        self.max_workers = max_workers
+        self.show_timings = show_timings
+        self.tools = {}
+        self.timings = []
+        self.round_trips = 0
+
+    def register(self, name, function, description="", parallel=True, format=None):
+        self.tools[name] = {"description": description, "function": function, "parallel": parallel,
+                            "format": format}
+
+    def register_tools(self, available_tools):
+        for name, tool in available_tools.items():
+            self.register(name, tool["function"], tool.get("description", ""),
+                          parallel=tool.get("parallel", True), format=tool.get("format"))
+
+    def _complete(self):
+        if self.stream:
+            content, stats = stream_json_completion(
+                self.client,
+                self.labels,
+                model=self.model,
+                response_format={"type": "json_object"},
+                messages=self.messages,
+            )
+            return content, stats["rendered"]
+        response = self.client.chat.completions.create(
+            model=self.model,
+            response_format={"type": "json_object"},
+            messages=self.messages,
+        )
+        return response.choices[0].message.content, False
+
+    def _parallel(self, action):
+        tool = self.tools.get(action.get("function"))
+        if tool is None:
+            return True
+        parallel = tool["parallel"]
+        return bool(parallel(action.get("input")) if callable(parallel) else parallel)
+
+    def call_tool(self, action):
+        """Run one action; returns (observation content, timing)."""
+        function, user_input = action.get("function"), action.get("input")
+        started = time.perf_counter()
+        timing = {"function": function}
+        tool = self.tools.get(function)
+        if tool is None:
+            print(f"❌ Function {function} not available")
+            content, timing["error"] = f"Error: Function {function} is not available", "unknown function"
+        else:
+            try:
+                result = tool["function"](user_input)
+                content = tool["format"](result) if tool["format"] else _jsonable(result)
+            except Exception as e:
+                print(f"❌ {function} failed: {e}")
+                content, timing["error"] = f"Error: {function} failed: {e}", str(e)
+        timing["seconds"] = round(time.perf_counter() - started, 4)
+        return content, timing
+
+    def run_actions(self, actions):
+        """Run a list of actions, parallel-safe runs concurrently; results keep the input order."""
+        results = [None] * len(actions)
+        batch = []
+
+        def flush(pool):
+            futures = [(i, pool.submit(self.call_tool, actions[i])) for i in batch]
+            for i, future in futures:
+                results[i] = future.result()
+            batch.clear()
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(actions)))) as pool:
+            for i, action in enumerate(actions):
+                print(self.action_format.format(function=action.get("function"), input=action.get("input")))
+                if self._parallel(action):
+                    batch.append(i)
+                    continue
+                flush(pool)
+                results[i] = self.call_tool(action)
+            flush(pool)
+        return results
+
+    def step(self):
+        """One round trip to the model. Returns the parsed step; appends it and any observation."""
+        started = time.perf_counter()
+        response_content, rendered = self._complete()
+        self.round_trips += 1
+        timing = {"round": self.round_trips, "llm_seconds": round(time.perf_counter() - started, 4)}
+
+        parsed_output = json.loads(response_content)
+        self.messages.append({"role": "assistant", "content": json.dumps(parsed_output)})
+        step = str(parsed_output.get("step", "")).lower()
+        timing["step"] = step
+
+        if step == "action":
+            batched = isinstance(parsed_output.get("actions"), list)
+            actions = parsed_output["actions"] if batched else [parsed_output]
+            tools_started = time.perf_counter()
+            results = self.run_actions(actions)
+            timing["tool_seconds"] = round(time.perf_counter() - tools_started, 4)
+            timing["tools"] = [tool_timing for _, tool_timing in results]
+            if batched:
+                content = [{"function": action.get("function"), "input": action.get("input"), "content": result}
+                           for action, (result, _) in zip(actions, results)]
+            else:
+                content = results[0][0]
+            self.messages.append({
+                "role": "assistant",
+                "content": json.dumps({"step": "observe", "content": content}),
+            })
+        elif not rendered and step in self.labels:
+            print(f"{self.labels[step]}{parsed_output.get('content')}")
+
+        self.timings.append(timing)
+        if self.show_timings:
+            print(self.format_timing(timing))
+        return parsed_output
+
+    def run(self, query):
+        """Answer one user message; returns the output step's content (None on an unknown step)."""
+        self.messages.append({"role": "user", "content": query})
+        while True:
+            parsed_output = self.step()
+            step = self.timings[-1]["step"]
+            if step == "output":
+                return parsed_output.get("content")
+            if step not in ("plan", "action", "observe"):
+                print(f"⚠️ Unknown step: {step}")
+                return None
+
+    @staticmethod
+    def format_timing(timing):
+        line = f"⏱️ round {timing['round']} ({timing['step']}): model {timing['llm_seconds']:.2f}s"
+        if "tools" in timing:
+            serial = sum(tool["seconds"] for tool in timing["tools"])
+            line += f", {len(timing['tools'])} tool(s) {timing['tool_seconds']:.2f}s (sum {serial:.2f}s)"
+        return line
+
+    def summary(self):
+        """Totals over every round trip so far."""
+        return {
+            "round_trips": self.round_trips,
+            "tool_calls": sum(len(timing.get("tools", [])) for timing in self.timings),
+            "llm_seconds": round(sum(timing["llm_seconds"] for timing in self.timings), 3),
+            "tool_seconds": round(sum(timing.get("tool_seconds", 0.0) for timing in self.timings), 3),
+        }
@@ -0,0 +1,105 @@
+"""Round trips and latency: one tool call per model response vs. batched parallel actions.
+
+A scripted fake LLM answers a question that needs --tools independent tool
+calls (the weather in N cities). In "one at a time" mode it emits a plan,
+one action per response and then the output, like the agents did before
+AgentEngine: N + 2 round trips. In "batched" mode it emits a plan, one
+action step listing all N calls and the output: 3 round trips. Batched
+mode is run with one tool worker and with --workers, to separate the
+saved round trips from the concurrent tool execution.
+
+Every model call costs --rtt plus --decode-ms per output token and every
+tool call sleeps --tool-latency. The fake client streams its reply like the
+real one, so the engine runs its normal streaming path.
+
+    python bench_agent_engine.py --tools 6 --rtt 0.4 --decode-ms 4 --tool-latency 0.3
+"""
+import io
+import json
+import time
+import argparse
+import contextlib
+from types import SimpleNamespace
+
+from agent_engine import AgentEngine
+
+CITIES = ["Delhi", "Mumbai", "Pune", "Surat", "Jaipur", "Kolkata", "Chennai", "Indore", "Bhopal", "Patna"]
+
+
+class ScriptedLLM:
+    """Fake OpenAI client whose replies depend only on how many observations it has seen."""
+
+    def __init__(self, cities, batched, rtt=0.4, decode_ms=4.0):
+        self.cities = cities
+        self.batched = batched
+        self.rtt = rtt
+        self.decode_ms = decode_ms
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def reply(self, messages):
+        steps = [json.loads(message["content"]) for message in messages if message["role"] == "assistant"]
+        observations = [step for step in steps if step.get("step") == "observe"]
+        if not steps:
+            return {"step": "plan", "content": f"The user wants the weather in {len(self.cities)} cities."}
+        if self.batched:
+            if not observations:
+                return {"step": "action", "content": "Fetching every city at once",
+                        "actions": [{"function": "get_weather_data", "input": city} for city in self.cities]}
+            results = [item["content"] for item in observations[0]["content"]]
+        else:
+            if len(observations) < len(self.cities):
+                return {"step": "action", "function": "get_weather_data", "input": self.cities[len(observations)]}
+            results = [step["content"] for step in observations]
+        return {"step": "output", "content": " ".join(results)}
+
+    def create(self, messages, stream=False, **kwargs):
+        self.calls += 1
+        reply = json.dumps(self.reply(messages))
+        # ~4 characters per output token, like Rag/tokens.py.
+        time.sleep(self.rtt + len(reply) / 4 * self.decode_ms / 1000)
+        if not stream:
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=reply))])
+        return iter([SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=reply[i:i + 16]))])
+                     for i in range(0, len(reply), 16)])
+
+
+def run(cities, batched, workers, args):
+    client = ScriptedLLM(cities, batched, rtt=args.rtt, decode_ms=args.decode_ms)
+
+    def get_weather(city):
+        time.sleep(args.tool_latency)
+        return f"The weather in {city} is Sunny +31°C."
+
+    engine = AgentEngine(client, "You are a weather agent.", max_workers=workers, show_timings=False)
+    engine.register_tools({"get_weather_data": {"description": "weather for a city", "function": get_weather}})
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        answer = engine.run("What is the weather in these cities?")
+    seconds = time.perf_counter() - started
+    assert answer == " ".join(f"The weather in {city} is Sunny +31°C." for city in cities), answer
+    return dict(engine.summary(), seconds=seconds, llm_calls=client.calls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tools", type=int, default=6, help="independent tool calls the question needs")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rtt", type=float, default=0.4, help="seconds of fixed latency per model call")
+    parser.add_argument("--decode-ms", type=float, default=4.0, help="ms per output token")
+    parser.add_argument("--tool-latency", type=float, default=0.3, help="seconds per tool call")
+    args = parser.parse_args()
+
+    cities = (CITIES * (args.tools // len(CITIES) + 1))[:args.tools]
+    print(f"{args.tools} tool calls, {args.rtt * 1000:.0f}ms per model call, {args.tool_latency * 1000:.0f}ms per tool")
+    print(f"{'mode':>24} {'round trips':>11} {'model s':>8} {'tools s':>8} {'total s':>8}")
+    for name, batched, workers in (("one at a time", False, 1),
+                                   ("batched, 1 worker", True, 1),
+                                   (f"batched, {args.workers} workers", True, args.workers)):
+        result = run(cities, batched, workers, args)
+        print(f"{name:>24} {result['round_trips']:>11} {result['llm_seconds']:>8.2f} "
+              f"{result['tool_seconds']:>8.2f} {result['seconds']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Per-call latency of tool HTTP requests, with and without connection pooling.
+
+A local HTTP/1.1 server answers GET /weather with a short body after
+--latency seconds and counts the TCP connections it accepts. Each mode
+makes --calls requests:
+
+  requests.request   one new connection per call (what get_weather did)
+  pooled, sync       ToolHTTPClient.get over a keep-alive session
+  httpx, no pool     a fresh httpx.AsyncClient per call, --concurrency at a time
+  pooled, async      ToolHTTPClient.aget, --concurrency at a time
+
+Then GET /flaky, which answers 503 to every other request, shows the
+jittered retries ending in a 200.
+
+    python bench_http_client.py --calls 300 --concurrency 16 --latency 0
+"""
+import time
+import asyncio
+import argparse
+import threading
+import statistics
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import requests
+
+from http_client import ToolHTTPClient
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.0
+    connections = 0
+    flaky = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with self.lock:
+            CountingHandler.connections += 1
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        status, body = 200, "Sunny +30°C".encode()
+        if self.path.startswith("/flaky"):
+            with self.lock:
+                CountingHandler.flaky += 1
+                if CountingHandler.flaky % 2:
+                    status, body = 503, b"try again"
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 503:
+            self.send_header("Retry-After", "0.05")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def sync_calls(call, url, count):
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = call(url)
+        assert response.status_code == 200
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def async_calls(call, url, count, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await call(url)
+            assert response.status_code == 200
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one() for _ in range(count)))
+    return latencies
+
+
+async def unpooled_get(url):
+    async with httpx.AsyncClient() as client:
+        return await client.get(url)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.0, help="server seconds per request")
+    args = parser.parse_args()
+
+    CountingHandler.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/weather"
+    client = ToolHTTPClient()
+
+    async def pooled_async():
+        try:
+            return await async_calls(client.aget, url, args.calls, args.concurrency)
+        finally:
+            await client.aclose()
+
+    modes = (
+        ("requests.request", lambda: sync_calls(lambda u: requests.request("GET", u), url, args.calls)),
+        ("pooled, sync", lambda: sync_calls(client.get, url, args.calls)),
+        ("httpx, no pool", lambda: asyncio.run(async_calls(unpooled_get, url, args.calls, args.concurrency))),
+        ("pooled, async", lambda: asyncio.run(pooled_async())),
+    )
+    print(f"{args.calls} calls, server latency {args.latency * 1000:.0f}ms, async concurrency {args.concurrency}")
+    print(f"{'mode':>17} {'mean ms':>8} {'p50 ms':>7} {'p95 ms':>7} {'total s':>8} {'connections':>12}")
+    for name, run in modes:
+        before = CountingHandler.connections
+        started = time.perf_counter()
+        latencies = sorted(run())
+        total = time.perf_counter() - started
+        print(f"{name:>17} {statistics.mean(latencies) * 1000:>8.2f} {statistics.median(latencies) * 1000:>7.2f} "
+              f"{latencies[int(len(latencies) * 0.95) - 1] * 1000:>7.2f} {total:>8.2f} "
+              f"{CountingHandler.connections - before:>12}")
+
+    retries = client.stats["retries"]
+    started = time.perf_counter()
+    response = client.get(url.replace("/weather", "/flaky"))
+    print(f"\n/flaky: {response.status_code} after {client.stats['retries'] - retries} retry "
+          f"in {(time.perf_counter() - started) * 1000:.0f}ms (Retry-After 50ms)")
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
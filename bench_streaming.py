@@ -0,0 +1,110 @@
+"""Time to first visible token: streaming vs blocking JSON-mode completions.
+
+A local fake OpenAI-compatible server "generates" an agent step at a fixed
+rate. With stream=true it sends Server-Sent Events (chat.completion.chunk,
+a few characters each); otherwise it sends the whole completion once it
+is done. The blocking path can show nothing until the full JSON arrives;
+stream_json_completion prints "content" as soon as "step" is known.
+
+    python bench_streaming.py --chars 1200 --chunk 4 --token-delay 0.01
+"""
+import io
+import json
+import time
+import argparse
+import threading
+import statistics
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from openai import OpenAI
+
+from json_stream import stream_json_completion
+
+LABELS = {"plan": "🧠: ", "output": "💬: "}
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    reply = ""
+    chunk_size = 4
+    token_delay = 0.01
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        pieces = [self.reply[i:i + self.chunk_size] for i in range(0, len(self.reply), self.chunk_size)]
+        if not request.get("stream"):
+            time.sleep(self.token_delay * len(pieces))
+            body = json.dumps(self._completion("chat.completion", {"message": {"role": "assistant", "content": self.reply}})).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for piece in pieces:
+            time.sleep(self.token_delay)
+            self._send_event(json.dumps(self._completion("chat.completion.chunk", {"delta": {"content": piece}})))
+        self._send_event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _completion(self, kind, choice):
+        choice = dict(choice, index=0, finish_reason=None)
+        return {"id": "fake", "object": kind, "created": 0, "model": "fake", "choices": [choice]}
+
+    def _send_event(self, data):
+        event = f"data: {data}\n\n".encode()
+        self.wfile.write(f"{len(event):x}\r\n".encode() + event + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chars", type=int, default=1200, help="length of the step's content")
+    parser.add_argument("--chunk", type=int, default=4, help="characters per streamed chunk")
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    content = ("Express routes map an HTTP verb and path to a handler. " * 100)[:args.chars]
+    FakeLLMHandler.reply = json.dumps({"step": "output", "content": content})
+    FakeLLMHandler.chunk_size = args.chunk
+    FakeLLMHandler.token_delay = args.token_delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = OpenAI(api_key="fake", base_url=f"http://127.0.0.1:{server.server_port}/v1/")
+    request = {"model": "fake", "response_format": {"type": "json_object"},
+               "messages": [{"role": "user", "content": "How do routes work?"}]}
+
+    blocking, streaming_first, streaming_total = [], [], []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        response = client.chat.completions.create(**request)
+        parsed = json.loads(response.choices[0].message.content)
+        blocking.append(time.perf_counter() - started)
+
+        out = io.StringIO()
+        raw, stats = stream_json_completion(client, LABELS, out=out, **request)
+        assert json.loads(raw) == parsed and out.getvalue() == f"💬: {content}\n"
+        streaming_first.append(stats["first_visible"])
+        streaming_total.append(stats["total"])
+    server.shutdown()
+
+    print(f"{len(FakeLLMHandler.reply)} chars in chunks of {args.chunk}, {args.token_delay * 1000:.0f}ms per chunk, "
+          f"median of {args.runs} runs")
+    print(f"blocking : first visible {statistics.median(blocking) * 1000:8.1f} ms, "
+          f"complete {statistics.median(blocking) * 1000:8.1f} ms")
+    print(f"streaming: first visible {statistics.median(streaming_first) * 1000:8.1f} ms, "
+          f"complete {statistics.median(streaming_total) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""get_weather with and without WeatherCache, against a local stub wttr.in.
+
+The stub answers GET /<city>?format=%C+%t after --latency seconds with
+"Sunny +<n>°C", where n counts that city's requests, so a refreshed value
+can be told apart from a cached one. It can also be switched to answer 503.
+
+Scenarios, each reporting wall time and the requests the stub received:
+  no cache      --lookups concurrent lookups of one city, spelled differently
+  cold cache    the same lookups through WeatherCache (coalesced)
+  warm cache    the same lookups again
+  stale         after --ttl: the old value at once, one background refresh
+  restart       a new WeatherCache on the same file
+  outage        stub answers 503 once the entry is stale: old value still served
+
+    python bench_weather_cache.py --lookups 20 --latency 0.3 --ttl 0.5
+"""
+import os
+import time
+import argparse
+import tempfile
+import threading
+from urllib.parse import unquote, urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from weather_cache import WeatherCache, fetch_weather, normalize_city
+
+SPELLINGS = ["Surat", " surat", "SURAT ", "Surat,", "  surat  "]
+
+
+class StubWeatherHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.3
+    failing = False
+    requests = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        city = normalize_city(unquote(urlsplit(self.path).path.lstrip("/")))
+        with self.lock:
+            self.requests[city] = self.requests.get(city, 0) + 1
+            count = self.requests[city]
+        time.sleep(self.latency)
+        status, body = (503, b"Service Unavailable") if self.failing else (200, f"Sunny +{count}°C".encode())
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def total_requests():
+    return sum(StubWeatherHandler.requests.values())
+
+
+def lookups(get, count):
+    """`count` concurrent lookups cycling through SPELLINGS; returns (seconds, values)."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        values = list(pool.map(get, [SPELLINGS[i % len(SPELLINGS)] for i in range(count)]))
+    return time.perf_counter() - started, values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.3, help="stub seconds per request")
+    parser.add_argument("--ttl", type=float, default=0.5)
+    args = parser.parse_args()
+
+    StubWeatherHandler.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubWeatherHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    def fetch(city):
+        return fetch_weather(city, base_url=base_url)
+
+    print(f"{args.lookups} concurrent lookups, {args.latency * 1000:.0f}ms per stub request, ttl {args.ttl}s")
+    print(f"{'scenario':>12} {'seconds':>8} {'requests':>9}  values")
+
+    def report(name, seconds, values, before):
+        distinct = sorted(set(values))
+        shown = ", ".join(distinct) if len(distinct) <= 3 else f"{len(distinct)} different values"
+        print(f"{name:>12} {seconds:>8.3f} {total_requests() - before:>9}  {shown}")
+
+    before = total_requests()
+    report("no cache", *lookups(fetch, args.lookups), before)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "weather_cache.json")
+        cache = WeatherCache(fetch, path=path, ttl=args.ttl, stale_ttl=args.ttl * 20)
+
+        before = total_requests()
+        report("cold cache", *lookups(cache.get, args.lookups), before)
+        before = total_requests()
+        report("warm cache", *lookups(cache.get, args.lookups), before)
+
+        time.sleep(args.ttl * 1.1)
+        before = total_requests()
+        seconds, values = lookups(cache.get, args.lookups)
+        time.sleep(args.latency * 2)
+        report("stale", seconds, values, before)
+        started = time.perf_counter()
+        value = cache.get("Surat")
+        print(f"{'refreshed':>12} {time.perf_counter() - started:>8.3f} {0:>9}  {value}")
+
+        before = total_requests()
+        restarted = WeatherCache(fetch, path=path, ttl=args.ttl, stale_ttl=args.ttl * 20)
+        report("restart", *lookups(restarted.get, args.lookups), before)
+
+        StubWeatherHandler.failing = True
+        time.sleep(args.ttl * 1.1)
+        before = total_requests()
+        seconds, values = lookups(restarted.get, args.lookups)
+        time.sleep(args.latency * 2)
+        report("outage", seconds, values, before)
+        print(f"cache stats: {cache.stats}")
+        print(f"after restart: {restarted.stats}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""One pooled, keep-alive HTTP client for the agents' tools.
+
+    from http_client import get_client
+
+    response = get_client().get("https://wttr.in/Surat", params={"format": "%C+%t"})
+    response = await get_client().aget("https://api.github.com/repos/octocat/Hello-World")
+
+The sync side is a requests.Session whose adapter keeps up to
+HTTP_POOL_SIZE connections per host alive between calls; the async side is
+an httpx.AsyncClient with the same limits, created on first use. Both use
+explicit connect and read timeouts. Connection errors, timeouts and 429 /
+502 / 503 / 504 responses are retried up to HTTP_RETRIES times for
+idempotent methods, sleeping a random ("full jitter") fraction of an
+exponential backoff, or the server's Retry-After when that is given.
+
+request() returns a requests.Response and arequest() an httpx.Response;
+both have .status_code, .headers, .text and .json().
+"""
+import os
+import time
+import random
+import asyncio
+import weakref
+import threading
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "15"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+HTTP_BACKOFF = 0.25
+HTTP_MAX_BACKOFF = 8.0
+
+RETRY_STATUSES = {429, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+def backoff_delay(attempt, base=HTTP_BACKOFF, cap=HTTP_MAX_BACKOFF, retry_after=None):
+    """Seconds to wait before retry number `attempt` (0-based): full jitter, or Retry-After."""
+    if retry_after:
+        try:
+            return min(float(retry_after), cap)
+        except ValueError:
+            pass
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class ToolHTTPClient:
+    """Keep-alive connection pools with timeouts and jittered retries, sync and async."""
+
+    def __init__(self, connect_timeout=HTTP_CONNECT_TIMEOUT, read_timeout=HTTP_READ_TIMEOUT, retries=HTTP_RETRIES,
+                 pool_size=HTTP_POOL_SIZE, backoff=HTTP_BACKOFF, max_backoff=HTTP_MAX_BACKOFF, headers=None):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.pool_size = pool_size
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.headers = dict(headers or {})
+        self.stats = {"requests": 0, "retries": 0, "errors": 0}
+        self._session = None
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    # Retries are done here, with jitter, not by urllib3.
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size,
+                                          max_retries=0)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    session.headers.update(self.headers)
+                    self._session = session
+        return self._session
+
+    @property
+    def async_client(self):
+        """The httpx.AsyncClient for the running event loop (its connections belong to that loop)."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            import httpx
+
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=self.pool_size),
+                headers=self.headers,
+            )
+            self._async_clients[loop] = client
+        return client
+
+    def _should_retry(self, method, attempt, status=None):
+        if attempt >= self.retries or method.upper() not in IDEMPOTENT_METHODS:
+            return False
+        return status is None or status in RETRY_STATUSES
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def request(self, method, url, retry=True, **kwargs):
+        """requests.Session.request with pooled connections, timeouts and retries."""
+        import requests
+
+        kwargs.setdefault("timeout", (self.connect_timeout, self.read_timeout))
+        attempt = 0
+        while True:
+            self._count("requests")
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if not (retry and self._should_retry(method, attempt)):
+                    self._count("errors")
+                    raise
+                delay = backoff_delay(attempt, self.backoff, self.max_backoff)
+            else:
+                if not (retry and self._should_retry(method, attempt, response.status_code)):
+                    return response
+                delay = backoff_delay(attempt, self.backoff, self.max_backoff, response.headers.get("Retry-After"))
+                response.close()
+            self._count("retries")
+            time.sleep(delay)
+            attempt += 1
+
+    async def arequest(self, method, url, retry=True, **kwargs):
+        """httpx.AsyncClient.request with pooled connections, timeouts and retries."""
+        import httpx
+
+        client = self.async_client
+        attempt = 0
+        while True:
+            self._count("requests")
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                if not (retry and self._should_retry(method, attempt)):
+                    self._count("errors")
+                    raise
+                delay = backoff_delay(attempt, self.backoff, self.max_backoff)
+            else:
+                if not (retry and self._should_retry(method, attempt, response.status_code)):
+                    return response
+                delay = backoff_delay(attempt, self.backoff, self.max_backoff, response.headers.get("Retry-After"))
+                await response.aclose()
+            self._count("retries")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    async def aget(self, url, **kwargs):
+        return await self.arequest("GET", url, **kwargs)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    async def aclose(self):
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide ToolHTTPClient, so every tool shares one set of pools."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ToolHTTPClient()
+    return _client
@@ -0,0 +1,257 @@
+import sys
+import json
+import time
+
+
+def _safe_cut(raw):
+    """Length of the prefix of the raw JSON string `raw` that can be decoded now.
+
+    Stops before a trailing lone backslash, an unfinished \\uXXXX escape, or a
+    high surrogate still waiting for its low half.
+    """
+    i = raw.find("\\")
+    while i >= 0:
+        if i + 1 >= len(raw):
+            return i
+        if raw[i + 1] != "u":
+            i = raw.find("\\", i + 2)
+            continue
+        if i + 6 > len(raw):
+            return i
+        size = 12 if 0xD800 <= int(raw[i + 2:i + 6], 16) < 0xDC00 else 6
+        if i + size > len(raw):
+            return i
+        i = raw.find("\\", i + size)
+    return len(raw)
+
+
+class JSONEnvelopeParser:
+    """Incremental parser for the flat {"step": ..., "content": ...} objects the agents emit.
+
+    feed() takes text as it arrives and returns events:
+      ("delta", key, text)   decoded piece of a top-level string value
+      ("value", key, value)  a top-level value is complete
+    Nested objects and arrays (e.g. "input") are reported once, as a "value".
+    """
+
+    def __init__(self):
+        self.values = {}
+        self._state = "start"
+        self._key = None
+        self._raw = []
+        self._pending = ""
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text):
+        events = []
+        i = 0
+        while i < len(text):
+            char = text[i]
+            state = self._state
+            if state == "string":
+                # Consume a run of plain characters in one step.
+                end = i
+                while end < len(text) and text[end] not in '"\\':
+                    end += 1
+                if self._escaped:
+                    self._pending += char
+                    self._escaped = False
+                    i += 1
+                    continue
+                if end > i:
+                    self._pending += text[i:end]
+                    i = end
+                    continue
+                if char == "\\":
+                    self._pending += char
+                    self._escaped = True
+                    i += 1
+                    continue
+                # Closing quote.
+                self._flush(events, final=True)
+                events.append(("value", self._key, self.values[self._key]))
+                self._state = "after_value"
+                i += 1
+                continue
+            if state == "nested":
+                self._raw.append(char)
+                if self._in_string:
+                    if self._escaped:
+                        self._escaped = False
+                    elif char == "\\":
+                        self._escaped = True
+                    elif char == '"':
+                        self._in_string = False
+                elif char == '"':
+                    self._in_string = True
+                elif char in "{[":
+                    self._depth += 1
+                elif char in "}]":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._finish_raw(events)
+                i += 1
+                continue
+            if state == "scalar":
+                if char in ",}" or char.isspace():
+                    self._finish_raw(events)
+                    continue
+                self._raw.append(char)
+                i += 1
+                continue
+            if state == "key":
+                self._raw.append(char)
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._key = json.loads('"' + "".join(self._raw))
+                    self._raw = []
+                    self._state = "colon"
+                i += 1
+                continue
+            if not char.isspace():
+                if state == "start" and char == "{":
+                    self._state = "key_or_end"
+                elif state in ("key_or_end", "next_key") and char == '"':
+                    self._state = "key"
+                elif state == "key_or_end" and char == "}":
+                    self._state = "done"
+                elif state == "colon" and char == ":":
+                    self._state = "value"
+                elif state == "value":
+                    if char == '"':
+                        self._state = "string"
+                        self.values[self._key] = ""
+                    elif char in "{[":
+                        self._state, self._depth, self._raw = "nested", 1, [char]
+                    else:
+                        self._state, self._raw = "scalar", [char]
+                elif state == "after_value" and char == ",":
+                    self._state = "next_key"
+                elif state == "after_value" and char == "}":
+                    self._state = "done"
+            i += 1
+        if self._state == "string":
+            self._flush(events)
+        return events
+
+    def _flush(self, events, final=False):
+        pending = self._pending
+        cut = len(pending) if final else _safe_cut(pending)
+        if cut <= 0:
+            return
+        piece = json.loads('"' + pending[:cut] + '"')
+        self._pending = pending[cut:]
+        if piece:
+            self.values[self._key] += piece
+            events.append(("delta", self._key, piece))
+
+    def _finish_raw(self, events):
+        value = json.loads("".join(self._raw))
+        self.values[self._key] = value
+        self._raw = []
+        self._state = "after_value"
+        events.append(("value", self._key, value))
+
+    @property
+    def done(self):
+        return self._state == "done"
+
+
+class _Display:
+    def __init__(self, out):
+        self.out = out or sys.stdout
+        self.started = time.perf_counter()
+        self.first_visible = None
+        self.rendered = False
+
+    def show(self, text):
+        if self.first_visible is None:
+            self.first_visible = time.perf_counter() - self.started
+        self.rendered = True
+        self.out.write(text)
+        self.out.flush()
+
+    def stats(self):
+        return {
+            "rendered": self.rendered,
+            "first_visible": self.first_visible,
+            "total": time.perf_counter() - self.started,
+        }
+
+
+def _completion_text(client, create_kwargs):
+    for chunk in client.chat.completions.create(stream=True, **create_kwargs):
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def stream_json_completion(client, labels, out=None, **create_kwargs):
+    """Stream a JSON-mode chat completion, printing step content as it arrives.
+
+    `labels` maps a lower-cased step name to the prefix printed before its
+    "content"; steps without a label are not printed. Content that arrives
+    before "step" is held back until the step is known.
+
+    Returns (raw_text, stats) so callers parse the text exactly as they do
+    a blocking response; stats["rendered"] tells whether the content was
+    already printed, and "first_visible" / "total" are the seconds to the
+    first printed character and to the end of the stream.
+    """
+    display = _Display(out)
+    parser = JSONEnvelopeParser()
+    chunks, held, label = [], [], None
+    for text in _completion_text(client, create_kwargs):
+        chunks.append(text)
+        for kind, key, value in parser.feed(text):
+            if key == "step" and kind == "value" and isinstance(value, str):
+                label = labels.get(value.lower())
+                if label is not None:
+                    display.show(label + "".join(held))
+                held = []
+            elif key == "content" and kind == "delta":
+                if label is not None:
+                    display.show(value)
+                elif "step" not in parser.values:
+                    held.append(value)
+            elif key == "content" and kind == "value" and not isinstance(value, str):
+                # Numbers, objects and lists arrive whole, never as deltas.
+                if label is not None:
+                    display.show(json.dumps(value, ensure_ascii=False))
+                elif "step" not in parser.values:
+                    held.append(json.dumps(value, ensure_ascii=False))
+    if display.rendered:
+        display.show("\n")
+    return "".join(chunks), display.stats()
+
+
+def stream_json_sections(client, labels, out=None, **create_kwargs):
+    """Stream a completion whose top-level keys are the steps, e.g. {"plan": ..., "output": ...}.
+
+    Each key found in `labels` is printed as its label followed by its value,
+    streamed as it arrives. Returns (raw_text, stats) like
+    stream_json_completion.
+    """
+    display = _Display(out)
+    parser = JSONEnvelopeParser()
+    chunks, opened = [], []
+    for text in _completion_text(client, create_kwargs):
+        chunks.append(text)
+        for kind, key, value in parser.feed(text):
+            label = labels.get(key.lower())
+            if label is None:
+                continue
+            if key not in opened:
+                display.show(("\n" if opened else "") + label)
+                opened.append(key)
+            if kind == "delta":
+                display.show(value)
+            elif not isinstance(value, str):
+                display.show(str(value))
+    if display.rendered:
+        display.show("\n")
+    return "".join(chunks), display.stats()
@@ -2,9 +2,14 @@ import os
 import json
 from openai import OpenAI
 from dotenv import load_dotenv
+from agent_engine import AgentEngine, PARALLEL_ACTIONS_PROMPT
 
 load_dotenv()
 
+# Set AGENT_STREAM=0 to wait for the whole JSON step before printing.
+STREAM = os.getenv("AGENT_STREAM", "1") != "0"
+STREAM_LABELS = {"plan": "🧠: ", "output": "💬: "}
+
 class AutoAgent:
     def __init__(self):
         self.client = OpenAI(
@@ -158,7 +163,8 @@ Available Tools:
         self.available_tools = {
             "command_exec": {
                 "description": "Execute a terminal command",
-                "function": self.command_exec
+                "function": self.command_exec,
+                "parallel": False
             },
             "read_file": {
                 "description": "Read the content of a file",
@@ -166,7 +172,8 @@ Available Tools:
             },
             "write_file": {
                 "description": "Create or update a file with content",
-                "function": self.write_file
+                "function": self.write_file,
+                "parallel": False
             },
             "scan_directory": {
                 "description": "List files in a directory",
@@ -179,8 +186,11 @@ Available Tools:
         }
 
         self.messages = [
-            {"role": "system", "content": self.system_prompt}
+            {"role": "system", "content": self.system_prompt + PARALLEL_ACTIONS_PROMPT}
         ]
+        self.engine = AgentEngine(self.client, messages=self.messages, labels=STREAM_LABELS, stream=STREAM,
+                                  action_format="🔨 Executing: {function}")
+        self.engine.register_tools(self.available_tools)
 
     def command_exec(self, command):
         print("🔑 ", command)
@@ -287,97 +297,13 @@ Available Tools:
                     print("\n👋 Goodbye! TeaCoder AI Coding Assistant is shutting down.")
                     break
                     
-                self.messages.append({"role": "user", "content": query})
-
                 try:
-                    conversation_active = True
-                    while conversation_active:
-                        try:
-                            response = self.client.chat.completions.create(
-                                model="gemini-2.0-flash",
-                                response_format={"type": "json_object"},
-                                messages=self.messages,
-                            )
-
-                            try:
-                                response_content = response.choices[0].message.content
-                                parsed_output = json.loads(response_content)
-                                
-                                self.messages.append({
-                                    "role": "assistant",
-                                    "content": json.dumps(parsed_output)
-                                })
-
-                                step = parsed_output.get("step", "").lower()
-
-                                if step == 'plan':
-                                    print(f"🧠: {parsed_output.get('content')}")
-
-                                elif step == 'action':
-                                    function = parsed_output.get("function")
-                                    user_input = parsed_output.get("input")
-                                    print(f"🔨 Executing: {function}")
-                                    
-                                    if function in self.available_tools:
-                                        if function == "write_file" and (not isinstance(user_input, dict) or 'path' not in user_input):
-                                            print("❌ Invalid write_file parameters")
-                                            self.messages.append({
-                                                "role": "system",
-                                                "content": "ERROR: write_file requires {path: '...', content: '...'} format"
-                                            })
-                                            continue
-                                            
-                                        tool = self.available_tools.get(function)
-                                        if function == "command_exec":
-                                            print("🔑 ", user_input)
-                                        result = tool.get("function")(user_input)
-                                        
-                                        observation = {
-                                            "step": "observe",
-                                            "content": result,
-                                        }
-                                        
-                                        print(f"👁️ Observation: Operation completed")
-                                        
-                                        self.messages.append({
-                                            "role": "assistant", 
-                                            "content": json.dumps(observation)
-                                        })
-                                        
-                                    else:
-                                        print(f"❌ Function {function} not available")
-                                        self.messages.append({
-                                            "role": "system",
-                                            "content": f"ERROR: Function {function} is not available"
-                                        })
-                                        
-                                elif step == "output":
-                                    print(f"💬: {parsed_output.get('content')}")
-                                    conversation_active = False  # End this conversation loop
-                                    break
-                                    
-                                elif step == "observe":
-                                    # Just log that we received an observation, but continue processing
-                                    print(f"👁️ Received observation: {parsed_output.get('content')[:50]}...")
-                                    
-                                else:
-                                    print(f"⚠️ Unknown step: {step}")
-                                    conversation_active = False
-                                    break
-                                    
-                            except json.JSONDecodeError:
-                                print("❌ Invalid JSON response from API")
-                                print(f"Raw response: {response_content[:100]}...")
-                                conversation_active = False
-                                break
-                                
-                        except Exception as e:
-                            print(f"❌ Error in conversation loop: {str(e)}")
-                            conversation_active = False
-                            break
-                            
+                    self.engine.run(query)
+                except json.JSONDecodeError as e:
+                    print("❌ Invalid JSON response from API")
+                    print(f"Raw response: {e.doc[:100]}...")
                 except Exception as e:
-                    print(f"❌ Error processing request: {str(e)}")
+                    print(f"❌ Error in conversation loop: {str(e)}")
                     
         except KeyboardInterrupt:
             print("\n👋 Goodbye! TeaCoder AI Coding Assistant is shutting down.")
@@ -0,0 +1,140 @@
+"""Cached wttr.in lookups for the weather agents' get_weather tool.
+
+    weather_cache = WeatherCache()
+    weather_cache.get("New York")   # "Sunny +25°C"
+
+Results are keyed by the normalized city name ("  new   York" and "New
+York" share an entry) and kept in a JSON file, so they survive restarts.
+An entry younger than WEATHER_TTL seconds is returned as is. An older
+entry, up to WEATHER_STALE_TTL seconds, is still returned at once while a
+background thread fetches a fresh value (stale-while-revalidate). Anything
+older, or missing, is fetched before returning. Concurrent lookups of the
+same city share one request, and a failed refresh keeps serving the old
+value until it expires.
+"""
+import os
+import json
+import time
+import threading
+from concurrent.futures import Future
+from urllib.parse import quote
+
+WEATHER_URL = os.getenv("WEATHER_URL", "https://wttr.in")
+WEATHER_TTL = float(os.getenv("WEATHER_TTL", "600"))
+WEATHER_STALE_TTL = float(os.getenv("WEATHER_STALE_TTL", "3600"))
+WEATHER_CACHE_PATH = os.getenv("WEATHER_CACHE", "weather_cache.json")
+
+
+def normalize_city(city):
+    return " ".join(str(city).replace(",", " ").split()).casefold()
+
+
+def fetch_weather(city, base_url=None):
+    """Current conditions and temperature for `city` from wttr.in; raises on failure."""
+    from http_client import get_client
+
+    response = get_client().get(f"{base_url or WEATHER_URL}/{quote(city)}?format=%C+%t")
+    if response.status_code != 200:
+        raise RuntimeError(f"wttr.in returned {response.status_code} for {city}")
+    return response.text.strip()
+
+
+class WeatherCache:
+    """TTL cache with stale-while-revalidate and request coalescing, stored in a JSON file."""
+
+    def __init__(self, fetch=fetch_weather, path=WEATHER_CACHE_PATH, ttl=WEATHER_TTL, stale_ttl=WEATHER_STALE_TTL):
+        self.fetch = fetch
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.stats = {"hits": 0, "stale": 0, "misses": 0, "fetches": 0, "coalesced": 0, "errors": 0}
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.entries = self._load()
+
+    def _load(self):
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Ignoring unreadable weather cache {self.path}: {e}")
+            return {}
+
+    def _save(self):
+        # Called with self._lock held.
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _refresh(self, key):
+        """Future for the value of `key`, joining a fetch already in flight."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            self.stats["fetches"] += 1
+        return future, True
+
+    def _run_fetch(self, key, city, future):
+        try:
+            value = self.fetch(city)
+        except Exception as e:
+            with self._lock:
+                self.stats["errors"] += 1
+                del self._inflight[key]
+            future.set_exception(e)
+            return
+        with self._lock:
+            self.entries[key] = {"city": city, "value": value, "fetched": time.time()}
+            try:
+                self._save()
+            except OSError as e:
+                print(f"⚠️ Could not write weather cache {self.path}: {e}")
+            del self._inflight[key]
+        future.set_result(value)
+
+    def _revalidate(self, key, city):
+        future, owner = self._refresh(key)
+        if owner:
+            threading.Thread(target=self._run_fetch, args=(key, city, future), daemon=True).start()
+        return future
+
+    def get(self, city):
+        """Weather text for `city`, from the cache when fresh enough."""
+        key = normalize_city(city)
+        with self._lock:
+            entry = self.entries.get(key)
+            age = time.time() - entry["fetched"] if entry else None
+            kind = "hits" if entry and age < self.ttl else "stale" if entry and age < self.stale_ttl else "misses"
+            self.stats[kind] += 1
+
+        if kind == "hits":
+            return entry["value"]
+        if kind == "stale":
+            future = self._revalidate(key, city)
+            # Failed background refreshes are retried on the next lookup.
+            future.add_done_callback(lambda done: done.exception())
+            return entry["value"]
+
+        future, owner = self._refresh(key)
+        if owner:
+            self._run_fetch(key, city, future)
+        return future.result()
+
+    def clear(self):
+        with self._lock:
+            self.entries = {}
+            self._save()